@@ -0,0 +1,29 @@
+"""add price tracking timestamps to components
+
+Revision ID: add_component_price_tracking
+Revises: add_price_site_columns
+Create Date: 2026-10-18 14:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_component_price_tracking'
+down_revision = 'add_price_site_columns'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Heartbeat of the last crawl and time of the last price change
+    with op.batch_alter_table('components') as batch_op:
+        batch_op.add_column(sa.Column('last_checked_at', sa.DateTime(timezone=True), nullable=True))
+        batch_op.add_column(sa.Column('last_price_change_at', sa.DateTime(timezone=True), nullable=True))
+
+
+def downgrade():
+    with op.batch_alter_table('components') as batch_op:
+        batch_op.drop_column('last_price_change_at')
+        batch_op.drop_column('last_checked_at')
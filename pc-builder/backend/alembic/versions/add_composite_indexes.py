@@ -0,0 +1,43 @@
+"""add composite indexes for price history, catalog and analytics queries
+
+Revision ID: add_composite_indexes
+Revises: create_product_pins_table
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_composite_indexes'
+down_revision = 'create_product_pins_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Price history newest first per component; price makes it covering for the volatility scan
+    op.create_index(
+        'ix_prices_component_id_timestamp',
+        'prices',
+        ['component_id', sa.text('timestamp DESC'), 'price'],
+        unique=False
+    )
+
+    # Catalog listing by category (and price), and by price range
+    op.create_index('ix_components_category_id_current_price', 'components', ['category_id', 'current_price'], unique=False)
+    op.create_index('ix_components_current_price', 'components', ['current_price'], unique=False)
+
+    # Views per component and a user's recent views
+    op.create_index('ix_analytics_component_id_view_count', 'analytics', ['component_id', 'view_count'], unique=False)
+    op.create_index('ix_analytics_user_id_last_viewed', 'analytics', ['user_id', sa.text('last_viewed DESC')], unique=False)
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index('ix_analytics_user_id_last_viewed', table_name='analytics')
+    op.drop_index('ix_analytics_component_id_view_count', table_name='analytics')
+    op.drop_index('ix_components_current_price', table_name='components')
+    op.drop_index('ix_components_category_id_current_price', table_name='components')
+    op.drop_index('ix_prices_component_id_timestamp', table_name='prices')
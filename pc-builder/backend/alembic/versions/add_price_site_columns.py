@@ -0,0 +1,31 @@
+"""add site and url to prices
+
+Revision ID: add_price_site_columns
+Revises: create_crawl_jobs_table
+Create Date: 2026-10-18 13:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'add_price_site_columns'
+down_revision = 'create_crawl_jobs_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Record which site each price came from
+    with op.batch_alter_table('prices') as batch_op:
+        batch_op.add_column(sa.Column('site', sa.String(), nullable=True))
+        batch_op.add_column(sa.Column('url', sa.String(), nullable=True))
+        batch_op.create_index(batch_op.f('ix_prices_site'), ['site'], unique=False)
+
+
+def downgrade():
+    with op.batch_alter_table('prices') as batch_op:
+        batch_op.drop_index(batch_op.f('ix_prices_site'))
+        batch_op.drop_column('url')
+        batch_op.drop_column('site')
@@ -0,0 +1,53 @@
+"""create crawl jobs table
+
+Revision ID: create_crawl_jobs_table
+Revises: create_crawl_runs_table
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_crawl_jobs_table'
+down_revision = 'create_crawl_runs_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create crawl job queue table
+    op.create_table(
+        'crawl_jobs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('component_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('priority', sa.Integer(), nullable=True),
+        sa.Column('attempts', sa.Integer(), nullable=True),
+        sa.Column('lease_until', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('lease_token', sa.String(), nullable=True),
+        sa.Column('worker_id', sa.String(), nullable=True),
+        sa.Column('last_error', sa.String(), nullable=True),
+        sa.Column('created_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['component_id'], ['components.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_crawl_jobs_id'), 'crawl_jobs', ['id'], unique=False)
+    op.create_index(op.f('ix_crawl_jobs_component_id'), 'crawl_jobs', ['component_id'], unique=False)
+    op.create_index(op.f('ix_crawl_jobs_status'), 'crawl_jobs', ['status'], unique=False)
+    op.create_index(op.f('ix_crawl_jobs_lease_until'), 'crawl_jobs', ['lease_until'], unique=False)
+    op.create_index(op.f('ix_crawl_jobs_lease_token'), 'crawl_jobs', ['lease_token'], unique=False)
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index(op.f('ix_crawl_jobs_lease_token'), table_name='crawl_jobs')
+    op.drop_index(op.f('ix_crawl_jobs_lease_until'), table_name='crawl_jobs')
+    op.drop_index(op.f('ix_crawl_jobs_status'), table_name='crawl_jobs')
+    op.drop_index(op.f('ix_crawl_jobs_component_id'), table_name='crawl_jobs')
+    op.drop_index(op.f('ix_crawl_jobs_id'), table_name='crawl_jobs')
+
+    # Drop table
+    op.drop_table('crawl_jobs')
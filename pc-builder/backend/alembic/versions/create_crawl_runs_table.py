@@ -0,0 +1,61 @@
+"""create crawl runs tables
+
+Revision ID: create_crawl_runs_table
+Revises: create_analytics_table
+Create Date: 2026-10-18 09:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_crawl_runs_table'
+down_revision = 'create_analytics_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create crawl runs table
+    op.create_table(
+        'crawl_runs',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=True),
+        sa.Column('cursor', sa.Integer(), nullable=True),
+        sa.Column('completed', sa.Integer(), nullable=True),
+        sa.Column('failed', sa.Integer(), nullable=True),
+        sa.Column('started_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('checkpointed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.Column('finished_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_crawl_runs_id'), 'crawl_runs', ['id'], unique=False)
+    op.create_index(op.f('ix_crawl_runs_status'), 'crawl_runs', ['status'], unique=False)
+
+    # Create per-component run outcomes table
+    op.create_table(
+        'crawl_run_items',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('run_id', sa.Integer(), nullable=False),
+        sa.Column('component_id', sa.Integer(), nullable=False),
+        sa.Column('status', sa.String(), nullable=False),
+        sa.Column('error', sa.String(), nullable=True),
+        sa.Column('updated_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.ForeignKeyConstraint(['run_id'], ['crawl_runs.id'], ),
+        sa.ForeignKeyConstraint(['component_id'], ['components.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('run_id', 'component_id')
+    )
+    op.create_index(op.f('ix_crawl_run_items_id'), 'crawl_run_items', ['id'], unique=False)
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index(op.f('ix_crawl_run_items_id'), table_name='crawl_run_items')
+    op.drop_index(op.f('ix_crawl_runs_status'), table_name='crawl_runs')
+    op.drop_index(op.f('ix_crawl_runs_id'), table_name='crawl_runs')
+
+    # Drop tables
+    op.drop_table('crawl_run_items')
+    op.drop_table('crawl_runs')
@@ -0,0 +1,40 @@
+"""create price rollup backfill table
+
+Revision ID: create_price_rollup_backfill_table
+Revises: create_price_rollups_table
+Create Date: 2026-10-18 18:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_price_rollup_backfill_table'
+down_revision = 'create_price_rollups_table'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create the single-row record of which price rows predate the rollups
+    op.create_table(
+        'price_rollup_backfill',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('through_price_id', sa.Integer(), nullable=False),
+        sa.Column('backfilled_price_id', sa.Integer(), nullable=False),
+        sa.Column('completed_at', sa.DateTime(timezone=True), nullable=True),
+        sa.PrimaryKeyConstraint('id')
+    )
+
+    # Every existing price row needs a backfill, unless rollups were already being kept
+    op.execute(
+        "INSERT INTO price_rollup_backfill (id, through_price_id, backfilled_price_id) "
+        "SELECT 1, CASE WHEN EXISTS (SELECT 1 FROM price_rollups) THEN 0 ELSE COALESCE(MAX(id), 0) END, 0 "
+        "FROM prices"
+    )
+
+
+def downgrade():
+    # Drop table
+    op.drop_table('price_rollup_backfill')
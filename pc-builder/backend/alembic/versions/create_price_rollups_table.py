@@ -0,0 +1,53 @@
+"""create price rollups table
+
+Revision ID: create_price_rollups_table
+Revises: add_composite_indexes
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_price_rollups_table'
+down_revision = 'add_composite_indexes'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create table of hourly and daily OHLC price rollups; filled from existing prices on the first maintenance run
+    op.create_table(
+        'price_rollups',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('component_id', sa.Integer(), nullable=False),
+        sa.Column('site', sa.String(), nullable=True),
+        sa.Column('resolution', sa.String(), nullable=False),
+        sa.Column('bucket_start', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('open', sa.Float(), nullable=False),
+        sa.Column('high', sa.Float(), nullable=False),
+        sa.Column('low', sa.Float(), nullable=False),
+        sa.Column('close', sa.Float(), nullable=False),
+        sa.Column('count', sa.Integer(), nullable=False),
+        sa.Column('open_at', sa.DateTime(timezone=True), nullable=False),
+        sa.Column('close_at', sa.DateTime(timezone=True), nullable=False),
+        sa.ForeignKeyConstraint(['component_id'], ['components.id'], ),
+        sa.PrimaryKeyConstraint('id')
+    )
+    op.create_index(op.f('ix_price_rollups_id'), 'price_rollups', ['id'], unique=False)
+    op.create_index(
+        'ix_price_rollups_component_resolution_bucket',
+        'price_rollups',
+        ['component_id', 'resolution', 'bucket_start', 'site'],
+        unique=True
+    )
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index('ix_price_rollups_component_resolution_bucket', table_name='price_rollups')
+    op.drop_index(op.f('ix_price_rollups_id'), table_name='price_rollups')
+
+    # Drop table
+    op.drop_table('price_rollups')
@@ -0,0 +1,45 @@
+"""create product pins table
+
+Revision ID: create_product_pins_table
+Revises: add_component_price_tracking
+Create Date: 2026-10-18 12:00:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = 'create_product_pins_table'
+down_revision = 'add_component_price_tracking'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # Create table of product pages matched per component and site
+    op.create_table(
+        'product_pins',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('component_id', sa.Integer(), nullable=False),
+        sa.Column('site', sa.String(), nullable=False),
+        sa.Column('url', sa.String(), nullable=False),
+        sa.Column('product_id', sa.String(), nullable=True),
+        sa.Column('title', sa.String(), nullable=True),
+        sa.Column('pinned_at', sa.DateTime(timezone=True), server_default=sa.text('now()')),
+        sa.Column('last_verified_at', sa.DateTime(timezone=True), nullable=True),
+        sa.ForeignKeyConstraint(['component_id'], ['components.id'], ),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('component_id', 'site')
+    )
+    op.create_index(op.f('ix_product_pins_id'), 'product_pins', ['id'], unique=False)
+    op.create_index(op.f('ix_product_pins_component_id'), 'product_pins', ['component_id'], unique=False)
+
+
+def downgrade():
+    # Drop indexes
+    op.drop_index(op.f('ix_product_pins_component_id'), table_name='product_pins')
+    op.drop_index(op.f('ix_product_pins_id'), table_name='product_pins')
+
+    # Drop table
+    op.drop_table('product_pins')
@@ -1,14 +1,139 @@
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
+from sqlalchemy.engine import Engine, make_url
+from sqlalchemy.ext.asyncio import AsyncEngine, AsyncSession, async_sessionmaker, create_async_engine
 from sqlalchemy.ext.declarative import declarative_base
+from sqlalchemy.pool import AsyncAdaptedQueuePool
 from sqlalchemy.orm import sessionmaker
+import os
 
-SQLALCHEMY_DATABASE_URL = "sqlite:///./pc_builder.db"
+SQLALCHEMY_DATABASE_URL = os.getenv("DATABASE_URL", "sqlite:///./pc_builder.db")
 
-engine = create_engine(
-    SQLALCHEMY_DATABASE_URL, connect_args={"check_same_thread": False}
-)
+# Async drivers used for the same database by the async engine
+ASYNC_DRIVERS = {"sqlite": "aiosqlite", "postgresql": "asyncpg", "mysql": "aiomysql"}
+
+# SQLite connection pragmas
+SQLITE_JOURNAL_MODE = os.getenv("SQLITE_JOURNAL_MODE", "wal")
+SQLITE_SYNCHRONOUS = os.getenv("SQLITE_SYNCHRONOUS", "normal")
+SQLITE_BUSY_TIMEOUT_MS = int(os.getenv("SQLITE_BUSY_TIMEOUT_MS", "15000"))
+SQLITE_CACHE_SIZE_KB = int(os.getenv("SQLITE_CACHE_SIZE_KB", "65536"))
+SQLITE_MMAP_SIZE = int(os.getenv("SQLITE_MMAP_SIZE", str(256 * 1024 * 1024)))
+
+# Connection pool
+DB_POOL_SIZE = int(os.getenv("DB_POOL_SIZE", "5"))
+DB_MAX_OVERFLOW = int(os.getenv("DB_MAX_OVERFLOW", "10"))
+DB_POOL_TIMEOUT = float(os.getenv("DB_POOL_TIMEOUT", "30"))
+DB_POOL_RECYCLE = int(os.getenv("DB_POOL_RECYCLE", "1800"))
+DB_POOL_PRE_PING = os.getenv("DB_POOL_PRE_PING", "true").lower() in ("1", "true", "yes")
+DB_ECHO = os.getenv("DB_ECHO", "false").lower() in ("1", "true", "yes")
+
+
+def sqlite_pragmas(
+    journal_mode: str = SQLITE_JOURNAL_MODE,
+    synchronous: str = SQLITE_SYNCHRONOUS,
+    busy_timeout_ms: int = SQLITE_BUSY_TIMEOUT_MS,
+    cache_size_kb: int = SQLITE_CACHE_SIZE_KB,
+    mmap_size: int = SQLITE_MMAP_SIZE
+) -> dict:
+    """
+    Pragmas run on every new SQLite connection. WAL lets the API read while
+    a crawler writes; synchronous=NORMAL is durable across application
+    crashes in WAL mode and only risks the last commits on power loss.
+    """
+    return {
+        "journal_mode": journal_mode,
+        "synchronous": synchronous,
+        "busy_timeout": busy_timeout_ms,
+        "cache_size": -cache_size_kb,  # Negative means KiB rather than pages
+        "mmap_size": mmap_size,
+        "temp_store": "memory"
+    }
+
+
+def async_database_url(url: str = SQLALCHEMY_DATABASE_URL) -> str:
+    """`url` with its driver swapped for the backend's async driver (sqlite -> sqlite+aiosqlite)."""
+    url = make_url(url)
+    backend = url.get_backend_name()
+    if backend not in ASYNC_DRIVERS:
+        raise ValueError(f"No async driver configured for {backend} databases")
+    return url.set(drivername=f"{backend}+{ASYNC_DRIVERS[backend]}").render_as_string(hide_password=False)
+
+
+def _engine_options(url, pragmas: dict, engine_options: dict) -> dict:
+    options = {"echo": DB_ECHO}
+
+    if url.get_backend_name() == "sqlite":
+        options["connect_args"] = {
+            "check_same_thread": False,
+            "timeout": pragmas.get("busy_timeout", SQLITE_BUSY_TIMEOUT_MS) / 1000
+        }
+        if url.database and url.database != ":memory:":
+            options.update(pool_size=DB_POOL_SIZE, max_overflow=DB_MAX_OVERFLOW, pool_timeout=DB_POOL_TIMEOUT)
+    else:
+        options.update(
+            pool_size=DB_POOL_SIZE,
+            max_overflow=DB_MAX_OVERFLOW,
+            pool_timeout=DB_POOL_TIMEOUT,
+            pool_recycle=DB_POOL_RECYCLE,
+            pool_pre_ping=DB_POOL_PRE_PING
+        )
+    options.update(engine_options)
+    return options
+
+
+def _set_sqlite_pragmas(engine: Engine, pragmas: dict):
+    @event.listens_for(engine, "connect")
+    def set_sqlite_pragmas(dbapi_connection, connection_record):
+        cursor = dbapi_connection.cursor()
+        for name, value in pragmas.items():
+            cursor.execute(f"PRAGMA {name} = {value}")
+        cursor.close()
+
+
+def create_db_engine(url: str = SQLALCHEMY_DATABASE_URL, pragmas: dict = None, **engine_options) -> Engine:
+    """
+    Engine for `url` configured from the environment. SQLite connections get
+    `pragmas` (sqlite_pragmas() by default); server databases get a sized
+    QueuePool that pings connections before handing them out and recycles
+    them before server-side idle timeouts. `engine_options` override both.
+    """
+    url = make_url(url)
+    sqlite = url.get_backend_name() == "sqlite"
+    if sqlite:
+        pragmas = sqlite_pragmas() if pragmas is None else pragmas
+    engine = create_engine(url, **_engine_options(url, pragmas or {}, engine_options))
+
+    if sqlite and pragmas:
+        _set_sqlite_pragmas(engine, pragmas)
+    return engine
+
+
+def create_async_db_engine(url: str = None, pragmas: dict = None, **engine_options) -> AsyncEngine:
+    """
+    Async engine configured like create_db_engine(). `url` defaults to the
+    application database through its async driver (aiosqlite, asyncpg).
+    SQLite files get a pool too: aiosqlite runs every connection in its
+    own thread, which is too costly to start per request.
+    """
+    url = make_url(url or async_database_url())
+    sqlite = url.get_backend_name() == "sqlite"
+    if sqlite:
+        pragmas = sqlite_pragmas() if pragmas is None else pragmas
+        if url.database and url.database != ":memory:":
+            engine_options.setdefault("poolclass", AsyncAdaptedQueuePool)
+    engine = create_async_engine(url, **_engine_options(url, pragmas or {}, engine_options))
+
+    if sqlite and pragmas:
+        _set_sqlite_pragmas(engine.sync_engine, pragmas)
+    return engine
+
+
+engine = create_db_engine()
 SessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
+async_engine = create_async_db_engine()
+# Loaded attributes stay usable after commit: refreshing them would need another await
+AsyncSessionLocal = async_sessionmaker(bind=async_engine, autoflush=False, expire_on_commit=False)
+
 Base = declarative_base()
 
 # Dependency
@@ -17,4 +142,9 @@ def get_db():
     try:
         yield db
     finally:
-        db.close() 
\ No newline at end of file
+        db.close()
+
+
+async def get_async_db():
+    async with AsyncSessionLocal() as db:
+        yield db
@@ -1,16 +1,16 @@
 from fastapi import Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordBearer
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..database.config import get_db
-from ..services.auth import AuthService
+from ..database.config import get_async_db
+from ..services.auth import AsyncAuthService, AuthService
 from ..models.auth import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="auth/login")
 
 async def get_current_user(
     token: str = Depends(oauth2_scheme),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ) -> User:
     credentials_exception = HTTPException(
         status_code=status.HTTP_401_UNAUTHORIZED,
@@ -20,7 +20,7 @@ async def get_current_user(
     
     try:
         token_data = AuthService.decode_token(token)
-        user = AuthService.get_user(db, username=token_data.username)
+        user = await AsyncAuthService.get_user(db, username=token_data.username)
         if user is None:
             raise credentials_exception
         return user
@@ -1,9 +1,13 @@
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
-from app.database.config import engine, Base
+from fastapi.responses import PlainTextResponse
+from app.database.config import async_engine, engine, Base
 from app.models import models, auth  # Import both model modules
 from app.routers import components, categories, analytics, crawler, auth as auth_router, ai_conversation
 from app.services.scheduler import CrawlerScheduler
+from app.services.crawler.parse_executor import shutdown_parse_executor
+from app.services.crawler.metrics import registry as crawler_metrics
+from app.services.crawler.http_pool import close_http_pool, get_http_pool
 import logging
 
 # Set up logging
@@ -41,6 +45,7 @@ app.include_router(ai_conversation.router)  # Add AI conversation router
 
 # Initialize the crawler scheduler
 scheduler = CrawlerScheduler()
+app.state.scheduler = scheduler
 
 @app.on_event("startup")
 async def startup_event():
@@ -49,6 +54,9 @@ async def startup_event():
     """
     try:
         logger.info("Starting PC Builder API...")
+
+        # Open the crawler's shared HTTP connection pool
+        await get_http_pool().start()
         
         # Start the price update scheduler
         scheduler.start()
@@ -72,6 +80,10 @@ async def shutdown_event():
         logger.info("Shutting down PC Builder API...")
         scheduler.shutdown()
         logger.info("Price update scheduler stopped successfully")
+        shutdown_parse_executor()
+        await close_http_pool()
+        # Pooled aiosqlite connections each hold a thread that would keep the process alive
+        await async_engine.dispose()
     except Exception as e:
         logger.error(f"Error during shutdown: {str(e)}")
         raise
@@ -88,7 +100,7 @@ async def root():
         "features": [
             "User authentication and authorization",
             "Role-based access control",
-            "Automated price updates every 15 minutes",
+            "Adaptive price updates prioritized by volatility and popularity",
             "Real-time price comparison",
             "Component tracking",
             "Price history"
@@ -112,6 +124,13 @@ async def health_check():
         }
     }
 
+@app.get("/metrics", response_class=PlainTextResponse)
+async def metrics():
+    """
+    Crawler metrics in the Prometheus text format.
+    """
+    return PlainTextResponse(crawler_metrics.render(), media_type="text/plain; version=0.0.4")
+
 if __name__ == "__main__":
     import uvicorn
     uvicorn.run("app.main:app", host="0.0.0.0", port=8000, reload=True) 
\ No newline at end of file
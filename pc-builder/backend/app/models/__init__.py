@@ -1,4 +1,4 @@
-from .models import Category, Component, Price, Analytics
+from .models import Category, Component, Price, Analytics, CrawlRun, CrawlRunItem, CrawlJob, ProductPin, PriceRollup, PriceRollupBackfill
 from .base import BaseModel
 
-__all__ = ['Category', 'Component', 'Price', 'Analytics', 'BaseModel']
+__all__ = ['Category', 'Component', 'Price', 'Analytics', 'CrawlRun', 'CrawlRunItem', 'CrawlJob', 'ProductPin', 'PriceRollup', 'PriceRollupBackfill', 'BaseModel']
@@ -1,4 +1,5 @@
-from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Boolean
+from sqlalchemy import Column, Integer, String, Float, ForeignKey, DateTime, Text, Boolean, UniqueConstraint, Index
+from sqlalchemy import event, insert, inspect, select
 from sqlalchemy.orm import relationship
 from sqlalchemy.sql import func
 from ..database.config import Base
@@ -22,6 +23,13 @@ class Component(Base):
     url = Column(String)
     image_url = Column(String, nullable=True)
     category_id = Column(Integer, ForeignKey("categories.id"))
+    last_checked_at = Column(DateTime(timezone=True), nullable=True)  # Last successful crawl
+    last_price_change_at = Column(DateTime(timezone=True), nullable=True)
+
+    __table_args__ = (
+        Index("ix_components_category_id_current_price", category_id, current_price),  # Category listing, optionally by price
+        Index("ix_components_current_price", current_price),  # Price range listing
+    )
     
     category = relationship("Category", back_populates="components")
     prices = relationship("Price", back_populates="component")
@@ -33,7 +41,14 @@ class Price(Base):
     id = Column(Integer, primary_key=True, index=True)
     component_id = Column(Integer, ForeignKey("components.id"))
     price = Column(Float)
+    site = Column(String, nullable=True, index=True)  # Site adapter name the price was crawled from
+    url = Column(String, nullable=True)
     timestamp = Column(DateTime(timezone=True), server_default=func.now())
+
+    __table_args__ = (
+        # Newest-first history per component; with price it covers the volatility scan
+        Index("ix_prices_component_id_timestamp", component_id, timestamp.desc(), price),
+    )
     
     component = relationship("Component", back_populates="prices")
 
@@ -46,9 +61,113 @@ class Analytics(Base):
     view_count = Column(Integer, default=0)
     last_viewed = Column(DateTime(timezone=True), server_default=func.now())
     is_favorite = Column(Boolean, default=False)
+
+    __table_args__ = (
+        Index("ix_analytics_component_id_view_count", component_id, view_count),  # Views per component
+        Index("ix_analytics_user_id_last_viewed", user_id, last_viewed.desc()),  # A user's recent views
+    )
     
     component = relationship("Component", back_populates="analytics")
     user = relationship("User", back_populates="analytics")  # Add this relationship
 
+class CrawlRun(Base):
+    __tablename__ = "crawl_runs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    status = Column(String, default="running", index=True)  # running, completed, failed
+    cursor = Column(Integer, default=0)  # Highest component id processed so far
+    completed = Column(Integer, default=0)
+    failed = Column(Integer, default=0)
+    started_at = Column(DateTime(timezone=True), server_default=func.now())
+    checkpointed_at = Column(DateTime(timezone=True), nullable=True)
+    finished_at = Column(DateTime(timezone=True), nullable=True)
+
+    items = relationship("CrawlRunItem", back_populates="run")
+
+class CrawlRunItem(Base):
+    __tablename__ = "crawl_run_items"
+    __table_args__ = (UniqueConstraint("run_id", "component_id"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    run_id = Column(Integer, ForeignKey("crawl_runs.id"), nullable=False)
+    component_id = Column(Integer, ForeignKey("components.id"), nullable=False)
+    status = Column(String, nullable=False)  # completed, failed
+    error = Column(String, nullable=True)
+    updated_at = Column(DateTime(timezone=True), server_default=func.now(), onupdate=func.now())
+
+    run = relationship("CrawlRun", back_populates="items")
+
+class CrawlJob(Base):
+    __tablename__ = "crawl_jobs"
+
+    id = Column(Integer, primary_key=True, index=True)
+    component_id = Column(Integer, ForeignKey("components.id"), nullable=False, index=True)
+    status = Column(String, default="pending", index=True)  # pending, leased, completed, failed
+    priority = Column(Integer, default=0)
+    attempts = Column(Integer, default=0)
+    lease_until = Column(DateTime(timezone=True), nullable=True, index=True)
+    lease_token = Column(String, nullable=True, index=True)
+    worker_id = Column(String, nullable=True)
+    last_error = Column(String, nullable=True)
+    created_at = Column(DateTime(timezone=True), server_default=func.now())
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+class ProductPin(Base):
+    __tablename__ = "product_pins"
+    __table_args__ = (UniqueConstraint("component_id", "site"),)
+
+    id = Column(Integer, primary_key=True, index=True)
+    component_id = Column(Integer, ForeignKey("components.id"), nullable=False, index=True)
+    site = Column(String, nullable=False)
+    url = Column(String, nullable=False)  # Product detail page the component was matched to
+    product_id = Column(String, nullable=True)  # Site's product id, e.g. an ASIN
+    title = Column(String, nullable=True)  # Title when pinned, to notice the listing drifting
+    pinned_at = Column(DateTime(timezone=True), server_default=func.now())
+    last_verified_at = Column(DateTime(timezone=True), nullable=True)
+
+class PriceRollup(Base):
+    __tablename__ = "price_rollups"
+    __table_args__ = (
+        # One row per component, site and bucket; also serves range reads of a component's series
+        Index("ix_price_rollups_component_resolution_bucket", "component_id", "resolution", "bucket_start", "site", unique=True),
+    )
+
+    id = Column(Integer, primary_key=True, index=True)
+    component_id = Column(Integer, ForeignKey("components.id"), nullable=False)
+    site = Column(String, nullable=True)
+    resolution = Column(String, nullable=False)  # hour, day
+    bucket_start = Column(DateTime(timezone=True), nullable=False)
+    open = Column(Float, nullable=False)
+    high = Column(Float, nullable=False)
+    low = Column(Float, nullable=False)
+    close = Column(Float, nullable=False)
+    count = Column(Integer, nullable=False)  # Stored price rows in the bucket
+    open_at = Column(DateTime(timezone=True), nullable=False)  # Timestamps of the open and close rows,
+    close_at = Column(DateTime(timezone=True), nullable=False)  # so batches can be merged in any order
+
+class PriceRollupBackfill(Base):
+    __tablename__ = "price_rollup_backfill"
+
+    # A single row, recorded when rollups start being kept
+    id = Column(Integer, primary_key=True)
+    through_price_id = Column(Integer, nullable=False)  # Price rows up to this id were written before rollups
+    backfilled_price_id = Column(Integer, nullable=False, default=0)  # Rows up to this id are rolled up so far
+    completed_at = Column(DateTime(timezone=True), nullable=True)
+
+@event.listens_for(PriceRollupBackfill.__table__, "after_create")
+def record_rollup_backfill(target, connection, **kw):
+    """
+    Every price row that exists when rollups start being kept needs a
+    backfill; writers roll up the rows after it. Rollups that already hold
+    rows were kept before the marker existed, so there is nothing to do.
+    """
+    tables = inspect(connection)
+    through = 0
+    if tables.has_table("prices") and not (
+        tables.has_table("price_rollups") and connection.scalar(select(PriceRollup.id).limit(1)) is not None
+    ):
+        through = connection.scalar(select(func.coalesce(func.max(Price.id), 0)))
+    connection.execute(insert(target).values(id=1, through_price_id=through, backfilled_price_id=0))
+
 # Update User model to include analytics relationship
 User.analytics = relationship("Analytics", back_populates="user")
\ No newline at end of file
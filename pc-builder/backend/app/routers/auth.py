@@ -1,10 +1,10 @@
 from fastapi import APIRouter, Depends, HTTPException, status
 from fastapi.security import OAuth2PasswordRequestForm
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List
 from datetime import timedelta
-from ..database.config import get_db
-from ..services.auth import AuthService, ACCESS_TOKEN_EXPIRE_MINUTES
+from ..database.config import get_async_db
+from ..services.auth import AsyncAuthService, AuthService, ACCESS_TOKEN_EXPIRE_MINUTES
 from ..schemas.auth import (
     User, UserCreate, UserUpdate, Token, Role, RoleCreate,
     ChangePassword, LoginRequest
@@ -13,19 +13,19 @@ from ..dependencies.auth import (
     get_current_active_user,
     get_current_admin_user
 )
-from ..models.auth import User as UserModel
+from ..models.auth import Role as RoleModel, User as UserModel
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
 @router.post("/login", response_model=Token)
 async def login(
     form_data: OAuth2PasswordRequestForm = Depends(),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     OAuth2 compatible token login, get an access token for future requests.
     """
-    user = AuthService.authenticate_user(db, form_data.username, form_data.password)
+    user = await AsyncAuthService.authenticate_user(db, form_data.username, form_data.password)
     if not user:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
@@ -49,27 +49,27 @@ async def login(
 @router.post("/register", response_model=User)
 async def register(
     user: UserCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Register a new user.
     """
     # Check if user already exists
-    db_user = AuthService.get_user(db, username=user.username)
+    db_user = await AsyncAuthService.get_user(db, username=user.username)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Username already registered"
         )
     
-    db_user = AuthService.get_user_by_email(db, email=user.email)
+    db_user = await AsyncAuthService.get_user_by_email(db, email=user.email)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Email already registered"
         )
     
-    return AuthService.create_user(db=db, user=user)
+    return await AsyncAuthService.create_user(db=db, user=user)
 
 @router.get("/me", response_model=User)
 async def read_users_me(
@@ -84,14 +84,14 @@ async def read_users_me(
 async def update_user_me(
     user_update: UserUpdate,
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update current user information.
     """
     # Check if email is taken
     if user_update.email:
-        db_user = AuthService.get_user_by_email(db, email=user_update.email)
+        db_user = await AsyncAuthService.get_user_by_email(db, email=user_update.email)
         if db_user and db_user.id != current_user.id:
             raise HTTPException(
                 status_code=400,
@@ -101,31 +101,30 @@ async def update_user_me(
     # Update user fields
     for field, value in user_update.model_dump(exclude_unset=True).items():
         if field == "password" and value:
-            setattr(current_user, "hashed_password", AuthService.get_password_hash(value))
+            setattr(current_user, "hashed_password", await AsyncAuthService.get_password_hash_async(value))
         elif value is not None:
             setattr(current_user, field, value)
     
-    db.commit()
-    db.refresh(current_user)
-    return current_user
+    await db.commit()
+    return await AsyncAuthService.get_user_by_id(db, current_user.id)
 
 @router.post("/change-password")
 async def change_password(
     password_change: ChangePassword,
     current_user: UserModel = Depends(get_current_active_user),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Change user password.
     """
-    if not AuthService.verify_password(password_change.current_password, current_user.hashed_password):
+    if not await AsyncAuthService.verify_password_async(password_change.current_password, current_user.hashed_password):
         raise HTTPException(
             status_code=400,
             detail="Incorrect password"
         )
     
-    current_user.hashed_password = AuthService.get_password_hash(password_change.new_password)
-    db.commit()
+    current_user.hashed_password = await AsyncAuthService.get_password_hash_async(password_change.new_password)
+    await db.commit()
     return {"message": "Password updated successfully"}
 
 # Admin endpoints
@@ -133,43 +132,42 @@ async def change_password(
 async def list_users(
     skip: int = 0,
     limit: int = 100,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: None = Depends(get_current_admin_user)
 ):
     """
     List all users (admin only).
     """
-    users = db.query(UserModel).offset(skip).limit(limit).all()
-    return users
+    return await AsyncAuthService.list_users(db, skip, limit)
 
 @router.post("/users", response_model=User)
 async def create_user(
     user: UserCreate,
     is_superuser: bool = False,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: None = Depends(get_current_admin_user)
 ):
     """
     Create new user (admin only).
     """
-    db_user = AuthService.get_user(db, username=user.username)
+    db_user = await AsyncAuthService.get_user(db, username=user.username)
     if db_user:
         raise HTTPException(
             status_code=400,
             detail="Username already registered"
         )
-    return AuthService.create_user(db=db, user=user, is_superuser=is_superuser)
+    return await AsyncAuthService.create_user(db=db, user=user, is_superuser=is_superuser)
 
 @router.post("/roles", response_model=Role)
 async def create_role(
     role: RoleCreate,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: None = Depends(get_current_admin_user)
 ):
     """
     Create new role (admin only).
     """
-    return AuthService.create_role(
+    return await AsyncAuthService.create_role(
         db=db,
         name=role.name,
         description=role.description,
@@ -180,19 +178,19 @@ async def create_role(
 async def assign_role(
     user_id: int,
     role_id: int,
-    db: Session = Depends(get_db),
+    db: AsyncSession = Depends(get_async_db),
     _: None = Depends(get_current_admin_user)
 ):
     """
     Assign role to user (admin only).
     """
-    user = db.query(UserModel).filter(UserModel.id == user_id).first()
+    user = await AsyncAuthService.get_user_by_id(db, user_id)
     if not user:
         raise HTTPException(status_code=404, detail="User not found")
     
-    role = db.query(Role).filter(Role.id == role_id).first()
+    role = await db.get(RoleModel, role_id)
     if not role:
         raise HTTPException(status_code=404, detail="Role not found")
     
-    AuthService.assign_role_to_user(db, user, role)
+    await AsyncAuthService.assign_role_to_user(db, user, role)
     return {"message": "Role assigned successfully"} 
\ No newline at end of file
@@ -1,13 +1,15 @@
 from fastapi import APIRouter, Depends, HTTPException, Query
-from sqlalchemy.orm import Session
+from sqlalchemy.ext.asyncio import AsyncSession
 from typing import List, Optional
-from ..database.config import get_db
-from ..services.services import ComponentService, PriceService
-from ..schemas.schemas import Component, ComponentCreate, ComponentWithCategory, Price
+from datetime import datetime, timedelta
+from ..database.config import get_async_db
+from ..services.price_history import utc_naive
+from ..services.services import AsyncComponentService, AsyncPriceService
+from ..schemas.schemas import Component, ComponentCreate, ComponentWithCategory, Price, PriceSeries
 
 router = APIRouter(prefix="/components", tags=["components"])
-component_service = ComponentService()
-price_service = PriceService()
+component_service = AsyncComponentService()
+price_service = AsyncPriceService()
 
 @router.get("/", response_model=List[Component])
 async def list_components(
@@ -16,66 +18,88 @@ async def list_components(
     max_price: Optional[float] = None,
     skip: int = Query(0, ge=0),
     limit: int = Query(100, ge=1),
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     List all components with optional filtering by category and price range.
     """
     if category_id is not None:
-        return component_service.get_by_category(db, category_id, skip, limit)
+        return await component_service.get_by_category(db, category_id, skip, limit, min_price, max_price)
     elif min_price is not None and max_price is not None:
-        return component_service.get_by_price_range(db, min_price, max_price)
-    return component_service.get_all(db, skip, limit)
+        return await component_service.get_by_price_range(db, min_price, max_price)
+    return await component_service.get_all(db, skip, limit)
 
 @router.get("/{component_id}", response_model=ComponentWithCategory)
-async def get_component(component_id: int, db: Session = Depends(get_db)):
+async def get_component(component_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get detailed information about a specific component.
     """
-    component = component_service.get(db, component_id)
+    component = await component_service.get_with_category(db, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Component not found")
     return component
 
 @router.post("/", response_model=Component)
-async def create_component(component: ComponentCreate, db: Session = Depends(get_db)):
+async def create_component(component: ComponentCreate, db: AsyncSession = Depends(get_async_db)):
     """
     Create a new component (admin only).
     """
     # TODO: Add admin authentication
-    return component_service.create(db, component)
+    return await component_service.create(db, component)
 
 @router.put("/{component_id}", response_model=Component)
 async def update_component(
     component_id: int,
     component: ComponentCreate,
-    db: Session = Depends(get_db)
+    db: AsyncSession = Depends(get_async_db)
 ):
     """
     Update an existing component (admin only).
     """
     # TODO: Add admin authentication
-    updated_component = component_service.update(db, component_id, component)
+    updated_component = await component_service.update(db, component_id, component)
     if not updated_component:
         raise HTTPException(status_code=404, detail="Component not found")
     return updated_component
 
 @router.delete("/{component_id}")
-async def delete_component(component_id: int, db: Session = Depends(get_db)):
+async def delete_component(component_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Delete a component (admin only).
     """
     # TODO: Add admin authentication
-    if not component_service.delete(db, component_id):
+    if not await component_service.delete(db, component_id):
         raise HTTPException(status_code=404, detail="Component not found")
     return {"message": "Component deleted successfully"}
 
 @router.get("/{component_id}/price-history", response_model=List[Price])
-async def get_component_price_history(component_id: int, db: Session = Depends(get_db)):
+async def get_component_price_history(component_id: int, db: AsyncSession = Depends(get_async_db)):
     """
     Get price history for a specific component.
     """
-    component = component_service.get(db, component_id)
+    component = await component_service.get(db, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Component not found")
-    return price_service.get_component_price_history(db, component_id) 
\ No newline at end of file
+    return await price_service.get_component_price_history(db, component_id)
+
+@router.get("/{component_id}/price-series", response_model=PriceSeries)
+async def get_component_price_series(
+    component_id: int,
+    start: Optional[datetime] = None,
+    end: Optional[datetime] = None,
+    points: int = Query(200, ge=1, le=5000),
+    site: Optional[str] = None,
+    db: AsyncSession = Depends(get_async_db)
+):
+    """
+    Get price history over a range (default the last 30 days) as OHLC points, from
+    the coarsest resolution (day, hour or raw prices) that gives at least `points` points.
+    """
+    end = utc_naive(end) if end else datetime.utcnow()
+    start = utc_naive(start) if start else end - timedelta(days=30)
+    if start >= end:
+        raise HTTPException(status_code=400, detail="start must be before end")
+    component = await component_service.get(db, component_id)
+    if not component:
+        raise HTTPException(status_code=404, detail="Component not found")
+    return await price_service.get_price_series(db, component_id, start, end, points, site)
@@ -1,67 +1,104 @@
-from fastapi import APIRouter, Depends, HTTPException, BackgroundTasks
+from fastapi import APIRouter, Depends, HTTPException, Query, Request
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from typing import List, Dict, Optional
 from datetime import datetime, timedelta
 from ..database.config import get_db
+from ..schemas.schemas import CrawlJobStatus
 from ..services.crawler import CrawlerService
-from ..services.services import ComponentService, AnalyticsService
+from ..services.crawler.best_price import BestPriceService
+from ..services.crawler.http_pool import get_http_pool
+from ..services.crawler.progress import CrawlProgressTracker
+from ..services.services import ComponentService
 
 router = APIRouter(prefix="/crawler", tags=["crawler"])
 crawler_service = CrawlerService()
 component_service = ComponentService()
-analytics_service = AnalyticsService()
+crawl_tracker = CrawlProgressTracker()
+best_price_service = BestPriceService(crawler_service)
 
-@router.post("/crawl", response_model=List[Dict])
+@router.post("/crawl", response_model=CrawlJobStatus, status_code=202)
 async def crawl_prices(
-    background_tasks: BackgroundTasks,
     component_id: Optional[int] = None,
     db: Session = Depends(get_db)
 ):
     """
     Trigger price crawling for a specific component or all components.
-    The crawling is done in the background.
+    The crawling is done in the background; follow it with
+    GET /crawler/crawl/{job_id} or the /events stream.
     """
     if component_id:
         component = component_service.get(db, component_id)
         if not component:
             raise HTTPException(status_code=404, detail="Component not found")
 
-    # Log the crawl request
-    analytics_service.log_event(
-        db=db,
-        event_type="price_crawl_requested",
-        additional_info={"component_id": component_id} if component_id else {}
-    )
+    # Start crawling in the background with its own session
+    progress = await crawl_tracker.start(crawler_service, component_id)
+    return progress.as_dict()
 
-    # Start crawling in the background
-    background_tasks.add_task(crawler_service.crawl_prices, db, component_id)
-    
-    return {
-        "message": f"Price crawling started for {'component ' + str(component_id) if component_id else 'all components'}",
-        "status": "processing"
-    }
+@router.get("/crawl/{job_id}", response_model=CrawlJobStatus)
+async def get_crawl_job(job_id: str):
+    """
+    Get the completed/failed/remaining counts of a crawl job.
+    """
+    progress = crawl_tracker.get(job_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    return progress.as_dict()
+
+@router.get("/crawl/{job_id}/events")
+async def stream_crawl_job(job_id: str):
+    """
+    Stream a crawl job's progress as Server-Sent Events: a "progress"
+    snapshot, a "component" event as each component finishes and a final
+    "done" event.
+    """
+    progress = crawl_tracker.get(job_id)
+    if not progress:
+        raise HTTPException(status_code=404, detail="Crawl job not found")
+    return StreamingResponse(
+        progress.events(),
+        media_type="text/event-stream",
+        headers={"Cache-Control": "no-cache", "X-Accel-Buffering": "no"}
+    )
 
 @router.get("/best-price/{component_id}")
 async def get_best_price(component_id: int, db: Session = Depends(get_db)):
     """
-    Get the best current price for a component across all supported sites.
+    Get the best current price for a component across all supported sites,
+    from the latest stored prices. Stale prices are returned as they are
+    while a background crawl refreshes them.
     """
     component = component_service.get(db, component_id)
     if not component:
         raise HTTPException(status_code=404, detail="Component not found")
 
-    # Log the best price request
-    analytics_service.log_event(
-        db=db,
-        event_type="best_price_requested",
-        additional_info={"component_id": component_id}
-    )
-
-    return await crawler_service.get_best_price(db, component_id)
+    return await best_price_service.get_best_price(db, component_id)
 
 @router.get("/supported-sites")
 async def get_supported_sites():
     """
-    Get a list of supported e-commerce sites for price crawling.
+    Get a list of supported e-commerce sites for price crawling,
+    including each site's circuit breaker state.
+    """
+    return {"sites": crawler_service.site_status()}
+
+@router.get("/queue")
+async def get_crawl_queue(request: Request, limit: int = Query(100, ge=1, le=1000)):
+    """
+    Get the recrawl priority queue, ordered by next crawl time.
+    """
+    planner = request.app.state.scheduler.planner
+    return {
+        "requests_per_hour": planner.requests_per_hour,
+        "queued": len(planner.priorities),
+        "components": planner.snapshot(limit)
+    }
+
+@router.get("/http-pool")
+async def get_http_pool_stats():
+    """
+    Get the crawler's shared HTTP connection pool stats: open, idle and
+    in-use connections, and how many were created versus reused.
     """
-    return {"sites": crawler_service.supported_sites} 
\ No newline at end of file
+    return get_http_pool().stats()
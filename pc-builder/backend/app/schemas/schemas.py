@@ -12,8 +12,6 @@ class CategoryCreate(CategoryBase):
 
 class Category(CategoryBase):
     id: int
-    created_at: datetime
-    updated_at: datetime
 
     class Config:
         from_attributes = True
@@ -22,17 +20,18 @@ class Category(CategoryBase):
 class ComponentBase(BaseModel):
     name: str
     category_id: int
-    specifications: Dict = Field(default_factory=dict)
-    price: float
-    manufacturer: str
+    description: Optional[str] = None
+    current_price: Optional[float] = None
+    url: Optional[str] = None
+    image_url: Optional[str] = None
 
 class ComponentCreate(ComponentBase):
     pass
 
 class Component(ComponentBase):
     id: int
-    created_at: datetime
-    updated_at: datetime
+    last_checked_at: Optional[datetime] = None
+    last_price_change_at: Optional[datetime] = None
 
     class Config:
         from_attributes = True
@@ -44,18 +43,35 @@ class ComponentWithCategory(Component):
 class PriceBase(BaseModel):
     component_id: int
     price: float
-    date_retrieved: datetime
+    timestamp: Optional[datetime] = None
+    site: Optional[str] = None
+    url: Optional[str] = None
 
 class PriceCreate(PriceBase):
     pass
 
 class Price(PriceBase):
     id: int
-    created_at: datetime
 
     class Config:
         from_attributes = True
 
+class PricePoint(BaseModel):
+    timestamp: datetime  # Start of the bucket, or the row's time at raw resolution
+    site: Optional[str] = None
+    open: float
+    high: float
+    low: float
+    close: float
+    count: int
+
+class PriceSeries(BaseModel):
+    component_id: int
+    resolution: str  # raw, hour or day
+    start: datetime
+    end: datetime
+    points: List[PricePoint]
+
 # Analytics Schemas
 class AnalyticsBase(BaseModel):
     event_type: str
@@ -71,4 +87,17 @@ class Analytics(AnalyticsBase):
     created_at: datetime
 
     class Config:
-        from_attributes = True 
\ No newline at end of file
+        from_attributes = True
+
+# Crawler Schemas
+class CrawlJobStatus(BaseModel):
+    job_id: str
+    component_id: Optional[int] = None
+    status: str
+    total: int
+    completed: int
+    failed: int
+    remaining: int
+    started_at: datetime
+    finished_at: Optional[datetime] = None
+    error: Optional[str] = None
@@ -2,10 +2,13 @@ from datetime import datetime, timedelta
 from typing import Optional, List
 from jose import JWTError, jwt
 from passlib.context import CryptContext
-from sqlalchemy.orm import Session
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, selectinload
 from fastapi import HTTPException, status
 from ..models.auth import User, Role
 from ..schemas.auth import UserCreate, UserInDB, TokenData
+import asyncio
 import json
 
 # Security configuration
@@ -126,4 +129,89 @@ class AuthService:
     def remove_role_from_user(db: Session, user: User, role: Role) -> None:
         user.roles.remove(role)
         db.commit()
-        db.refresh(user) 
\ No newline at end of file
+        db.refresh(user)
+
+
+class AsyncAuthService(AuthService):
+    """
+    AuthService on an AsyncSession. Users come back as models with their
+    roles loaded, ready for the User response schema and permission checks.
+    bcrypt runs in a worker thread: a hash takes long enough to stall every
+    other request on the event loop.
+    """
+    @staticmethod
+    async def _get_user_where(db: AsyncSession, *criteria) -> Optional[User]:
+        return await db.scalar(
+            select(User).options(selectinload(User.roles)).filter(*criteria)
+            .execution_options(populate_existing=True)
+        )
+
+    @staticmethod
+    async def get_user(db: AsyncSession, username: str) -> Optional[User]:
+        return await AsyncAuthService._get_user_where(db, User.username == username)
+
+    @staticmethod
+    async def get_user_by_id(db: AsyncSession, user_id: int) -> Optional[User]:
+        """Also reloads a user already in the session, e.g. after a commit changed it."""
+        return await AsyncAuthService._get_user_where(db, User.id == user_id)
+
+    @staticmethod
+    async def get_user_by_email(db: AsyncSession, email: str) -> Optional[User]:
+        return await AsyncAuthService._get_user_where(db, User.email == email)
+
+    @staticmethod
+    async def list_users(db: AsyncSession, skip: int = 0, limit: int = 100) -> List[User]:
+        result = await db.scalars(select(User).options(selectinload(User.roles)).offset(skip).limit(limit))
+        return result.all()
+
+    @staticmethod
+    async def verify_password_async(plain_password: str, hashed_password: str) -> bool:
+        return await asyncio.to_thread(AuthService.verify_password, plain_password, hashed_password)
+
+    @staticmethod
+    async def get_password_hash_async(password: str) -> str:
+        return await asyncio.to_thread(AuthService.get_password_hash, password)
+
+    @staticmethod
+    async def create_user(db: AsyncSession, user: UserCreate, is_superuser: bool = False) -> User:
+        db_user = User(
+            email=user.email,
+            username=user.username,
+            full_name=user.full_name,
+            hashed_password=await AsyncAuthService.get_password_hash_async(user.password),
+            is_superuser=is_superuser
+        )
+        db.add(db_user)
+        await db.commit()
+        return await AsyncAuthService.get_user_by_id(db, db_user.id)
+
+    @staticmethod
+    async def authenticate_user(db: AsyncSession, username: str, password: str) -> Optional[User]:
+        user = await AsyncAuthService.get_user(db, username)
+        if not user:
+            return None
+        if not await AsyncAuthService.verify_password_async(password, user.hashed_password):
+            return None
+        return user
+
+    @staticmethod
+    async def create_role(db: AsyncSession, name: str, description: str, permissions: List[str]) -> Role:
+        db_role = Role(
+            name=name,
+            description=description,
+            permissions=json.dumps(permissions)
+        )
+        db.add(db_role)
+        await db.commit()
+        await db.refresh(db_role)
+        return db_role
+
+    @staticmethod
+    async def assign_role_to_user(db: AsyncSession, user: User, role: Role) -> None:
+        user.roles.append(role)
+        await db.commit()
+
+    @staticmethod
+    async def remove_role_from_user(db: AsyncSession, user: User, role: Role) -> None:
+        user.roles.remove(role)
+        await db.commit()
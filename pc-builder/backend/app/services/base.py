@@ -1,4 +1,6 @@
 from typing import Generic, TypeVar, Type, Optional, List
+from sqlalchemy import select
+from sqlalchemy.ext.asyncio import AsyncSession
 from sqlalchemy.orm import Session
 from ..models.base import BaseModel
 from pydantic import BaseModel as PydanticBaseModel
@@ -46,4 +48,51 @@ class BaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
         
         db.delete(db_obj)
         db.commit()
-        return True 
\ No newline at end of file
+        return True
+
+class AsyncBaseService(Generic[ModelType, CreateSchemaType, UpdateSchemaType]):
+    """
+    BaseService for AsyncSession: the same operations, awaited, so queries
+    don't block the event loop. Relationships can't be lazy loaded on an
+    AsyncSession: queries whose results are serialized with nested
+    response models load those relationships eagerly.
+    """
+    def __init__(self, model: Type[ModelType]):
+        self.model = model
+
+    async def get(self, db: AsyncSession, id: int) -> Optional[ModelType]:
+        return await db.get(self.model, id)
+
+    async def get_all(self, db: AsyncSession, skip: int = 0, limit: int = 100) -> List[ModelType]:
+        result = await db.scalars(select(self.model).offset(skip).limit(limit))
+        return result.all()
+
+    async def create(self, db: AsyncSession, obj_in: CreateSchemaType) -> ModelType:
+        obj_data = obj_in.model_dump()
+        db_obj = self.model(**obj_data)
+        db.add(db_obj)
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def update(self, db: AsyncSession, id: int, obj_in: UpdateSchemaType) -> Optional[ModelType]:
+        db_obj = await self.get(db, id)
+        if not db_obj:
+            return None
+
+        update_data = obj_in.model_dump(exclude_unset=True)
+        for field, value in update_data.items():
+            setattr(db_obj, field, value)
+
+        await db.commit()
+        await db.refresh(db_obj)
+        return db_obj
+
+    async def delete(self, db: AsyncSession, id: int) -> bool:
+        db_obj = await self.get(db, id)
+        if not db_obj:
+            return False
+
+        await db.delete(db_obj)
+        await db.commit()
+        return True
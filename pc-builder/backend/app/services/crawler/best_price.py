@@ -0,0 +1,140 @@
+from typing import Awaitable, Callable, Dict, Hashable, List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ...database.config import SessionLocal
+from ...models.models import Component, Price
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+BEST_PRICE_MAX_AGE = int(os.getenv("CRAWLER_BEST_PRICE_MAX_AGE_SECONDS", "3600"))
+
+
+def compare_offers(component: Component, offers: List[dict]) -> dict:
+    """Best price across sites from per-site offer dicts."""
+    priced = sorted((offer for offer in offers if offer.get("price") is not None), key=lambda offer: offer["price"])
+    response = {
+        "component_id": component.id,
+        "name": component.name,
+        "offers": [
+            {key: offer.get(key) for key in ("site", "price", "currency", "url", "timestamp", "error")}
+            for offer in offers
+        ],
+        "timestamp": datetime.utcnow().isoformat()
+    }
+    if not priced:
+        response["error"] = "Price not available"
+        return response
+
+    best = priced[0]
+    response.update({
+        "price": best["price"],
+        "currency": best.get("currency"),
+        "site": best["site"],
+        "url": best.get("url")
+    })
+    return response
+
+
+class SingleFlight:
+    def __init__(self):
+        """Runs at most one task per key; concurrent callers share its result."""
+        self._tasks: Dict[Hashable, asyncio.Task] = {}
+
+    def in_flight(self, key: Hashable) -> bool:
+        return key in self._tasks
+
+    def run(self, key: Hashable, func: Callable[[], Awaitable]) -> asyncio.Task:
+        task = self._tasks.get(key)
+        if task is None:
+            task = self._tasks[key] = asyncio.create_task(func())
+            task.add_done_callback(lambda _: self._tasks.pop(key, None))
+        return task
+
+
+class BestPriceService:
+    def __init__(self, crawler_service, max_age: timedelta = timedelta(seconds=BEST_PRICE_MAX_AGE)):
+        """
+        Answers best-price requests from the latest stored price per site.
+        When the component was last checked more than `max_age` ago a crawl
+        of the component is started in the background and the stored prices are
+        returned as they are; concurrent requests share one crawl per
+        component. Only a component with no stored prices waits for it.
+        """
+        self.crawler_service = crawler_service
+        self.max_age = max_age
+        self.refreshes = SingleFlight()
+
+    def latest_offers(self, db: Session, component_id: int) -> List[dict]:
+        """The newest stored price of each site for a component."""
+        latest = db.query(
+            Price.site,
+            func.max(Price.timestamp).label("timestamp")
+        ).filter(Price.component_id == component_id).group_by(Price.site).subquery()
+        rows = db.query(Price).join(
+            latest,
+            Price.site.is_not_distinct_from(latest.c.site) & (Price.timestamp == latest.c.timestamp)
+        ).filter(Price.component_id == component_id).all()
+
+        offers = {}
+        for row in rows:
+            site = row.site or "unknown"
+            if site not in offers or row.id > offers[site]["id"]:
+                adapter = self.crawler_service.supported_sites.get(row.site)
+                offers[site] = {
+                    "id": row.id,
+                    "site": site,
+                    "price": row.price,
+                    "currency": adapter.currency if adapter else None,
+                    "url": row.url,
+                    "timestamp": row.timestamp
+                }
+        return list(offers.values())
+
+    def is_stale(self, component: Component, offers: List[dict], now: datetime = None) -> bool:
+        """
+        Stale when there are no stored prices or the component wasn't
+        checked within max_age. Prices are only stored when they change, so
+        their timestamps don't say when they were last seen; last_checked_at
+        is written with every crawled batch.
+        """
+        cutoff = (now or datetime.utcnow()) - self.max_age
+        checked_at = component.last_checked_at
+        return not offers or checked_at is None or checked_at.replace(tzinfo=None) < cutoff
+
+    def refresh(self, component_id: int) -> asyncio.Task:
+        """Crawl a component unless a crawl for it is already running."""
+        return self.refreshes.run(component_id, lambda: self._crawl(component_id))
+
+    async def _crawl(self, component_id: int):
+        db = SessionLocal()
+        try:
+            await self.crawler_service.crawl_prices(db, component_id=component_id)
+        except Exception as e:
+            logger.error(f"Best price refresh for component {component_id} failed: {str(e)}")
+        finally:
+            db.close()
+
+    async def get_best_price(self, db: Session, component_id: int) -> Optional[dict]:
+        component = db.query(Component).filter(Component.id == component_id).first()
+        if not component:
+            return None
+
+        offers = self.latest_offers(db, component_id)
+        stale = self.is_stale(component, offers)
+        if stale:
+            task = self.refresh(component_id)
+            if not offers:
+                # Hand the connection back to the pool while waiting on the crawl; expires the component too
+                db.rollback()
+                await asyncio.shield(task)
+                offers = self.latest_offers(db, component_id)
+                stale = self.is_stale(component, offers)
+
+        response = compare_offers(component, offers)
+        response["stale"] = stale
+        response["refreshing"] = self.refreshes.in_flight(component_id)
+        return response
@@ -0,0 +1,142 @@
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+from functools import lru_cache
+import re
+
+# Common manufacturers and their identifiers, in priority order: when a
+# name mentions several, the one listed first wins.
+MANUFACTURERS = {
+    "nvidia": ["nvidia", "geforce"],
+    "amd": ["amd", "radeon", "ryzen"],
+    "intel": ["intel", "core"],
+    "corsair": ["corsair"],
+    "crucial": ["crucial"],
+    "gskill": ["g.skill", "gskill", "trident"],
+    "asus": ["asus", "rog"],
+    "msi": ["msi"],
+    "gigabyte": ["gigabyte", "aorus"],
+    "asrock": ["asrock"],
+    "evga": ["evga"],
+    "zotac": ["zotac"]
+}
+
+_KEYWORD_PRIORITY = {
+    keyword: (priority, manufacturer)
+    for priority, (manufacturer, keywords) in enumerate(MANUFACTURERS.items())
+    for keyword in keywords
+}
+
+# One alternation over every keyword, in priority order so that at any
+# position the highest-priority keyword starting there is the one matched.
+MANUFACTURER_PATTERN = re.compile(
+    "|".join(
+        re.escape(keyword)
+        for keyword in sorted(_KEYWORD_PRIORITY, key=lambda k: (_KEYWORD_PRIORITY[k][0], -len(k)))
+    )
+)
+
+
+def _series_model(series: str) -> Callable:
+    def apply(match, details):
+        details["series"] = series
+        details["model"] = match.group(1).upper()
+    return apply
+
+
+def _numbered_series(template: str) -> Callable:
+    def apply(match, details):
+        details["series"] = template.format(match.group(1))
+        details["model"] = match.group(2).upper()
+    return apply
+
+
+def _spec(template: str) -> Callable:
+    def apply(match, details):
+        details["specs"].append(template.format(match.group(1)))
+    return apply
+
+
+# Per-category rule tables: (guard substring, compiled pattern, apply).
+# "exclusive" tables stop at the first rule whose guard is in the name,
+# like an if/elif chain; the others apply every rule in order.
+CATEGORY_RULES: Dict[str, Tuple[bool, List[Tuple[Optional[str], re.Pattern, Callable]]]] = {
+    "Graphics Cards": (True, [
+        # NVIDIA GPUs
+        ("rtx", re.compile(r'rtx\s*(\d{4}(?:\s*ti)?)'), _series_model("RTX")),
+        ("gtx", re.compile(r'gtx\s*(\d{4}(?:\s*ti)?)'), _series_model("GTX")),
+        # AMD GPUs
+        ("rx", re.compile(r'rx\s*(\d{4}\s*xt?)'), _series_model("RX")),
+    ]),
+    "Processors": (True, [
+        # AMD CPUs
+        ("ryzen", re.compile(r'ryzen\s*(\d)\s*(\d{4}(?:x\d+)?)'), _numbered_series("Ryzen {}")),
+        # Intel CPUs
+        ("core", re.compile(r'i([3579])[- ](\d{4,5}[k-zK-Z]*)'), _numbered_series("Core i{}")),
+    ]),
+    "Memory": (False, [
+        # RAM capacity, type and speed
+        (None, re.compile(r'(\d+)\s*gb'), _spec("{}GB")),
+        (None, re.compile(r'ddr(\d+)'), _spec("DDR{}")),
+        (None, re.compile(r'(\d{4,5})\s*(?:mhz|mt/s)'), _spec("{}MHz")),
+    ]),
+}
+
+
+def find_manufacturer(name: str) -> Optional[str]:
+    """Highest-priority manufacturer whose keyword appears in a lowercased name."""
+    best = None
+    search = MANUFACTURER_PATTERN.search
+    match = search(name)
+    while match:
+        candidate = _KEYWORD_PRIORITY[match.group()]
+        if best is None or candidate[0] < best[0]:
+            best = candidate
+            if best[0] == 0:
+                break
+        # Resume one character later so overlapping keywords are not missed
+        match = search(name, match.start() + 1)
+    return best[1] if best else None
+
+
+@lru_cache(maxsize=16384)
+def _extract(name: str, category: str) -> tuple:
+    details = {
+        "manufacturer": find_manufacturer(name),
+        "model": None,
+        "series": None,
+        "specs": []
+    }
+
+    exclusive, rules = CATEGORY_RULES.get(category, (False, []))
+    for guard, pattern, apply in rules:
+        if guard is not None and guard not in name:
+            continue
+        match = pattern.search(name)
+        if match:
+            apply(match, details)
+        if exclusive:
+            break
+
+    return details["manufacturer"], details["model"], details["series"], tuple(details["specs"])
+
+
+def extract_component_details(name: str, category: str) -> dict:
+    """
+    Extract manufacturer, series, model and specs from a component name.
+    Returns a dictionary with extracted details.
+    """
+    manufacturer, model, series, specs = _extract(name.lower(), category)
+    return {
+        "manufacturer": manufacturer,
+        "model": model,
+        "series": series,
+        "specs": list(specs)
+    }
+
+
+def extract_component_details_batch(items: Iterable[Tuple[str, str]]) -> List[dict]:
+    """Extract details for many (name, category) pairs in one call."""
+    extract = _extract
+    return [
+        {"manufacturer": manufacturer, "model": model, "series": series, "specs": list(specs)}
+        for manufacturer, model, series, specs in (extract(name.lower(), category) for name, category in items)
+    ]
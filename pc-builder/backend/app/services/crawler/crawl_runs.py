@@ -0,0 +1,94 @@
+from typing import List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import insert
+from sqlalchemy.orm import Session
+from ...models.models import Component, CrawlRun, CrawlRunItem
+from .engine import summarize_outcomes
+import logging
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlRunService:
+    def __init__(self, run_window: timedelta = timedelta(hours=6)):
+        """
+        Tracks full-catalog crawl runs so an interrupted run can resume.
+        A run walks components in id order; its cursor and the per-component
+        outcomes are checkpointed after every chunk. A run that is still
+        open within `run_window` of its start is resumed instead of
+        starting a new one.
+        """
+        self.run_window = run_window
+
+    def get(self, db: Session, run_id: int) -> Optional[CrawlRun]:
+        return db.query(CrawlRun).filter(CrawlRun.id == run_id).first()
+
+    def start_or_resume(self, db: Session, now: datetime = None) -> CrawlRun:
+        """Resume the latest open run inside the window, or start a new one."""
+        now = now or datetime.utcnow()
+        run = db.query(CrawlRun).filter(
+            CrawlRun.status == "running",
+            CrawlRun.started_at >= now - self.run_window
+        ).order_by(CrawlRun.id.desc()).first()
+
+        if run:
+            logger.info(f"Resuming crawl run {run.id} after component {run.cursor}")
+            return run
+
+        # Anything older is abandoned rather than resumed
+        db.query(CrawlRun).filter(CrawlRun.status == "running").update(
+            {CrawlRun.status: "failed", CrawlRun.finished_at: now},
+            synchronize_session=False
+        )
+        run = CrawlRun(status="running", cursor=0, completed=0, failed=0, started_at=now)
+        db.add(run)
+        db.commit()
+        db.refresh(run)
+        logger.info(f"Started crawl run {run.id}")
+        return run
+
+    def next_component_ids(self, db: Session, run: CrawlRun, limit: int = 50) -> List[int]:
+        """The next chunk of component ids after the run's cursor that it has not finished."""
+        done = db.query(CrawlRunItem.component_id).filter(CrawlRunItem.run_id == run.id)
+        rows = db.query(Component.id).filter(
+            Component.id > run.cursor,
+            Component.id.notin_(done)
+        ).order_by(Component.id).limit(limit).all()
+        return [row[0] for row in rows]
+
+    def checkpoint(self, db: Session, run: CrawlRun, component_ids: List[int], results: List[dict]):
+        """
+        Record the outcome of a chunk and advance the cursor, in one small
+        transaction. A component is completed if any site returned a price.
+        """
+        outcomes = summarize_outcomes(component_ids, results)
+
+        now = datetime.utcnow()
+        db.execute(insert(CrawlRunItem), [
+            {
+                "run_id": run.id,
+                "component_id": component_id,
+                "status": "failed" if error else "completed",
+                "error": error,
+                "updated_at": now
+            }
+            for component_id, error in outcomes.items()
+        ])
+        failed = sum(1 for error in outcomes.values() if error)
+        run.completed += len(outcomes) - failed
+        run.failed += failed
+        run.cursor = max([run.cursor, *component_ids])
+        run.checkpointed_at = now
+        db.commit()
+
+    def finish(self, db: Session, run: CrawlRun, status: str = "completed"):
+        run.status = status
+        run.finished_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"Crawl run {run.id} {status}: {run.completed} completed, {run.failed} failed")
+
+    def latest_open_run(self, db: Session) -> Optional[CrawlRun]:
+        return db.query(CrawlRun).filter(
+            CrawlRun.status == "running",
+            CrawlRun.started_at >= datetime.utcnow() - self.run_window
+        ).order_by(CrawlRun.id.desc()).first()
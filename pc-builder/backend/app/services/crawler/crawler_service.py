@@ -1,132 +1,121 @@
-from sqlalchemy.orm import Session
-from ...models.models import Component, Price
+from sqlalchemy.orm import Session, sessionmaker
+from ...models.models import Component, Price, CrawlRun
 from datetime import datetime
 import logging
 import aiohttp
-from bs4 import BeautifulSoup
 import re
 import asyncio
+import os
 import random
+import time
+from typing import Awaitable, Callable, Dict, List, Optional, Tuple
+from .engine import CrawlEngine, CrawlStats
+from .rate_limiter import get_host_rate_limiter
+from .response_cache import ResponseCache, body_hash
+from .parse_executor import ParseExecutor, get_parse_executor
+from .price_writer import PriceWriter, WriterStats
+from .component_details import extract_component_details
+from .crawl_runs import CrawlRunService
+from .resilience import CircuitOpenError, FetchError, PageNotFound, RetryPolicy, get_circuit_breaker
+from .sites import SiteAdapter, enabled_adapters
+from .best_price import compare_offers
+from .pins import PinBook
+from .matching import TitleMatcher
+from .http_pool import ACCEPT_ENCODING, HttpClientPool, get_http_pool
+from . import metrics
 
 logger = logging.getLogger(__name__)
 
+# Search results scored against each component
+MATCH_CANDIDATES = int(os.getenv("CRAWLER_MATCH_CANDIDATES", "20"))
+
+FILLER_WORDS = re.compile(r'\b(gaming|rgb|series|edition)\b')
+
 class CrawlerService:
-    def __init__(self):
+    def __init__(
+        self,
+        response_cache: ResponseCache = None,
+        parse_executor: ParseExecutor = None,
+        supported_sites: Dict[str, dict] = None,
+        use_response_cache: bool = True,
+        rate_share: float = 1.0,
+        http_pool: HttpClientPool = None
+    ):
+        """
+        Sites come from the adapter registry in `sites`. `supported_sites`
+        overrides adapter attributes per site, e.g.
+        {"amazon_in": {"base_url": "http://127.0.0.1:8081/s?k="}} to point
+        the crawler at the offline replay server.
+
+        `rate_share` scales every site's rate limit, so N worker processes
+        each running at 1/N stay within the site's limit together.
+        """
+        if use_response_cache:
+            self.response_cache = response_cache if response_cache is not None else ResponseCache()
+        else:
+            self.response_cache = None
+        self.parse_executor = parse_executor or get_parse_executor()
+        self.http_pool = http_pool or get_http_pool()
         self.headers = {
             'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36',
             'Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/webp,*/*;q=0.8',
             'Accept-Language': 'en-US,en;q=0.5',
-            'Accept-Encoding': 'gzip, deflate, br',
+            'Accept-Encoding': ACCEPT_ENCODING,
             'Connection': 'keep-alive',
             'Cache-Control': 'max-age=0'
         }
-        self.base_delay = 2  # Base delay between requests in seconds
+        self.base_delay = 2  # Default delay between requests to one site, in seconds
         self.max_retries = 3
+        self.retry_policy = RetryPolicy(max_retries=self.max_retries)
+        self.worker_count = 8  # Components crawled concurrently
+        self.last_run_stats: CrawlStats = None
+        self.write_batch_size = 200  # Crawled prices per database commit
+        self.last_write_stats: WriterStats = None
+        self._search_terms: Dict[int, Tuple[tuple, str]] = {}
+        self.matcher = TitleMatcher()
+        self.match_candidates = MATCH_CANDIDATES
+        self.fetch_stats: Dict[str, dict] = {kind: {"pages": 0, "bytes": 0, "seconds": 0.0} for kind in ("search", "product")}
+        self.run_service = CrawlRunService()
         
-        # Update supported sites with search configuration
-        self.supported_sites = {
-            "amazon_in": {
-                "base_url": "https://www.amazon.in/s?k=",
-                "price_selector": ".a-price .a-offscreen",
-                "product_selector": "div.s-result-item[data-component-type='s-search-result']",
-                "title_selector": "span.a-text-normal",
-                "link_selector": "a.a-link-normal.s-no-outline",
-                "currency": "₹"
-            }
-        }
+        self.supported_sites: Dict[str, SiteAdapter] = enabled_adapters(supported_sites)
+
+        # Limits are per host and shared by every CrawlerService in the process
+        self.rate_limiter = get_host_rate_limiter()
+        for adapter in self.supported_sites.values():
+            self.rate_limiter.configure(
+                adapter.base_url,
+                adapter.rate_limit["calls_per_second"] * rate_share,
+                max(1, int(adapter.rate_limit["burst"] * rate_share))
+            )
 
     def _extract_component_details(self, name: str, category: str) -> dict:
         """
         Extract component details using LLM-like pattern matching.
         Returns a dictionary with extracted details.
         """
-        name = name.lower()
-        details = {
-            "manufacturer": None,
-            "model": None,
-            "series": None,
-            "specs": []
-        }
-
-        # Common manufacturers and their identifiers
-        manufacturers = {
-            "nvidia": ["nvidia", "geforce"],
-            "amd": ["amd", "radeon", "ryzen"],
-            "intel": ["intel", "core"],
-            "corsair": ["corsair"],
-            "crucial": ["crucial"],
-            "gskill": ["g.skill", "gskill", "trident"],
-            "asus": ["asus", "rog"],
-            "msi": ["msi"],
-            "gigabyte": ["gigabyte", "aorus"],
-            "asrock": ["asrock"],
-            "evga": ["evga"],
-            "zotac": ["zotac"]
-        }
-
-        # Find manufacturer
-        for mfg, keywords in manufacturers.items():
-            if any(keyword in name for keyword in keywords):
-                details["manufacturer"] = mfg
-                break
-
-        # Extract model details based on category
-        if category == "Graphics Cards":
-            # NVIDIA GPUs
-            if "rtx" in name:
-                rtx_match = re.search(r'rtx\s*(\d{4}(?:\s*ti)?)', name)
-                if rtx_match:
-                    details["series"] = "RTX"
-                    details["model"] = rtx_match.group(1).upper()
-            elif "gtx" in name:
-                gtx_match = re.search(r'gtx\s*(\d{4}(?:\s*ti)?)', name)
-                if gtx_match:
-                    details["series"] = "GTX"
-                    details["model"] = gtx_match.group(1).upper()
-            # AMD GPUs
-            elif "rx" in name:
-                rx_match = re.search(r'rx\s*(\d{4}\s*xt?)', name)
-                if rx_match:
-                    details["series"] = "RX"
-                    details["model"] = rx_match.group(1).upper()
-
-        elif category == "Processors":
-            # AMD CPUs
-            if "ryzen" in name:
-                ryzen_match = re.search(r'ryzen\s*(\d)\s*(\d{4}(?:x\d+)?)', name)
-                if ryzen_match:
-                    details["series"] = f"Ryzen {ryzen_match.group(1)}"
-                    details["model"] = ryzen_match.group(2).upper()
-            # Intel CPUs
-            elif "core" in name:
-                core_match = re.search(r'i([3579])[- ](\d{4,5}[k-zK-Z]*)', name)
-                if core_match:
-                    details["series"] = f"Core i{core_match.group(1)}"
-                    details["model"] = core_match.group(2).upper()
-
-        elif category == "Memory":
-            # RAM capacity
-            capacity_match = re.search(r'(\d+)\s*gb', name)
-            if capacity_match:
-                details["specs"].append(f"{capacity_match.group(1)}GB")
-            # RAM type
-            ddr_match = re.search(r'ddr(\d+)', name)
-            if ddr_match:
-                details["specs"].append(f"DDR{ddr_match.group(1)}")
-            # RAM speed
-            speed_match = re.search(r'(\d{4,5})\s*(?:mhz|mt/s)', name)
-            if speed_match:
-                details["specs"].append(f"{speed_match.group(1)}MHz")
-
-        return details
+        return extract_component_details(name, category)
 
     def _prepare_search_term(self, component: Component) -> str:
         """
         Prepare search term using LLM-extracted component details.
+        Terms are memoized per component and recomputed only when the
+        component's name or category changes.
         """
         if not component.name or not component.category:
             return ""
 
+        # The term is built from these alone; the manufacturer is extracted from the name
+        key = (component.name, component.category.name)
+        cached = self._search_terms.get(component.id)
+        if cached and cached[0] == key:
+            return cached[1]
+
+        search_term = self._build_search_term(component)
+        self._search_terms[component.id] = (key, search_term)
+        return search_term
+
+    def _build_search_term(self, component: Component) -> str:
+
         # Extract component details
         details = self._extract_component_details(component.name, component.category.name)
         search_parts = []
@@ -147,7 +136,7 @@ class CrawlerService:
 
         # If no specific details found, use cleaned component name
         if not search_parts:
-            clean_name = re.sub(r'\b(gaming|rgb|series|edition)\b', '', component.name.lower())
+            clean_name = FILLER_WORDS.sub('', component.name.lower())
             search_parts = [part for part in clean_name.split() if len(part) > 2]
 
         # Join parts and clean up
@@ -155,174 +144,459 @@ class CrawlerService:
         search_term = ' '.join(search_term.split())  # Remove extra spaces
         
         logger.info(f"Generated search term for {component.name}: {search_term}")
-        return search_term.replace(' ', '+')
+        return search_term
+
+    async def _parse_search_results(self, body: bytes, adapter: SiteAdapter, encoding: str = None) -> list:
+        """
+        Extract title/price/url of the first `match_candidates` products on
+        a search page. The HTML is parsed by the parse executor, off the
+        event loop.
+        """
+        results = []
+        products = await self.parse_executor.extract(body, adapter.site_info, limit=self.match_candidates, encoding=encoding, site=adapter.name)
+        metrics.PRODUCTS_FOUND.observe(len(products), site=adapter.name)
+        
+        for title, price_text, url in products:
+            try:
+                price = adapter.parse_price(price_text)
+                if price is not None:
+                    results.append({
+                        'title': title,
+                        'price': price,
+                        'url': adapter.product_url(url)
+                    })
+            except Exception as e:
+                logger.error(f"Error parsing product: {str(e)}")
+                continue
+        
+        metrics.MATCHES.inc(len(results), site=adapter.name, outcome="accepted")
+        metrics.MATCHES.inc(len(products) - len(results), site=adapter.name, outcome="rejected")
+        return results
+
+    async def _parse_product_page(self, body: bytes, adapter: SiteAdapter, encoding: str = None) -> list:
+        """Title and price of a product detail page, as a one-item list like search results."""
+        title, price_text = await self.parse_executor.extract_product_page(body, adapter.site_info, encoding=encoding, site=adapter.name)
+        price = adapter.parse_price(price_text) if price_text else None
+        if price is None:
+            return []
+        return [{'title': title, 'price': price}]
 
-    async def search_product(self, session: aiohttp.ClientSession, search_term: str, site_info: dict) -> list:
-        """Search for a product and return results."""
+    async def _fetch(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        adapter: SiteAdapter,
+        kind: str,
+        parse: Callable[[bytes, SiteAdapter, str], Awaitable[list]]
+    ) -> list:
+        """
+        Fetch a page of one site and return its parsed results.
+        Sends a conditional request when the page is cached and reuses the
+        cached results on a 304 or when the body hash is unchanged.
+        Timeouts, connection errors and retryable statuses are retried with
+        exponential backoff (honoring Retry-After) while the site's circuit
+        breaker allows it. Raises PageNotFound on a 404, and
+        CircuitOpenError or FetchError when the page cannot be fetched.
+        """
+        site_name = adapter.name
+        breaker = get_circuit_breaker(site_name)
+        stats = self.fetch_stats[kind]
+
+        # The cache is a SQLite file: its reads and commits run in a thread, off the event loop
+        cached = await asyncio.to_thread(self.response_cache.get, url) if self.response_cache else None
+        headers = {**self.headers, **ResponseCache.conditional_headers(cached)}
+        last_error = None
+
+        for attempt in range(self.retry_policy.max_retries + 1):
+            token = breaker.allow()
+            if token is None:
+                raise CircuitOpenError(f"Circuit open for {breaker.name}, skipping request")
+            retry_after = None
+            try:
+                await self.rate_limiter.wait(adapter.base_url)
+
+                started = time.perf_counter()
+                try:
+                    async with session.get(url, headers=headers, trace_request_ctx={"site": site_name}) as response:
+                        if self.retry_policy.should_retry(response.status):
+                            breaker.record_failure()
+                            last_error = f"HTTP {response.status}"
+                            retry_after = response.headers.get('Retry-After')
+                        else:
+                            breaker.record_success()
+
+                            if response.status == 304 and cached:
+                                await asyncio.to_thread(self.response_cache.touch, url)
+                                return cached.results
+
+                            if response.status == 404:
+                                raise PageNotFound(f"{url} not found")
+
+                            if response.status != 200:
+                                logger.error(f"Fetching {url} failed with status {response.status}")
+                                return []
+
+                            body = await response.read()
+                            elapsed = time.perf_counter() - started
+                            metrics.REQUEST_SECONDS.observe(elapsed, site=site_name, kind=kind)
+                            metrics.RESPONSE_BYTES.observe(len(body), site=site_name, kind=kind)
+                            stats["pages"] += 1
+                            stats["bytes"] += len(body)
+                            stats["seconds"] += elapsed
+                            digest = body_hash(body)
+                            if cached and cached.body_hash == digest:
+                                await asyncio.to_thread(self.response_cache.touch, url)
+                                return cached.results
+
+                            results = await parse(body, adapter, response.get_encoding())
+
+                            if self.response_cache:
+                                await asyncio.to_thread(
+                                    self.response_cache.store,
+                                    url,
+                                    digest,
+                                    results,
+                                    etag=response.headers.get('ETag'),
+                                    last_modified=response.headers.get('Last-Modified')
+                                )
+                            return results
+
+                except (aiohttp.ClientError, asyncio.TimeoutError) as e:
+                    breaker.record_failure()
+                    last_error = str(e) or e.__class__.__name__
+            finally:
+                breaker.release(token)
+
+            if attempt < self.retry_policy.max_retries:
+                delay = self.retry_policy.delay(attempt, retry_after)
+                logger.warning(f"Retrying {url} in {delay:.1f}s after {last_error} "
+                               f"(attempt {attempt + 1}/{self.retry_policy.max_retries})")
+                await asyncio.sleep(delay)
+
+        raise FetchError(f"Giving up on {url} after {self.retry_policy.max_retries + 1} attempts: {last_error}")
+
+    async def search_product(
+        self,
+        session: aiohttp.ClientSession,
+        search_term: str,
+        adapter: SiteAdapter
+    ) -> list:
+        """Search for a product and return results. See _fetch for caching and retries."""
+        url = adapter.search_url(search_term)
+        logger.info(f"Searching: {url}")
+        return await self._fetch(session, url, adapter, "search", self._parse_search_results)
+
+    async def fetch_product_page(
+        self,
+        session: aiohttp.ClientSession,
+        url: str,
+        adapter: SiteAdapter
+    ) -> Optional[dict]:
+        """Title and price from a pinned product page, or None when it shows no valid price."""
+        results = await self._fetch(session, url, adapter, "product", self._parse_product_page)
+        return results[0] if results else None
+
+    async def _crawl_pinned(
+        self,
+        session: aiohttp.ClientSession,
+        component: Component,
+        adapter: SiteAdapter,
+        pins: PinBook,
+        writer: PriceWriter
+    ) -> Optional[dict]:
+        """
+        Price one component from its pinned product page. Returns None when
+        the component has to be searched instead: the page is gone (404),
+        its title drifted away from the pinned product, or it shows no price.
+        """
+        site_name = adapter.name
+        pin = pins.get(component.id, site_name)
         try:
-            url = f"{site_info['base_url']}{search_term}"
-            logger.info(f"Searching: {url}")
-
-            async with session.get(url, headers=self.headers) as response:
-                if response.status != 200:
-                    logger.error(f"Search failed with status {response.status}")
-                    return []
-
-                html = await response.text()
-                soup = BeautifulSoup(html, 'lxml')
-                
-                results = []
-                products = soup.select(site_info['product_selector'])
-                
-                for product in products[:3]:  # Look at first 3 results only
-                    try:
-                        title_elem = product.select_one(site_info['title_selector'])
-                        price_elem = product.select_one(site_info['price_selector'])
-                        link_elem = product.select_one(site_info['link_selector'])
-                        
-                        if not all([title_elem, price_elem, link_elem]):
-                            continue
-                            
-                        title = title_elem.text.strip()
-                        price_text = price_elem.text.strip()
-                        url = link_elem.get('href', '')
-                        if not url.startswith('http'):
-                            url = f"https://www.amazon.in{url}"
-                        
-                        # Extract price
-                        price_text = re.sub(r'[^\d.]', '', price_text)
-                        if price_text:
-                            price = float(price_text)
-                            if 1000 <= price <= 500000:  # Basic validation
-                                results.append({
-                                    'title': title,
-                                    'price': price,
-                                    'url': url
-                                })
-                    except Exception as e:
-                        logger.error(f"Error parsing product: {str(e)}")
-                        continue
-                
-                return results
-                
+            product = await self.fetch_product_page(session, pin['url'], adapter)
+        except PageNotFound:
+            logger.info(f"Pinned page for {component.name} on {site_name} is gone, searching again")
+            pins.unpin(component.id, site_name)
+            return None
         except Exception as e:
-            logger.error(f"Error searching products: {str(e)}")
-            return []
+            logger.error(f"Error fetching pinned page of {component.name} on {site_name}: {str(e)}")
+            return {
+                "component_id": component.id,
+                "component_name": component.name,
+                "site": site_name,
+                "error": str(e)
+            }
+
+        if product is None or pins.drifted(component.id, site_name, product['title']):
+            logger.info(f"Pinned page for {component.name} on {site_name} no longer matches, searching again")
+            return None
 
-    async def crawl_prices(self, db: Session, component_id: int = None, debug: bool = False) -> list:
-        """Crawl prices using search functionality."""
+        pins.verified(component.id, site_name, product['title'])
+        timestamp = await writer.add(component.id, product['price'], site=site_name, url=pin['url'])
+        return {
+            "component_id": component.id,
+            "component_name": component.name,
+            "site": site_name,
+            "price": product['price'],
+            "matched_product": product['title'] or pin['title'],
+            "url": pin['url'],
+            "timestamp": timestamp,
+            "currency": adapter.currency
+        }
+
+    async def _crawl_site(
+        self,
+        session: aiohttp.ClientSession,
+        components: List[Component],
+        search_term: str,
+        adapter: SiteAdapter,
+        writer: PriceWriter,
+        pins: PinBook
+    ) -> list:
+        """
+        Price every component of a search term on one site. Components
+        pinned to a product page are read from it, concurrently; the rest,
+        and pinned ones whose page no longer matches, share one search. Each
+        of them gets the result whose title best matches its name, if any
+        is similar enough, and is pinned to it.
+        """
+        site_name = adapter.name
+        results = []
+        unpinned = [component for component in components if pins.get(component.id, site_name) is None]
+        pinned = [component for component in components if pins.get(component.id, site_name) is not None]
+        if pinned:
+            pinned_results = await asyncio.gather(*[
+                self._crawl_pinned(session, component, adapter, pins, writer)
+                for component in pinned
+            ])
+            for component, result in zip(pinned, pinned_results):
+                if result is None:
+                    unpinned.append(component)
+                else:
+                    results.append(result)
+        if not unpinned:
+            return results
+
+        try:
+            search_results = await self.search_product(session, search_term, adapter)
+
+            if not search_results:
+                logger.warning(f"No results found for '{search_term}' on {site_name}")
+                return results + [{
+                    "component_id": component.id,
+                    "component_name": component.name,
+                    "site": site_name,
+                    "error": "No results found"
+                } for component in unpinned]
+
+            candidates = self.matcher.candidates([result['title'] for result in search_results])
+            for component in unpinned:
+                match = self.matcher.best(component.id, component.name, search_results, candidates)
+                if match is None:
+                    logger.warning(f"No result for '{search_term}' on {site_name} matches {component.name}")
+                    metrics.MATCHES.inc(site=site_name, outcome="no_match")
+                    results.append({
+                        "component_id": component.id,
+                        "component_name": component.name,
+                        "site": site_name,
+                        "error": "No matching result"
+                    })
+                    continue
+
+                # Queue the price for the next batched write
+                timestamp = await writer.add(component.id, match['price'], site=site_name, url=match['url'])
+                if adapter.supports_product_pages:
+                    pins.pin(component.id, site_name, match['url'], match['title'])
+
+                results.append({
+                    "component_id": component.id,
+                    "component_name": component.name,
+                    "site": site_name,
+                    "price": match['price'],
+                    "matched_product": match['title'],
+                    "match_score": match['match_score'],
+                    "url": match['url'],
+                    "timestamp": timestamp,
+                    "currency": adapter.currency
+                })
+            return results
+
+        except Exception as e:
+            logger.error(f"Error crawling {site_name} for '{search_term}': {str(e)}")
+            return results + [{
+                "component_id": component.id,
+                "component_name": component.name,
+                "site": site_name,
+                "error": str(e)
+            } for component in unpinned]
+
+    async def _crawl_search_term(
+        self,
+        session: aiohttp.ClientSession,
+        search_term: str,
+        components: List[Component],
+        writer: PriceWriter,
+        pins: PinBook
+    ) -> list:
+        """Crawl every supported site for one search term, sites in parallel."""
+        try:
+            site_results = await asyncio.gather(*[
+                self._crawl_site(session, components, search_term, adapter, writer, pins)
+                for adapter in self.supported_sites.values()
+            ])
+            return [result for results in site_results for result in results]
+
+        except Exception as e:
+            logger.error(f"Error processing search term '{search_term}': {str(e)}")
+            return [{
+                "component_id": component.id,
+                "component_name": component.name,
+                "error": str(e)
+            } for component in components]
+
+    def _group_by_search_term(self, components: List[Component], debug: bool = False) -> Dict[str, List[Component]]:
+        """Group components so each distinct search term is fetched only once."""
+        groups: Dict[str, List[Component]] = {}
+        for component in components:
+            try:
+                search_term = self._prepare_search_term(component)
+            except Exception as e:
+                logger.error(f"Error preparing search term for {component.name}: {str(e)}")
+                continue
+            if debug:
+                logger.info(f"Search term for {component.name}: {search_term}")
+            if search_term:
+                groups.setdefault(search_term, []).append(component)
+        return groups
+
+    async def crawl_prices(
+        self,
+        db: Session,
+        component_id: int = None,
+        debug: bool = False,
+        component_ids: List[int] = None,
+        on_results: Callable[[List[int], List[dict]], None] = None
+    ) -> list:
+        """
+        Crawl prices using search functionality, for one component, a list
+        of components or the whole catalog.
+        Components pinned to a product page by an earlier crawl are read
+        from that page; the rest are searched, and components sharing a
+        search term are searched once per run. Search
+        terms are spread over a pool of workers; each site is throttled by
+        its own token bucket, so different sites are crawled in parallel.
+
+        If `on_results` is given it is called with (component ids, results)
+        as each group of components finishes, and the results are not
+        collected into the returned list.
+        """
         results = []
         
         # Get components to crawl
         query = db.query(Component)
         if component_id:
             query = query.filter(Component.id == component_id)
+        elif component_ids is not None:
+            query = query.filter(Component.id.in_(component_ids))
         components = query.all()
         
         if not components:
             logger.warning("No components found to crawl")
             return results
 
-        timeout = aiohttp.ClientTimeout(total=60)
-        async with aiohttp.ClientSession(timeout=timeout) as session:
-            for component in components:
-                try:
-                    # Generate search term
-                    search_term = self._prepare_search_term(component)
-                    if debug:
-                        logger.info(f"Search term for {component.name}: {search_term}")
-                    
-                    # Search on each supported site
-                    for site_name, site_info in self.supported_sites.items():
-                        try:
-                            # Add delay between requests
-                            await asyncio.sleep(self.base_delay)
-                            
-                            # Search for products
-                            search_results = await self.search_product(session, search_term, site_info)
-                            
-                            if search_results:
-                                # Use the first valid result
-                                first_result = search_results[0]
-                                
-                                # Record the price
-                                price_entry = Price(
-                                    component_id=component.id,
-                                    price=first_result['price'],
-                                    timestamp=datetime.utcnow()
-                                )
-                                db.add(price_entry)
-                                
-                                results.append({
-                                    "component_id": component.id,
-                                    "component_name": component.name,
-                                    "site": site_name,
-                                    "price": first_result['price'],
-                                    "matched_product": first_result['title'],
-                                    "url": first_result['url'],
-                                    "timestamp": price_entry.timestamp,
-                                    "currency": site_info['currency']
-                                })
-                                
-                            else:
-                                logger.warning(f"No results found for {component.name} on {site_name}")
-                                results.append({
-                                    "component_id": component.id,
-                                    "component_name": component.name,
-                                    "site": site_name,
-                                    "error": "No results found"
-                                })
-                                
-                        except Exception as e:
-                            logger.error(f"Error crawling {site_name} for {component.name}: {str(e)}")
-                            results.append({
-                                "component_id": component.id,
-                                "component_name": component.name,
-                                "site": site_name,
-                                "error": str(e)
-                            })
-                
-                except Exception as e:
-                    logger.error(f"Error processing component {component.name}: {str(e)}")
-                    results.append({
-                        "component_id": component.id,
-                        "component_name": component.name,
-                        "error": str(e)
-                    })
-        
-        if results:
-            db.commit()
+        if self.matcher.needs_fit:
+            names = db.query(Component.id, Component.name).all()
+            await asyncio.to_thread(self.matcher.fit, [(row.id, row.name) for row in names])
+
+        groups = self._group_by_search_term(components, debug)
+        logger.info(f"Crawling {len(components)} components with {len(groups)} distinct search terms")
+        if on_results:
+            grouped = {component.id for group in groups.values() for component in group}
+            skipped = [component.id for component in components if component.id not in grouped]
+            if skipped:
+                on_results(skipped, [])
+
+        async def crawl_group(group):
+            search_term, group_components = group
+            group_results = await self._crawl_search_term(session, search_term, group_components, writer, pins)
+            if on_results:
+                on_results([component.id for component in group_components], group_results)
+            return group_results
+
+        engine = CrawlEngine(worker_count=self.worker_count)
+        session_factory = sessionmaker(bind=db.get_bind())
+        writer = PriceWriter(session_factory, batch_size=self.write_batch_size, sites=list(self.supported_sites))
+        pins = PinBook(session_factory, self.supported_sites)
+        pins.load(db, components)
+        session = await self.http_pool.session()
+        try:
+            async with writer:
+                self.last_run_stats = await engine.run(
+                    groups.items(),
+                    crawl_group,
+                    on_result=None if on_results else results.append
+                )
+        finally:
+            await asyncio.to_thread(pins.save)
+        self.last_write_stats = writer.stats
         
         return results
 
+    async def crawl_run(
+        self,
+        db: Session,
+        chunk_size: int = 50,
+        debug: bool = False,
+        requests_per_hour: Optional[float] = None
+    ) -> CrawlRun:
+        """
+        Crawl the whole catalog as a resumable run. Components are taken in
+        id order in chunks; each chunk's prices are written before its
+        checkpoint, so after a restart the run resumes at the next chunk
+        without fetching completed components again. With
+        `requests_per_hour` the run waits after each chunk so it sends no
+        more site requests than that.
+        """
+        run = self.run_service.start_or_resume(db)
+        try:
+            while True:
+                component_ids = self.run_service.next_component_ids(db, run, chunk_size)
+                if not component_ids:
+                    break
+                started = time.monotonic()
+                results = await self.crawl_prices(db, component_ids=component_ids, debug=debug)
+                self.run_service.checkpoint(db, run, component_ids, results)
+                if requests_per_hour:
+                    requests = len(component_ids) * len(self.supported_sites)
+                    await asyncio.sleep(max(0.0, requests * 3600 / requests_per_hour - (time.monotonic() - started)))
+        except asyncio.CancelledError:
+            # Leave the run open so the next start resumes it
+            raise
+        except Exception:
+            self.run_service.finish(db, run, status="failed")
+            raise
+        self.run_service.finish(db, run)
+        return run
+
+    def site_status(self) -> Dict[str, dict]:
+        """Supported sites with their circuit breaker state."""
+        return {
+            site_name: {**adapter.as_dict(), "circuit_breaker": get_circuit_breaker(site_name).as_dict()}
+            for site_name, adapter in self.supported_sites.items()
+        }
+
     async def get_best_price(self, db: Session, component_id: int) -> dict:
-        """Get the best current price for a component from Amazon.in."""
+        """
+        Crawl every supported site for a component, concurrently, and
+        return the lowest price along with each site's offer.
+        """
         try:
             component = db.query(Component).filter(Component.id == component_id).first()
             if not component:
                 raise ValueError("Component not found")
 
-            async with aiohttp.ClientSession() as session:
-                html = await self.fetch_amazon_page(session, component.url)
-                if html:
-                    price = self.extract_amazon_price(html)
-                    if price:
-                        return {
-                            "component_id": component_id,
-                            "name": component.name,
-                            "price": price,
-                            "currency": "₹",
-                            "url": component.url,
-                            "timestamp": datetime.utcnow().isoformat()
-                        }
-
-            return {
-                "component_id": component_id,
-                "name": component.name,
-                "error": "Price not available",
-                "timestamp": datetime.utcnow().isoformat()
-            }
+            results = await self.crawl_prices(db, component_id=component_id)
+            return compare_offers(component, results)
 
         except Exception as e:
             logger.error(f"Error getting best price: {str(e)}")
-            raise
\ No newline at end of file
+            raise
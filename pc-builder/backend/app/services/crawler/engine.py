@@ -0,0 +1,119 @@
+from typing import Any, Awaitable, Callable, Dict, Iterable, List, Optional
+from dataclasses import dataclass, field
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+def summarize_outcomes(component_ids: Iterable[int], results: List[dict]) -> Dict[int, Optional[str]]:
+    """
+    Map each component id to None if any site returned a price for it, or
+    to an error message otherwise.
+    """
+    outcomes: Dict[int, Optional[str]] = {component_id: "No results" for component_id in component_ids}
+    for result in results:
+        component_id = result.get("component_id")
+        if component_id not in outcomes:
+            continue
+        if "error" not in result:
+            outcomes[component_id] = None
+        elif outcomes[component_id] is not None:
+            outcomes[component_id] = result["error"]
+    return outcomes
+
+
+@dataclass
+class CrawlStats:
+    started_at: float = field(default_factory=time.monotonic)
+    finished_at: Optional[float] = None
+    completed: int = 0
+    failed: int = 0
+
+    @property
+    def elapsed(self) -> float:
+        end = self.finished_at if self.finished_at is not None else time.monotonic()
+        return max(end - self.started_at, 1e-9)
+
+    @property
+    def components_per_minute(self) -> float:
+        return (self.completed + self.failed) * 60 / self.elapsed
+
+    def as_dict(self) -> dict:
+        return {
+            "completed": self.completed,
+            "failed": self.failed,
+            "elapsed_seconds": round(self.elapsed, 2),
+            "components_per_minute": round(self.components_per_minute, 2)
+        }
+
+
+class CrawlEngine:
+    def __init__(self, worker_count: int = 8):
+        """
+        Runs crawl work items through a bounded pool of asyncio workers.
+        Per-host throttling is left to the handler's rate limiter, so the
+        pool size only bounds how many items are in flight at once.
+        """
+        self.worker_count = max(1, worker_count)
+
+    async def run(
+        self,
+        items: Iterable[Any],
+        handler: Callable[[Any], Awaitable[List[dict]]],
+        on_result: Optional[Callable[[dict], None]] = None
+    ) -> CrawlStats:
+        """
+        Feed every item to `handler` and pass each result it returns to
+        `on_result`. Stats are kept per component_id found in the results:
+        a component counts as failed when every result for it carries an
+        "error" key. An item whose handler raises counts as one failure.
+        """
+        queue: asyncio.Queue = asyncio.Queue()
+        for item in items:
+            queue.put_nowait(item)
+
+        stats = CrawlStats()
+
+        async def worker():
+            while True:
+                try:
+                    item = queue.get_nowait()
+                except asyncio.QueueEmpty:
+                    return
+                try:
+                    results = await handler(item)
+                except Exception as e:
+                    logger.error(f"Crawl worker failed on {item!r}: {str(e)}")
+                    results = []
+
+                # One item may cover several components; count each of them
+                outcomes = {}
+                for result in results:
+                    key = result.get("component_id")
+                    outcomes[key] = outcomes.get(key, False) or "error" not in result
+                if not outcomes:
+                    stats.failed += 1
+                for ok in outcomes.values():
+                    if ok:
+                        stats.completed += 1
+                    else:
+                        stats.failed += 1
+                if on_result:
+                    for result in results:
+                        on_result(result)
+
+        workers = [asyncio.create_task(worker()) for _ in range(min(self.worker_count, queue.qsize() or 1))]
+        try:
+            await asyncio.gather(*workers)
+        finally:
+            for task in workers:
+                task.cancel()
+            stats.finished_at = time.monotonic()
+
+        logger.info(
+            f"Crawl finished: {stats.completed} ok, {stats.failed} failed, "
+            f"{stats.components_per_minute:.1f} components/min"
+        )
+        return stats
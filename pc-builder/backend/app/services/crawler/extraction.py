@@ -0,0 +1,197 @@
+from typing import Dict, List, Optional, Tuple
+from bs4 import BeautifulSoup
+from lxml import etree
+import logging
+
+logger = logging.getLogger(__name__)
+
+# (title, price text, link href) as found on the page
+ProductTuple = Tuple[str, str, str]
+
+CHUNK_SIZE = 64 * 1024
+# Title and price sit close together on a product page, so it is fed in
+# smaller chunks to stop nearer to them
+DETAIL_CHUNK_SIZE = 16 * 1024
+
+
+def has_class(name: str) -> str:
+    """XPath predicate matching an element whose class list contains `name`."""
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+class CompiledSelectors:
+    def __init__(self, site_info: dict):
+        """Precompiled XPath expressions for one site's search result cards."""
+        self.product = etree.XPath(site_info['product_xpath'])
+        self.title = etree.XPath(site_info['title_xpath'])
+        self.price = etree.XPath(site_info['price_xpath'])
+        self.link = etree.XPath(site_info['link_xpath'])
+
+    @staticmethod
+    def _first_text(nodes) -> Optional[str]:
+        for node in nodes:
+            text = node if isinstance(node, str) else "".join(node.itertext())
+            if text and text.strip():
+                return text.strip()
+        return None
+
+    def extract(self, element) -> Optional[ProductTuple]:
+        title = self._first_text(self.title(element))
+        price = self._first_text(self.price(element))
+        link = self._first_text(self.link(element))
+        if not all([title, price, link]):
+            return None
+        return title, price, link
+
+
+_compiled: Dict[tuple, CompiledSelectors] = {}
+
+
+def compiled_selectors(site_info: dict) -> CompiledSelectors:
+    """Compile a site's XPath selectors once per process."""
+    key = (site_info['product_xpath'], site_info['title_xpath'], site_info['price_xpath'], site_info['link_xpath'])
+    selectors = _compiled.get(key)
+    if selectors is None:
+        selectors = _compiled[key] = CompiledSelectors(site_info)
+    return selectors
+
+
+def extract_products_lxml(
+    body: bytes,
+    site_info: dict,
+    limit: int = 3,
+    encoding: Optional[str] = None
+) -> List[ProductTuple]:
+    """
+    Stream the page through lxml's pull parser and stop feeding it as soon
+    as `limit` complete product cards have been seen, so the bulk of a
+    large search page is never parsed.
+    """
+    selectors = compiled_selectors(site_info)
+    parser = etree.HTMLPullParser(events=('end',), tag=site_info.get('product_tag', 'div'), encoding=encoding)
+    products: List[ProductTuple] = []
+    matched = 0
+
+    for offset in range(0, len(body), CHUNK_SIZE):
+        parser.feed(body[offset:offset + CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if not selectors.product(element):
+                continue
+            matched += 1
+            product = selectors.extract(element)
+            if product:
+                products.append(product)
+            if matched >= limit:
+                return products
+
+    parser.close()
+    for _, element in parser.read_events():
+        if matched >= limit:
+            break
+        if selectors.product(element):
+            matched += 1
+            product = selectors.extract(element)
+            if product:
+                products.append(product)
+    return products
+
+
+def extract_products_soup(html: str, site_info: dict, limit: int = 3) -> List[ProductTuple]:
+    """Full BeautifulSoup parse using the site's CSS selectors."""
+    soup = BeautifulSoup(html, 'lxml')
+    products: List[ProductTuple] = []
+
+    for product in soup.select(site_info['product_selector'], limit=limit):
+        title_elem = product.select_one(site_info['title_selector'])
+        price_elem = product.select_one(site_info['price_selector'])
+        link_elem = product.select_one(site_info['link_selector'])
+
+        if not all([title_elem, price_elem, link_elem]):
+            continue
+
+        products.append((title_elem.text.strip(), price_elem.text.strip(), link_elem.get('href', '')))
+    return products
+
+
+# (title, price text) from a product detail page
+DetailTuple = Tuple[Optional[str], Optional[str]]
+
+_compiled_detail: Dict[tuple, tuple] = {}
+
+
+def _detail_xpaths(site_info: dict) -> tuple:
+    key = (site_info['detail_title_xpath'], site_info['detail_price_xpath'])
+    xpaths = _compiled_detail.get(key)
+    if xpaths is None:
+        xpaths = _compiled_detail[key] = (etree.XPath(key[0]), etree.XPath(key[1]))
+    return xpaths
+
+
+def extract_product_page_lxml(body: bytes, site_info: dict, encoding: Optional[str] = None) -> DetailTuple:
+    """
+    Stream a product page and stop as soon as its title and price have
+    both been seen. Both XPaths are self:: tests run on each closed
+    element, so they may look at ancestors but not at later siblings.
+    """
+    title_xpath, price_xpath = _detail_xpaths(site_info)
+    parser = etree.HTMLPullParser(events=('end',), tag=site_info.get('detail_tag', 'span'), encoding=encoding)
+    title = price = None
+
+    for offset in range(0, len(body), DETAIL_CHUNK_SIZE):
+        parser.feed(body[offset:offset + DETAIL_CHUNK_SIZE])
+        for _, element in parser.read_events():
+            if title is None and title_xpath(element):
+                title = "".join(element.itertext()).strip() or None
+            elif price is None and price_xpath(element):
+                price = "".join(element.itertext()).strip() or None
+            if title and price:
+                return title, price
+    parser.close()
+    return title, price
+
+
+def extract_product_page_soup(html: str, site_info: dict) -> DetailTuple:
+    soup = BeautifulSoup(html, 'lxml')
+    title_elem = soup.select_one(site_info['detail_title_selector'])
+    price_elem = soup.select_one(site_info['detail_price_selector'])
+    return (
+        title_elem.text.strip() if title_elem else None,
+        price_elem.text.strip() if price_elem else None
+    )
+
+
+def extract_product_page(body: bytes, site_info: dict, encoding: Optional[str] = None) -> DetailTuple:
+    """Title and price text of a product detail page, lxml first like extract_products."""
+    if 'detail_title_xpath' in site_info:
+        try:
+            title, price = extract_product_page_lxml(body, site_info, encoding)
+            if title and price:
+                return title, price
+        except Exception as e:
+            logger.warning(f"lxml extraction failed, falling back to BeautifulSoup: {str(e)}")
+
+    html = body.decode(encoding or 'utf-8', errors='replace')
+    return extract_product_page_soup(html, site_info)
+
+
+def extract_products(
+    body: bytes,
+    site_info: dict,
+    limit: int = 3,
+    encoding: Optional[str] = None
+) -> List[ProductTuple]:
+    """
+    Extract up to `limit` product cards from a search page.
+    Uses the streaming lxml path when the site defines XPath selectors and
+    falls back to BeautifulSoup when it does not or when it finds nothing.
+    """
+    if 'product_xpath' in site_info:
+        try:
+            products = extract_products_lxml(body, site_info, limit, encoding)
+            if products:
+                return products
+        except Exception as e:
+            logger.warning(f"lxml extraction failed, falling back to BeautifulSoup: {str(e)}")
+
+    html = body.decode(encoding or 'utf-8', errors='replace')
+    return extract_products_soup(html, site_info, limit)
@@ -0,0 +1,132 @@
+from typing import Optional
+from types import SimpleNamespace
+from . import metrics
+import aiohttp
+import asyncio
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+HTTP_LIMIT = int(os.getenv("CRAWLER_HTTP_LIMIT", "100"))
+HTTP_LIMIT_PER_HOST = int(os.getenv("CRAWLER_HTTP_LIMIT_PER_HOST", "8"))
+DNS_CACHE_TTL = int(os.getenv("CRAWLER_DNS_CACHE_TTL", "300"))
+KEEPALIVE_TIMEOUT = float(os.getenv("CRAWLER_KEEPALIVE_TIMEOUT", "30"))
+REQUEST_TIMEOUT = float(os.getenv("CRAWLER_REQUEST_TIMEOUT", "60"))
+
+try:
+    import brotli  # noqa: F401 - aiohttp decodes br responses when this is importable
+    BROTLI_AVAILABLE = True
+except ImportError:
+    try:
+        import brotlicffi  # noqa: F401
+        BROTLI_AVAILABLE = True
+    except ImportError:
+        BROTLI_AVAILABLE = False
+
+# Only advertise encodings aiohttp can decode
+ACCEPT_ENCODING = "gzip, deflate, br" if BROTLI_AVAILABLE else "gzip, deflate"
+
+
+class HttpClientPool:
+    def __init__(
+        self,
+        limit: int = HTTP_LIMIT,
+        limit_per_host: int = HTTP_LIMIT_PER_HOST,
+        dns_cache_ttl: int = DNS_CACHE_TTL,
+        keepalive_timeout: float = KEEPALIVE_TIMEOUT,
+        request_timeout: float = REQUEST_TIMEOUT
+    ):
+        """
+        One aiohttp ClientSession for the life of the process, so crawls and
+        API calls reuse keep-alive connections and cached DNS lookups
+        instead of paying for new handshakes every run.
+        """
+        self.limit = limit
+        self.limit_per_host = limit_per_host
+        self.dns_cache_ttl = dns_cache_ttl
+        self.keepalive_timeout = keepalive_timeout
+        self.request_timeout = request_timeout
+        self._session: Optional[aiohttp.ClientSession] = None
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self.connections_created = 0
+        self.connections_reused = 0
+
+    def _trace_config(self) -> aiohttp.TraceConfig:
+        config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+
+        async def on_create(session, context, params):
+            self.connections_created += 1
+
+        async def on_reuse(session, context, params):
+            self.connections_reused += 1
+
+        config.on_connection_create_end.append(on_create)
+        config.on_connection_reuseconn.append(on_reuse)
+        return config
+
+    async def start(self) -> aiohttp.ClientSession:
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(
+                limit=self.limit,
+                limit_per_host=self.limit_per_host,
+                ttl_dns_cache=self.dns_cache_ttl,
+                keepalive_timeout=self.keepalive_timeout,
+                enable_cleanup_closed=True
+            )
+            self._session = aiohttp.ClientSession(
+                connector=connector,
+                timeout=aiohttp.ClientTimeout(total=self.request_timeout),
+                trace_configs=[metrics.trace_config(), self._trace_config()]
+            )
+            self._loop = asyncio.get_running_loop()
+            logger.info(f"Started crawler HTTP pool ({self.limit} connections, {self.limit_per_host} per host)")
+        return self._session
+
+    async def session(self) -> aiohttp.ClientSession:
+        """The shared session, started on first use in the running event loop."""
+        if self._session is not None and self._loop is not asyncio.get_running_loop():
+            # Started under another event loop (e.g. a previous asyncio.run); its connections are unusable
+            self._session = None
+        return await self.start()
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def stats(self) -> dict:
+        connector = self._session.connector if self._session is not None and not self._session.closed else None
+        idle = sum(len(conns) for conns in connector._conns.values()) if connector else 0
+        in_use = len(connector._acquired) if connector else 0
+        return {
+            "started": connector is not None,
+            "open": idle + in_use,
+            "idle": idle,
+            "in_use": in_use,
+            "created": self.connections_created,
+            "reused": self.connections_reused,
+            "limit": self.limit,
+            "limit_per_host": self.limit_per_host,
+            "dns_cache_ttl": self.dns_cache_ttl,
+            "keepalive_timeout": self.keepalive_timeout,
+            "brotli": BROTLI_AVAILABLE
+        }
+
+
+_default_pool: Optional[HttpClientPool] = None
+
+
+def get_http_pool() -> HttpClientPool:
+    """Process-wide pool shared by every CrawlerService."""
+    global _default_pool
+    if _default_pool is None:
+        _default_pool = HttpClientPool()
+    return _default_pool
+
+
+async def close_http_pool():
+    global _default_pool
+    if _default_pool is not None:
+        await _default_pool.close()
+        _default_pool = None
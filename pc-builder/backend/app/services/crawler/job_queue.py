@@ -0,0 +1,125 @@
+from typing import Dict, Iterable, List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import and_, func, or_, update
+from sqlalchemy.orm import Session
+from ...models.models import CrawlJob
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlJobQueue:
+    def __init__(self, lease_duration: timedelta = timedelta(minutes=5), max_attempts: int = 3):
+        """
+        Crawl job queue stored in the application database, so any number
+        of worker processes (on one box or several sharing the database)
+        can pull work from it.
+
+        Workers claim jobs by updating them to "leased" with a fresh lease
+        token and a `lease_until` deadline; the update only matches rows
+        that are still claimable, so two workers can never both win the
+        same job. Jobs whose lease expires (a worker died) become claimable
+        again. A job that fails `max_attempts` times is marked failed.
+        """
+        self.lease_duration = lease_duration
+        self.max_attempts = max_attempts
+
+    @staticmethod
+    def _claimable(now: datetime):
+        return or_(
+            CrawlJob.status == "pending",
+            and_(CrawlJob.status == "leased", CrawlJob.lease_until < now)
+        )
+
+    def enqueue(self, db: Session, component_ids: Iterable[int], priority: int = 0) -> int:
+        """Queue components that do not already have an open job."""
+        component_ids = list(dict.fromkeys(component_ids))
+        if not component_ids:
+            return 0
+        open_ids = {
+            row[0] for row in db.query(CrawlJob.component_id).filter(
+                CrawlJob.component_id.in_(component_ids),
+                CrawlJob.status.in_(("pending", "leased"))
+            ).all()
+        }
+        new_jobs = [
+            CrawlJob(component_id=component_id, status="pending", priority=priority, attempts=0)
+            for component_id in component_ids
+            if component_id not in open_ids
+        ]
+        db.add_all(new_jobs)
+        db.commit()
+        return len(new_jobs)
+
+    def claim(self, db: Session, worker_id: str, limit: int = 20, now: datetime = None) -> List[CrawlJob]:
+        """Atomically lease up to `limit` jobs for a worker."""
+        now = now or datetime.utcnow()
+        candidate_ids = [
+            row[0] for row in db.query(CrawlJob.id).filter(
+                self._claimable(now)
+            ).order_by(CrawlJob.priority.desc(), CrawlJob.id).limit(limit).all()
+        ]
+        if not candidate_ids:
+            return []
+
+        token = uuid.uuid4().hex
+        db.execute(
+            update(CrawlJob)
+            .where(CrawlJob.id.in_(candidate_ids), self._claimable(now))
+            .values(
+                status="leased",
+                lease_token=token,
+                lease_until=now + self.lease_duration,
+                worker_id=worker_id,
+                attempts=CrawlJob.attempts + 1
+            )
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return db.query(CrawlJob).filter(CrawlJob.lease_token == token).all()
+
+    def renew(self, db: Session, jobs: List[CrawlJob], now: datetime = None) -> int:
+        """Extend the lease of jobs still held by this worker."""
+        if not jobs:
+            return 0
+        now = now or datetime.utcnow()
+        result = db.execute(
+            update(CrawlJob)
+            .where(
+                CrawlJob.id.in_([job.id for job in jobs]),
+                CrawlJob.lease_token == jobs[0].lease_token,
+                CrawlJob.status == "leased"
+            )
+            .values(lease_until=now + self.lease_duration)
+            .execution_options(synchronize_session=False)
+        )
+        db.commit()
+        return result.rowcount
+
+    def complete(self, db: Session, jobs: List[CrawlJob], errors: Dict[int, Optional[str]]):
+        """
+        Finish leased jobs. `errors` maps component id to an error message
+        (None for success); failed jobs go back to pending until they run
+        out of attempts. Jobs whose lease was lost are left alone.
+        """
+        now = datetime.utcnow()
+        for job in jobs:
+            error = errors.get(job.component_id)
+            if error is None:
+                values = {"status": "completed", "completed_at": now, "last_error": None}
+            elif job.attempts >= self.max_attempts:
+                values = {"status": "failed", "completed_at": now, "last_error": error}
+            else:
+                values = {"status": "pending", "last_error": error}
+            db.execute(
+                update(CrawlJob)
+                .where(CrawlJob.id == job.id, CrawlJob.lease_token == job.lease_token)
+                .values(lease_token=None, lease_until=None, **values)
+                .execution_options(synchronize_session=False)
+            )
+        db.commit()
+
+    def stats(self, db: Session) -> Dict[str, int]:
+        rows = db.query(CrawlJob.status, func.count(CrawlJob.id)).group_by(CrawlJob.status).all()
+        return {status: count for status, count in rows}
@@ -0,0 +1,136 @@
+from typing import Collection, Dict, List, Optional
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ...models.models import Price
+import threading
+import time
+
+# Prices within this distance are the same price
+PRICE_EPSILON = 0.005
+
+
+class PriceChanges:
+    def __init__(self):
+        """What a batch of crawled prices changed, ready to be written."""
+        self.rows: List[dict] = []  # History rows to append
+        self.component_updates: List[dict] = []  # Component current_price/heartbeat updates
+        self.unchanged = 0
+        self._pending: Dict[int, Dict[Optional[str], float]] = {}
+
+
+class LastPriceCache:
+    def __init__(self, max_age: timedelta = timedelta(minutes=30)):
+        """
+        The last known price of every (component, site) pair, so crawls can
+        tell a changed price from a repeat without reading the prices table.
+        A component's entries are loaded from its latest stored prices on
+        first use and reloaded after `max_age`, which bounds how long other
+        processes writing the same component can go unnoticed.
+        """
+        self.max_age = max_age.total_seconds()
+        self._prices: Dict[int, Dict[Optional[str], float]] = {}
+        self._loaded_at: Dict[int, float] = {}
+        self._lock = threading.Lock()
+
+    def _load(self, db: Session, component_ids: List[int]):
+        latest = db.query(
+            Price.component_id,
+            Price.site,
+            func.max(Price.timestamp).label("timestamp")
+        ).filter(Price.component_id.in_(component_ids)).group_by(Price.component_id, Price.site).subquery()
+        rows = db.query(Price.component_id, Price.site, Price.price).join(
+            latest,
+            (Price.component_id == latest.c.component_id)
+            & Price.site.is_not_distinct_from(latest.c.site)
+            & (Price.timestamp == latest.c.timestamp)
+        ).all()
+
+        now = time.monotonic()
+        with self._lock:
+            for component_id in component_ids:
+                self._prices[component_id] = {}
+                self._loaded_at[component_id] = now
+            for component_id, site, price in rows:
+                self._prices[component_id][site] = price
+
+    def diff(self, db: Session, rows: List[dict], sites: Collection[str] = None) -> PriceChanges:
+        """
+        Split crawled rows into history rows for prices that changed and a
+        per-component update: last_checked_at for every component,
+        current_price as the lowest last price across its current sites, and
+        last_price_change_at when any of its prices changed. Current sites
+        are `sites` (every named site when None) and the sites crawled in
+        this batch, so prices left behind by legacy rows without a site or
+        by disabled sites don't hold current_price down. The cache is only
+        updated by commit(), once the batch is stored.
+        """
+        now = time.monotonic()
+        component_ids = list(dict.fromkeys(row["component_id"] for row in rows))
+        with self._lock:
+            stale = [
+                component_id for component_id in component_ids
+                if now - self._loaded_at.get(component_id, -self.max_age - 1) > self.max_age
+            ]
+        if stale:
+            self._load(db, stale)
+
+        changes = PriceChanges()
+        checked_at: Dict[int, datetime] = {}
+        changed_at: Dict[int, datetime] = {}
+        crawled: Dict[int, set] = {}
+        with self._lock:
+            for row in rows:
+                component_id = row["component_id"]
+                crawled.setdefault(component_id, set()).add(row.get("site"))
+                prices = changes._pending.setdefault(component_id, dict(self._prices.get(component_id, {})))
+                previous = prices.get(row.get("site"))
+                checked_at[component_id] = max(checked_at.get(component_id, row["timestamp"]), row["timestamp"])
+                if previous is not None and abs(previous - row["price"]) < PRICE_EPSILON:
+                    changes.unchanged += 1
+                    continue
+                prices[row.get("site")] = row["price"]
+                changes.rows.append(row)
+                changed_at[component_id] = row["timestamp"]
+
+        for component_id, prices in changes._pending.items():
+            current = [
+                price for site, price in prices.items()
+                if site in crawled[component_id] or (site in sites if sites is not None else site is not None)
+            ]
+            update = {
+                "id": component_id,
+                "current_price": min(current),
+                "last_checked_at": checked_at[component_id]
+            }
+            if component_id in changed_at:
+                update["last_price_change_at"] = changed_at[component_id]
+            changes.component_updates.append(update)
+        return changes
+
+    def commit(self, changes: PriceChanges):
+        """Remember a batch's prices after it has been written."""
+        with self._lock:
+            self._prices.update(changes._pending)
+
+    def forget(self, component_ids: List[int] = None):
+        """Drop cached prices so they are reloaded from the database."""
+        with self._lock:
+            if component_ids is None:
+                self._prices.clear()
+                self._loaded_at.clear()
+                return
+            for component_id in component_ids:
+                self._prices.pop(component_id, None)
+                self._loaded_at.pop(component_id, None)
+
+
+_caches: Dict[str, LastPriceCache] = {}
+
+
+def get_last_price_cache(database_url: str) -> LastPriceCache:
+    """Process-wide cache per database, shared by every PriceWriter."""
+    cache = _caches.get(database_url)
+    if cache is None:
+        cache = _caches[database_url] = LastPriceCache()
+    return cache
@@ -0,0 +1,182 @@
+from typing import Dict, Iterable, List, NamedTuple, Optional, Tuple
+from dataclasses import dataclass, field
+import numpy as np
+import logging
+import os
+import re
+import time
+
+logger = logging.getLogger(__name__)
+
+MATCH_THRESHOLD = float(os.getenv("CRAWLER_MATCH_THRESHOLD", "0.2"))
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+# (sorted token ids, L2-normalised TF-IDF weights) of one name
+Vector = Tuple[np.ndarray, np.ndarray]
+
+
+@dataclass
+class MatcherState:
+    """A fit: vocabulary, IDF weights and the indexed name vectors. Replaced whole by each fit."""
+    vocabulary: Dict[str, int] = field(default_factory=dict)
+    idf: np.ndarray = field(default_factory=lambda: np.zeros(0))
+    unknown_idf: float = 1.0
+    vectors: Dict[int, Tuple[str, Vector]] = field(default_factory=dict)
+
+
+class Candidates(NamedTuple):
+    """L2-normalised TF-IDF vectors of `titles` as (row, token id, weight) triples."""
+    titles: List[str]
+    state: MatcherState  # The fit the ids refer to
+    vocabulary_size: int  # Ids from here on are words outside the vocabulary
+    rows: np.ndarray
+    ids: np.ndarray
+    weights: np.ndarray
+
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN.findall((text or "").lower())
+
+
+class TitleMatcher:
+    def __init__(self, threshold: float = MATCH_THRESHOLD, refit_seconds: float = 3600.0):
+        """
+        Scores search result titles against component names by TF-IDF
+        cosine similarity. The vocabulary and IDF weights are fitted on the
+        catalog's component names, whose vectors are kept in an index, so
+        scoring a page of candidates is a handful of array operations on
+        their token ids. Tokens that never occur in the catalog get the
+        highest IDF: words only a candidate has (bracket, cable, ...) weigh
+        it down. Names added after the fit extend the vocabulary; the fit is
+        redone after `refit_seconds`.
+
+        fit() runs in a thread while the event loop scores: it builds a new
+        MatcherState and swaps it in with one assignment, and every method
+        reads `state` once, so none sees half of an old fit and half of a
+        new one. Only the event loop extends a state in place.
+        """
+        self.threshold = threshold
+        self.refit_seconds = refit_seconds
+        self.state = MatcherState()
+        self.fitted_at: Optional[float] = None
+
+    @property
+    def vocabulary(self) -> Dict[str, int]:
+        return self.state.vocabulary
+
+    @property
+    def needs_fit(self) -> bool:
+        return self.fitted_at is None or time.monotonic() - self.fitted_at > self.refit_seconds
+
+    def fit(self, names: Iterable[Tuple[int, str]]):
+        """Fit the vocabulary on (component id, name) pairs and index their vectors."""
+        names = list(names)
+        vocabulary: Dict[str, int] = {}
+        tokens = [[vocabulary.setdefault(token, len(vocabulary)) for token in tokenize(name)] for _, name in names]
+        rows = np.repeat(np.arange(len(names)), [len(ids) for ids in tokens])
+        ids = np.fromiter((token_id for ids in tokens for token_id in ids), dtype=np.int64, count=len(rows))
+
+        rows, ids, counts = _count_pairs(rows, ids, len(vocabulary))
+        # Smoothed IDF, as in scikit-learn
+        df = np.bincount(ids, minlength=len(vocabulary))
+        idf = np.log((1 + len(names)) / (1 + df)) + 1.0
+
+        weights = counts * idf[ids]
+        weights /= np.sqrt(np.bincount(rows, weights * weights, minlength=len(names)))[rows]
+        bounds = np.searchsorted(rows, np.arange(len(names) + 1))
+        vectors = {
+            component_id: (name, (ids[bounds[i]:bounds[i + 1]], weights[bounds[i]:bounds[i + 1]]))
+            for i, (component_id, name) in enumerate(names)
+        }
+        self.state = MatcherState(vocabulary, idf, float(np.log(1 + len(names))) + 1.0, vectors)
+        self.fitted_at = time.monotonic()
+        logger.info(f"Fitted title matcher on {len(names)} names ({len(vocabulary)} tokens)")
+
+    @staticmethod
+    def _token_ids(state: MatcherState, tokens: List[str]) -> np.ndarray:
+        """Vocabulary ids of tokens; tokens outside it get ids past the end of the vocabulary."""
+        size = len(state.vocabulary)
+        unknown: Dict[str, int] = {}
+        ids = []
+        for token in tokens:
+            token_id = state.vocabulary.get(token)
+            if token_id is None:
+                token_id = size + unknown.setdefault(token, len(unknown))
+            ids.append(token_id)
+        return np.array(ids, dtype=np.int64)
+
+    @staticmethod
+    def _idf(state: MatcherState, ids: np.ndarray) -> np.ndarray:
+        weights = np.full(len(ids), state.unknown_idf)
+        known = ids < len(state.idf)
+        weights[known] = state.idf[ids[known]]
+        return weights
+
+    def vector(self, component_id: int, name: str, state: MatcherState = None) -> Vector:
+        """A component name's vector, from the index unless the name changed."""
+        state = state or self.state
+        cached = state.vectors.get(component_id)
+        if cached and cached[0] == name:
+            return cached[1]
+        tokens = tokenize(name)
+        new_tokens = [token for token in dict.fromkeys(tokens) if token not in state.vocabulary]
+        if new_tokens:
+            # Names from after the fit add their new words as if seen in one name
+            for token in new_tokens:
+                state.vocabulary[token] = len(state.vocabulary)
+            state.idf = np.append(state.idf, np.full(len(new_tokens), state.unknown_idf - np.log(2)))
+        ids, counts = np.unique(self._token_ids(state, tokens), return_counts=True)
+        weights = counts * self._idf(state, ids)
+        norm = np.linalg.norm(weights)
+        vector = (ids, weights / norm if norm else weights)
+        state.vectors[component_id] = (name, vector)
+        return vector
+
+    def candidates(self, titles: List[str], state: MatcherState = None) -> Candidates:
+        """Vectors of a page's result titles, built once and scored against any number of components."""
+        state = state or self.state
+        tokens = [self._token_ids(state, tokenize(title)) for title in titles]
+        rows = np.repeat(np.arange(len(titles)), [len(ids) for ids in tokens])
+        ids = np.concatenate(tokens) if tokens else np.zeros(0, dtype=np.int64)
+        rows, ids, counts = _count_pairs(rows, ids, int(ids.max()) + 1 if len(ids) else 1)
+        weights = counts * self._idf(state, ids)
+        norms = np.sqrt(np.bincount(rows, weights * weights, minlength=len(titles)))
+        with np.errstate(divide='ignore', invalid='ignore'):
+            weights = np.where(norms[rows] > 0, weights / norms[rows], 0.0)
+        return Candidates(titles, state, len(state.vocabulary), rows, ids, weights)
+
+    def score(self, component_id: int, name: str, candidates: Candidates) -> np.ndarray:
+        """Cosine similarity of each candidate title to the component's name."""
+        state = self.state
+        query_ids, query_weights = self.vector(component_id, name, state)
+        if candidates.state is not state or candidates.vocabulary_size != len(state.vocabulary):
+            # Built before a refit, or the name added words, which may be among the titles' unknown words
+            candidates = self.candidates(candidates.titles, state)
+        size = len(candidates.titles)
+        if not len(query_ids) or not len(candidates.ids):
+            return np.zeros(size)
+
+        positions = np.minimum(np.searchsorted(query_ids, candidates.ids), len(query_ids) - 1)
+        products = np.where(query_ids[positions] == candidates.ids, candidates.weights * query_weights[positions], 0.0)
+        return np.bincount(candidates.rows, products, minlength=size)
+
+    def best(self, component_id: int, name: str, results: List[dict], candidates: Candidates = None) -> Optional[dict]:
+        """
+        The result whose title scores highest (the first on ties) if it
+        reaches the threshold, with its score as `match_score`, else None.
+        """
+        if not results:
+            return None
+        candidates = candidates or self.candidates([result['title'] for result in results])
+        scores = self.score(component_id, name, candidates)
+        index = int(np.argmax(scores))
+        if scores[index] < self.threshold:
+            return None
+        return {**results[index], 'match_score': round(float(scores[index]), 4)}
+
+
+def _count_pairs(rows: np.ndarray, ids: np.ndarray, size: int) -> Tuple[np.ndarray, np.ndarray, np.ndarray]:
+    """Distinct (row, id) pairs sorted by row then id, with how often each occurs."""
+    keys, counts = np.unique(rows * size + ids, return_counts=True)
+    return keys // size, keys % size, counts
@@ -0,0 +1,167 @@
+from typing import Dict, List, Sequence, Tuple
+from bisect import bisect_left
+from types import SimpleNamespace
+import aiohttp
+import threading
+import time
+
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+BYTES_BUCKETS = (1024, 8192, 32768, 131072, 262144, 524288, 1048576, 2097152, 4194304)
+COUNT_BUCKETS = (0, 1, 2, 3, 5, 10, 20, 50)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(names: Sequence[str], values: Sequence[str], extra: str = "") -> str:
+    pairs = [f'{name}="{_escape(value)}"' for name, value in zip(names, values)]
+    if extra:
+        pairs.append(extra)
+    return "{" + ",".join(pairs) + "}" if pairs else ""
+
+
+class Counter:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = ()):
+        """Monotonic counter, one series per label combination."""
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} counter"]
+        with self._lock:
+            for key, value in sorted(self._values.items()):
+                lines.append(f"{self.name}{_format_labels(self.labelnames, key)} {value!r}")
+        return lines
+
+
+class Histogram:
+    def __init__(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS):
+        """
+        Fixed-bucket histogram. observe() is a bisect and three additions
+        under a lock, cheap enough to call on every request.
+        """
+        self.name = name
+        self.documentation = documentation
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(sorted(buckets))
+        self._series: Dict[Tuple[str, ...], list] = {}  # key -> [bucket counts, sum, count]
+        self._lock = threading.Lock()
+
+    def observe(self, value: float, **labels):
+        key = tuple(str(labels.get(name, "")) for name in self.labelnames)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            series = self._series.get(key)
+            if series is None:
+                series = self._series[key] = [[0] * (len(self.buckets) + 1), 0.0, 0]
+            series[0][index] += 1
+            series[1] += value
+            series[2] += 1
+
+    def render(self) -> List[str]:
+        lines = [f"# HELP {self.name} {self.documentation}", f"# TYPE {self.name} histogram"]
+        with self._lock:
+            for key, (counts, total, count) in sorted(self._series.items()):
+                cumulative = 0
+                for bound, bucket_count in zip(self.buckets, counts):
+                    cumulative += bucket_count
+                    labels = _format_labels(self.labelnames, key, f'le="{bound:g}"')
+                    lines.append(f"{self.name}_bucket{labels} {cumulative}")
+                labels = _format_labels(self.labelnames, key, 'le="+Inf"')
+                lines.append(f"{self.name}_bucket{labels} {count}")
+                lines.append(f"{self.name}_sum{_format_labels(self.labelnames, key)} {total!r}")
+                lines.append(f"{self.name}_count{_format_labels(self.labelnames, key)} {count}")
+        return lines
+
+
+class MetricsRegistry:
+    def __init__(self):
+        self.metrics = []
+
+    def counter(self, name: str, documentation: str, labelnames: Sequence[str] = ()) -> Counter:
+        metric = Counter(name, documentation, labelnames)
+        self.metrics.append(metric)
+        return metric
+
+    def histogram(self, name: str, documentation: str, labelnames: Sequence[str] = (), buckets: Sequence[float] = LATENCY_BUCKETS) -> Histogram:
+        metric = Histogram(name, documentation, labelnames, buckets)
+        self.metrics.append(metric)
+        return metric
+
+    def render(self) -> str:
+        """All metrics in the Prometheus text exposition format."""
+        lines = []
+        for metric in self.metrics:
+            lines.extend(metric.render())
+        return "\n".join(lines) + "\n"
+
+
+registry = MetricsRegistry()
+
+DNS_SECONDS = registry.histogram("crawler_dns_seconds", "DNS resolution time", ["site"])
+CONNECT_SECONDS = registry.histogram("crawler_connect_seconds", "Time to open a new connection", ["site"])
+TTFB_SECONDS = registry.histogram("crawler_ttfb_seconds", "Time from sending a request to its response headers", ["site"])
+REQUEST_SECONDS = registry.histogram("crawler_request_seconds", "Total request time including the body", ["site", "kind"])
+RESPONSE_BYTES = registry.histogram("crawler_response_bytes", "Response body size", ["site", "kind"], BYTES_BUCKETS)
+PARSE_SECONDS = registry.histogram("crawler_parse_seconds", "HTML extraction time inside the parse workers", ["site"])
+PARSE_WAIT_SECONDS = registry.histogram("crawler_parse_wait_seconds", "Parse time including pool queueing", ["site"])
+PRODUCTS_FOUND = registry.histogram("crawler_products_found", "Product cards extracted per page", ["site"], COUNT_BUCKETS)
+MATCHES = registry.counter("crawler_matches_total", "Extracted products accepted or rejected as prices, and components left without a matching result", ["site", "outcome"])
+RESPONSES = registry.counter("crawler_responses_total", "HTTP responses by status", ["site", "status"])
+DB_WRITE_SECONDS = registry.histogram("crawler_db_write_seconds", "Time to write one batch of prices")
+DB_ROWS_WRITTEN = registry.counter("crawler_db_rows_written_total", "Price rows written")
+
+
+def _site(context) -> str:
+    ctx = context.trace_request_ctx
+    return ctx.get("site", "unknown") if isinstance(ctx, dict) else "unknown"
+
+
+async def _on_request_start(session, context, params):
+    context.started = time.perf_counter()
+
+
+async def _on_dns_start(session, context, params):
+    context.dns_started = time.perf_counter()
+
+
+async def _on_dns_end(session, context, params):
+    DNS_SECONDS.observe(time.perf_counter() - context.dns_started, site=_site(context))
+
+
+async def _on_connection_start(session, context, params):
+    context.connect_started = time.perf_counter()
+
+
+async def _on_connection_end(session, context, params):
+    CONNECT_SECONDS.observe(time.perf_counter() - context.connect_started, site=_site(context))
+
+
+async def _on_request_end(session, context, params):
+    site = _site(context)
+    TTFB_SECONDS.observe(time.perf_counter() - context.started, site=site)
+    RESPONSES.inc(site=site, status=params.response.status)
+
+
+def trace_config() -> aiohttp.TraceConfig:
+    """
+    aiohttp tracing hooks for DNS, connect and time-to-first-byte. Pass the
+    site name per request with trace_request_ctx={"site": name}.
+    """
+    config = aiohttp.TraceConfig(trace_config_ctx_factory=SimpleNamespace)
+    config.on_request_start.append(_on_request_start)
+    config.on_dns_resolvehost_start.append(_on_dns_start)
+    config.on_dns_resolvehost_end.append(_on_dns_end)
+    config.on_connection_create_start.append(_on_connection_start)
+    config.on_connection_create_end.append(_on_connection_end)
+    config.on_request_end.append(_on_request_end)
+    return config
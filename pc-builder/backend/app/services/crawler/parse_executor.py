@@ -0,0 +1,114 @@
+from typing import Any, Callable, List, Optional
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from .extraction import DetailTuple, ProductTuple, extract_product_page, extract_products
+from . import metrics
+import asyncio
+import logging
+import os
+import time
+
+logger = logging.getLogger(__name__)
+
+PARSE_MODES = ("inline", "thread", "process")
+PARSE_MODE = os.getenv("CRAWLER_PARSE_MODE", "process")
+
+
+def _run_timed(func: Callable, *args):
+    started = time.perf_counter()
+    result = func(*args)
+    return result, time.perf_counter() - started
+
+
+def available_cores() -> int:
+    try:
+        return len(os.sched_getaffinity(0))
+    except AttributeError:
+        return os.cpu_count() or 1
+
+
+class ParseExecutor:
+    def __init__(self, mode: str = PARSE_MODE, max_workers: Optional[int] = None):
+        """
+        Runs HTML extraction off the event loop. `mode` is one of:
+        - inline: parse on the event loop (debugging, tiny workloads)
+        - thread: parse in a thread pool
+        - process: parse in a process pool sized to the available cores
+        Workers receive raw page bytes plus the site config and return
+        product tuples, so the event loop only does network I/O.
+        """
+        if mode not in PARSE_MODES:
+            raise ValueError(f"Unknown parse mode '{mode}', expected one of {', '.join(PARSE_MODES)}")
+        self.mode = mode
+        self.max_workers = max_workers or available_cores()
+        self._pool: Optional[Executor] = None
+        self.pages = 0
+        self.parse_seconds = 0.0  # Time spent parsing inside the workers
+        self.wait_seconds = 0.0  # Wall time including queueing and pool hand-off
+
+    def _executor(self) -> Executor:
+        if self._pool is None:
+            if self.mode == "process":
+                self._pool = ProcessPoolExecutor(max_workers=self.max_workers)
+            else:
+                self._pool = ThreadPoolExecutor(max_workers=self.max_workers, thread_name_prefix="crawler-parse")
+            logger.info(f"Started {self.mode} parse pool with {self.max_workers} workers")
+        return self._pool
+
+    async def _run(self, site: str, func: Callable, *args) -> Any:
+        started = time.perf_counter()
+        if self.mode == "inline":
+            result, parse_seconds = _run_timed(func, *args)
+        else:
+            loop = asyncio.get_running_loop()
+            result, parse_seconds = await loop.run_in_executor(self._executor(), _run_timed, func, *args)
+        wait_seconds = time.perf_counter() - started
+        self.pages += 1
+        self.parse_seconds += parse_seconds
+        self.wait_seconds += wait_seconds
+        metrics.PARSE_SECONDS.observe(parse_seconds, site=site)
+        metrics.PARSE_WAIT_SECONDS.observe(wait_seconds, site=site)
+        return result
+
+    async def extract(
+        self,
+        body: bytes,
+        site_info: dict,
+        limit: int = 3,
+        encoding: Optional[str] = None,
+        site: str = "unknown"
+    ) -> List[ProductTuple]:
+        """Extract product tuples from a search page using the configured mode."""
+        return await self._run(site, extract_products, body, site_info, limit, encoding)
+
+    async def extract_product_page(
+        self,
+        body: bytes,
+        site_info: dict,
+        encoding: Optional[str] = None,
+        site: str = "unknown"
+    ) -> DetailTuple:
+        """Extract title and price text from a product detail page."""
+        return await self._run(site, extract_product_page, body, site_info, encoding)
+
+    def shutdown(self):
+        if self._pool is not None:
+            self._pool.shutdown(wait=False, cancel_futures=True)
+            self._pool = None
+
+
+_default_executor: Optional[ParseExecutor] = None
+
+
+def get_parse_executor() -> ParseExecutor:
+    """Process-wide executor shared by every CrawlerService."""
+    global _default_executor
+    if _default_executor is None:
+        _default_executor = ParseExecutor()
+    return _default_executor
+
+
+def shutdown_parse_executor():
+    global _default_executor
+    if _default_executor is not None:
+        _default_executor.shutdown()
+        _default_executor = None
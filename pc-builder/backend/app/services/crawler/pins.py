@@ -0,0 +1,128 @@
+from typing import Callable, Dict, List, Optional, Tuple
+from datetime import datetime
+from sqlalchemy.orm import Session
+from ...models.models import Component, ProductPin
+from .sites import SiteAdapter
+import logging
+import os
+import re
+
+logger = logging.getLogger(__name__)
+
+# Below this title similarity a pinned page no longer shows the matched product
+PIN_TITLE_SIMILARITY = float(os.getenv("CRAWLER_PIN_TITLE_SIMILARITY", "0.6"))
+
+TOKEN = re.compile(r'[a-z0-9]+')
+
+
+def title_similarity(a: Optional[str], b: Optional[str]) -> float:
+    """Jaccard similarity of the word sets of two product titles."""
+    tokens_a = set(TOKEN.findall((a or "").lower()))
+    tokens_b = set(TOKEN.findall((b or "").lower()))
+    if not tokens_a or not tokens_b:
+        return 0.0
+    return len(tokens_a & tokens_b) / len(tokens_a | tokens_b)
+
+
+class PinBook:
+    def __init__(self, session_factory: Callable[[], Session], adapters: Dict[str, SiteAdapter]):
+        """
+        Product pages matched per (component, site) for one crawl. Pins are
+        loaded for the crawl's components up front, changed in memory while
+        it runs and written back by save() in one transaction at the end.
+        """
+        self.session_factory = session_factory
+        self.adapters = adapters
+        self._pins: Dict[Tuple[int, str], dict] = {}
+        self._changed: Dict[Tuple[int, str], Optional[dict]] = {}  # None = unpinned
+
+    def load(self, db: Session, components: List[Component]):
+        """
+        Read the stored pins of `components`. A component without a pin for
+        a site whose catalog URL already points at one of that site's
+        product pages starts out pinned to it.
+        """
+        component_ids = [component.id for component in components]
+        for pin in db.query(ProductPin).filter(ProductPin.component_id.in_(component_ids)):
+            if pin.site in self.adapters:
+                self._pins[(pin.component_id, pin.site)] = {
+                    "url": pin.url,
+                    "product_id": pin.product_id,
+                    "title": pin.title
+                }
+
+        for component in components:
+            for site_name, adapter in self.adapters.items():
+                key = (component.id, site_name)
+                if key in self._pins or not adapter.supports_product_pages or not adapter.owns_url(component.url):
+                    continue
+                product_id = adapter.product_id(component.url)
+                if product_id:
+                    self._pins[key] = {"url": adapter.pinned_url(component.url), "product_id": product_id, "title": None}
+
+    def get(self, component_id: int, site: str) -> Optional[dict]:
+        return self._pins.get((component_id, site))
+
+    def pin(self, component_id: int, site: str, url: str, title: Optional[str]):
+        """Pin a component to the product page it was matched to on a search page."""
+        adapter = self.adapters[site]
+        pin = {"url": adapter.pinned_url(url), "product_id": adapter.product_id(url), "title": title}
+        key = (component_id, site)
+        current = self._pins.get(key)
+        if current and current["url"] == pin["url"] and current["title"] == title:
+            self.verified(component_id, site)
+            return
+        self._pins[key] = pin
+        self._changed[key] = {**pin, "verified_at": datetime.utcnow(), "repinned": True}
+
+    def verified(self, component_id: int, site: str, title: Optional[str] = None):
+        """A product page read as expected; fills in the title of pins seeded without one."""
+        key = (component_id, site)
+        pin = self._pins[key]
+        if title and not pin["title"]:
+            pin["title"] = title
+        self._changed[key] = {**pin, "verified_at": datetime.utcnow(), "repinned": False}
+
+    def unpin(self, component_id: int, site: str):
+        key = (component_id, site)
+        if self._pins.pop(key, None) is not None:
+            self._changed[key] = None
+
+    def drifted(self, component_id: int, site: str, title: Optional[str]) -> bool:
+        """Whether a pinned page's title no longer matches the title it was pinned with."""
+        pinned_title = self._pins[(component_id, site)]["title"]
+        return bool(pinned_title) and title_similarity(pinned_title, title) < PIN_TITLE_SIMILARITY
+
+    def save(self):
+        """Write the crawl's pin changes. Runs in a thread, with its own session."""
+        if not self._changed:
+            return
+        changed, self._changed = self._changed, {}
+        db = self.session_factory()
+        try:
+            component_ids = {component_id for component_id, _ in changed}
+            rows = {
+                (pin.component_id, pin.site): pin
+                for pin in db.query(ProductPin).filter(ProductPin.component_id.in_(component_ids))
+            }
+            for (component_id, site), values in changed.items():
+                row = rows.get((component_id, site))
+                if values is None:
+                    if row is not None:
+                        db.delete(row)
+                    continue
+                if row is None:
+                    row = ProductPin(component_id=component_id, site=site)
+                    db.add(row)
+                if values["repinned"] or row.url != values["url"]:
+                    row.pinned_at = values["verified_at"]
+                row.url = values["url"]
+                row.product_id = values["product_id"]
+                row.title = values["title"]
+                row.last_verified_at = values["verified_at"]
+            db.commit()
+        except Exception as e:
+            db.rollback()
+            logger.error(f"Error saving product pins: {str(e)}")
+        finally:
+            db.close()
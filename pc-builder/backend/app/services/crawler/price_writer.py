@@ -0,0 +1,148 @@
+from typing import Callable, Collection, Dict, List, Optional
+from dataclasses import dataclass
+from datetime import datetime
+from sqlalchemy.orm import Session
+from ..price_history import PriceHistoryService
+from ..services import PriceService
+from .last_prices import LastPriceCache, get_last_price_cache
+from . import metrics
+import asyncio
+import logging
+import time
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class WriterStats:
+    rows_written: int = 0
+    rows_unchanged: int = 0
+    batches: int = 0
+    write_seconds: float = 0.0
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows_written / self.write_seconds if self.write_seconds else 0.0
+
+    def as_dict(self) -> dict:
+        return {
+            "rows_written": self.rows_written,
+            "rows_unchanged": self.rows_unchanged,
+            "batches": self.batches,
+            "write_seconds": round(self.write_seconds, 4),
+            "rows_per_second": round(self.rows_per_second, 1)
+        }
+
+
+class PriceWriter:
+    def __init__(
+        self,
+        session_factory: Callable[[], Session],
+        batch_size: int = 200,
+        flush_interval: float = 5.0,
+        last_prices: LastPriceCache = None,
+        sites: Collection[str] = None
+    ):
+        """
+        Buffers crawled prices and writes them in batches: one executemany
+        insert plus one component update and one commit per batch. Only
+        prices that differ from the last known price of their component and
+        site become history rows; every crawled component gets its
+        last_checked_at heartbeat and current_price in the same update, and
+        the hourly and daily price rollups are updated in the same commit.
+        current_price only counts the enabled `sites` and the sites just
+        crawled.
+        A batch is flushed when it reaches `batch_size` rows or when
+        `flush_interval` seconds have passed, whichever comes first.
+        Database work runs in a thread so the event loop keeps crawling.
+        """
+        self.session_factory = session_factory
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.last_prices = last_prices
+        self.sites = sites
+        self.price_service = PriceService()
+        self.price_history = PriceHistoryService()
+        self.stats = WriterStats()
+        self._buffer: List[Dict] = []
+        self._flush_lock = asyncio.Lock()
+        self._timer: Optional[asyncio.Task] = None
+
+    async def __aenter__(self):
+        self._timer = asyncio.create_task(self._flush_periodically())
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb):
+        await self.close()
+
+    async def add(
+        self,
+        component_id: int,
+        price: float,
+        timestamp: datetime = None,
+        site: str = None,
+        url: str = None
+    ) -> datetime:
+        """Queue one price; returns the timestamp it will be stored with."""
+        timestamp = timestamp or datetime.utcnow()
+        self._buffer.append({
+            "component_id": component_id,
+            "price": price,
+            "timestamp": timestamp,
+            "site": site,
+            "url": url
+        })
+        if len(self._buffer) >= self.batch_size:
+            await self.flush()
+        return timestamp
+
+    async def flush(self):
+        """Write everything buffered so far as one batch."""
+        async with self._flush_lock:
+            if not self._buffer:
+                return
+            rows, self._buffer = self._buffer, []
+            started = time.perf_counter()
+            written = await asyncio.to_thread(self._write, rows)
+            elapsed = time.perf_counter() - started
+            self.stats.write_seconds += elapsed
+            metrics.DB_WRITE_SECONDS.observe(elapsed)
+            metrics.DB_ROWS_WRITTEN.inc(written)
+            self.stats.rows_written += written
+            self.stats.rows_unchanged += len(rows) - written
+            self.stats.batches += 1
+
+    def _write(self, rows: List[Dict]) -> int:
+        db = self.session_factory()
+        try:
+            last_prices = self.last_prices or get_last_price_cache(str(db.get_bind().url))
+            changes = last_prices.diff(db, rows, self.sites)
+            self.price_service.record_prices_bulk(db, changes.rows, changes.component_updates)
+            self.price_history.rollup(db, changes.rows)
+            db.commit()
+            last_prices.commit(changes)
+            return len(changes.rows)
+        except Exception:
+            db.rollback()
+            raise
+        finally:
+            db.close()
+
+    async def _flush_periodically(self):
+        while True:
+            await asyncio.sleep(self.flush_interval)
+            try:
+                await self.flush()
+            except Exception as e:
+                logger.error(f"Periodic price flush failed: {str(e)}")
+
+    async def close(self):
+        """Stop the flush timer and write whatever is left."""
+        if self._timer:
+            self._timer.cancel()
+            self._timer = None
+        await self.flush()
+        logger.info(
+            f"Price writer: {self.stats.rows_written} rows in {self.stats.batches} batches "
+            f"({self.stats.rows_per_second:.0f} rows/sec)"
+        )
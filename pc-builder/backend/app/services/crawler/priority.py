@@ -0,0 +1,249 @@
+from typing import Dict, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from sqlalchemy import func
+from sqlalchemy.orm import Session
+from ...models.models import Component, Price, Analytics
+import heapq
+import logging
+import math
+import os
+
+logger = logging.getLogger(__name__)
+
+REQUESTS_PER_HOUR = int(os.getenv("CRAWLER_REQUESTS_PER_HOUR", "1800"))
+
+
+@dataclass
+class CrawlPriority:
+    component_id: int
+    volatility: float
+    popularity: int
+    score: float
+    interval: timedelta
+    next_crawl_at: datetime
+
+    def as_dict(self) -> dict:
+        return {
+            "component_id": self.component_id,
+            "volatility": round(self.volatility, 4),
+            "popularity": self.popularity,
+            "score": round(self.score, 4),
+            "interval_minutes": round(self.interval.total_seconds() / 60, 1),
+            "next_crawl_at": self.next_crawl_at
+        }
+
+
+@dataclass
+class PlanInputs:
+    component_ids: List[int]
+    volatility: Dict[int, float]
+    popularity: Dict[int, int]
+    last_checked: Dict[int, datetime] = field(default_factory=dict)
+
+
+class RecrawlPlanner:
+    def __init__(
+        self,
+        requests_per_hour: int = REQUESTS_PER_HOUR,
+        sites_per_component: int = 1,
+        min_interval: timedelta = timedelta(minutes=15),
+        max_interval: timedelta = timedelta(hours=24),
+        history_window: timedelta = timedelta(days=7),
+        volatility_weight: float = 0.6,
+        sweep_interval: Optional[timedelta] = None
+    ):
+        """
+        Gives every component its own recrawl interval and keeps them in a
+        priority queue ordered by next crawl time.
+
+        Each component gets a score in [0, 1] that mixes its recent price
+        volatility (coefficient of variation over `history_window`) and its
+        popularity (total analytics view_count). Intervals are interpolated
+        on a log scale between `max_interval` (score 0) and `min_interval`
+        (score 1). All intervals are then stretched evenly if the plan would
+        need more than `requests_per_hour` requests.
+
+        With a `sweep_interval`, part of the budget is reserved for a
+        full-catalog sweep every `sweep_interval`: enough to crawl every
+        component once per interval, but at most half the budget. The plan
+        gets what is left, and the sweep is paced to its share.
+        """
+        self.requests_per_hour = requests_per_hour
+        self.sites_per_component = sites_per_component
+        self.min_interval = min_interval
+        self.max_interval = max_interval
+        self.history_window = history_window
+        self.volatility_weight = volatility_weight
+        self.sweep_interval = sweep_interval
+        self.sweep_requests_per_hour = 0.0
+        self.sweep_duration: Optional[timedelta] = sweep_interval
+        self.priorities: Dict[int, CrawlPriority] = {}
+        self._heap: List[tuple] = []
+        self._in_flight = set()
+
+    def _load_volatility(self, db: Session, since: datetime) -> Dict[int, float]:
+        rows = db.query(
+            Price.component_id,
+            func.avg(Price.price),
+            func.avg(Price.price * Price.price),
+            func.count(Price.id)
+        ).filter(
+            Price.timestamp >= since
+        ).group_by(Price.component_id).all()
+
+        volatility = {}
+        for component_id, mean, mean_sq, count in rows:
+            if not mean or count < 2:
+                continue
+            variance = max(mean_sq - mean * mean, 0.0)
+            volatility[component_id] = math.sqrt(variance) / mean
+        return volatility
+
+    def _load_popularity(self, db: Session) -> Dict[int, int]:
+        rows = db.query(
+            Analytics.component_id,
+            func.coalesce(func.sum(Analytics.view_count), 0)
+        ).filter(
+            Analytics.component_id.isnot(None)
+        ).group_by(Analytics.component_id).all()
+        return {component_id: int(views) for component_id, views in rows}
+
+    def _interval_for(self, score: float) -> timedelta:
+        low = self.min_interval.total_seconds()
+        high = self.max_interval.total_seconds()
+        return timedelta(seconds=high * (low / high) ** score)
+
+    def refresh(self, db: Session, now: datetime = None) -> int:
+        """
+        Recompute every component's interval from the database. Components
+        keep their last crawl time, so a refresh only moves their next
+        crawl time, it never resets it; a component the planner hasn't
+        seen yet starts from its last_checked_at.
+        """
+        now = now or datetime.utcnow()
+        return self.apply(self.load_inputs(db, now), now)
+
+    def load_inputs(self, db: Session, now: datetime = None) -> PlanInputs:
+        """
+        The database side of a refresh: the aggregations over prices and
+        analytics, and when each component was last crawled. Touches no
+        planner state, so it can run in a thread.
+        """
+        now = now or datetime.utcnow()
+        rows = db.query(Component.id, Component.last_checked_at).all()
+        return PlanInputs(
+            component_ids=[component_id for component_id, _ in rows],
+            volatility=self._load_volatility(db, now - self.history_window),
+            popularity=self._load_popularity(db),
+            last_checked={
+                component_id: checked_at.replace(tzinfo=None)
+                for component_id, checked_at in rows if checked_at is not None
+            }
+        )
+
+    def apply(self, inputs: PlanInputs, now: datetime = None) -> int:
+        """Rebuild the queue from loaded inputs; must run where pop_due and mark_crawled do."""
+        now = now or datetime.utcnow()
+        component_ids, volatility, popularity = inputs.component_ids, inputs.volatility, inputs.popularity
+
+        max_volatility = max(volatility.values(), default=0.0) or 1.0
+        max_log_views = math.log1p(max(popularity.values(), default=0)) or 1.0
+
+        scores = {}
+        for component_id in component_ids:
+            v = volatility.get(component_id, 0.0) / max_volatility
+            p = math.log1p(popularity.get(component_id, 0)) / max_log_views
+            scores[component_id] = self.volatility_weight * v + (1 - self.volatility_weight) * p
+
+        intervals = {cid: self._interval_for(score) for cid, score in scores.items()}
+
+        # Reserve the full sweep's share of the budget, then stretch intervals evenly if the plan exceeds the rest
+        self._reserve_sweep(len(component_ids))
+        budget = self.requests_per_hour - self.sweep_requests_per_hour
+        planned = sum(self.sites_per_component * 3600 / i.total_seconds() for i in intervals.values())
+        stretch = max(1.0, planned / budget) if budget else 1.0
+        if stretch > 1.0:
+            logger.info(f"Recrawl plan needs {planned:.0f} req/h, stretching intervals by {stretch:.2f}x")
+
+        priorities = {}
+        for component_id, interval in intervals.items():
+            interval = interval * stretch
+            previous = self.priorities.get(component_id)
+            if previous is not None:
+                last_crawl = previous.next_crawl_at - previous.interval
+                next_crawl_at = last_crawl + interval
+            elif component_id in inputs.last_checked:
+                # New to this planner, e.g. after a restart: due one interval after its last crawl
+                next_crawl_at = inputs.last_checked[component_id] + interval
+            else:
+                next_crawl_at = now
+            priorities[component_id] = CrawlPriority(
+                component_id=component_id,
+                volatility=volatility.get(component_id, 0.0),
+                popularity=popularity.get(component_id, 0),
+                score=scores[component_id],
+                interval=interval,
+                next_crawl_at=next_crawl_at
+            )
+
+        self.priorities = priorities
+        self._heap = [
+            (p.next_crawl_at, -p.score, p.component_id)
+            for p in priorities.values()
+            if p.component_id not in self._in_flight
+        ]
+        heapq.heapify(self._heap)
+        return len(priorities)
+
+    def _reserve_sweep(self, components: int):
+        if not self.sweep_interval or not self.requests_per_hour or not components:
+            self.sweep_requests_per_hour = 0.0
+            self.sweep_duration = self.sweep_interval
+            return
+        requests = components * max(self.sites_per_component, 1)
+        needed = requests * 3600 / self.sweep_interval.total_seconds()
+        self.sweep_requests_per_hour = min(needed, self.requests_per_hour / 2)
+        self.sweep_duration = timedelta(hours=requests / self.sweep_requests_per_hour)
+        if needed > self.sweep_requests_per_hour:
+            logger.info(f"Full sweep needs {needed:.0f} req/h, capped at {self.sweep_requests_per_hour:.0f}: "
+                        f"a sweep takes {self.sweep_duration.total_seconds() / 3600:.1f}h")
+
+    def pop_due(self, now: datetime = None, limit: Optional[int] = None) -> List[int]:
+        """
+        Take the ids of components whose next crawl time has passed, most
+        overdue first and higher scores first among equally due ones.
+        """
+        now = now or datetime.utcnow()
+        due = []
+        while self._heap and self._heap[0][0] <= now and (limit is None or len(due) < limit):
+            next_crawl_at, _, component_id = heapq.heappop(self._heap)
+            priority = self.priorities.get(component_id)
+            # Skip heap entries made stale by a later reschedule
+            if priority is None or priority.next_crawl_at != next_crawl_at or component_id in self._in_flight:
+                continue
+            self._in_flight.add(component_id)
+            due.append(component_id)
+        return due
+
+    def mark_crawled(self, component_id: int, now: datetime = None):
+        """Push a crawled component back into the queue one interval later."""
+        self._in_flight.discard(component_id)
+        priority = self.priorities.get(component_id)
+        if priority is None:
+            return
+        priority.next_crawl_at = (now or datetime.utcnow()) + priority.interval
+        heapq.heappush(self._heap, (priority.next_crawl_at, -priority.score, component_id))
+
+    def snapshot(self, limit: int = 100) -> List[dict]:
+        """Queued components ordered by next crawl time."""
+        ordered = sorted(self.priorities.values(), key=lambda p: p.next_crawl_at)
+        return [
+            {**p.as_dict(), "in_flight": p.component_id in self._in_flight}
+            for p in ordered[:limit]
+        ]
+
+    def dispatch_limit(self, tick: timedelta) -> int:
+        """How many components one dispatch tick may crawl within the budget left by the sweep."""
+        per_tick = (self.requests_per_hour - self.sweep_requests_per_hour) * tick.total_seconds() / 3600 / max(self.sites_per_component, 1)
+        return max(1, int(per_tick))
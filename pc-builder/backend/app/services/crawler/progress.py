@@ -0,0 +1,182 @@
+from typing import AsyncIterator, List, Optional
+from collections import OrderedDict
+from datetime import datetime
+from ...database.config import SessionLocal
+from ...models.models import Component
+from .engine import summarize_outcomes
+import asyncio
+import json
+import logging
+import uuid
+
+logger = logging.getLogger(__name__)
+
+
+class CrawlProgress:
+    def __init__(self, job_id: str, component_id: Optional[int], total: int):
+        """
+        Live state of one on-demand crawl. Only the counters are kept;
+        per-component results are pushed to the current subscribers and
+        then dropped, so a full-catalog crawl does not pile up in memory.
+        """
+        self.job_id = job_id
+        self.component_id = component_id
+        self.total = total
+        self.completed = 0
+        self.failed = 0
+        self.status = "pending"
+        self.error: Optional[str] = None
+        self.started_at = datetime.utcnow()
+        self.finished_at: Optional[datetime] = None
+        self.task: Optional[asyncio.Task] = None
+        self._subscribers: List[asyncio.Queue] = []
+
+    @property
+    def remaining(self) -> int:
+        return max(self.total - self.completed - self.failed, 0)
+
+    @property
+    def finished(self) -> bool:
+        return self.status in ("completed", "failed")
+
+    def as_dict(self) -> dict:
+        return {
+            "job_id": self.job_id,
+            "component_id": self.component_id,
+            "status": self.status,
+            "total": self.total,
+            "completed": self.completed,
+            "failed": self.failed,
+            "remaining": self.remaining,
+            "started_at": self.started_at,
+            "finished_at": self.finished_at,
+            "error": self.error
+        }
+
+    def _publish(self, event: str, data: dict):
+        for queue in self._subscribers:
+            try:
+                queue.put_nowait((event, data))
+            except asyncio.QueueFull:
+                if event != "done":
+                    # A slow client misses per-component events; counts in later events stay right
+                    continue
+                # The terminal event always gets through: drop the oldest pending event for it
+                queue.get_nowait()
+                queue.put_nowait((event, data))
+
+    def record(self, component_ids: List[int], results: List[dict]):
+        """Count the outcome of a group of finished components and notify subscribers."""
+        for component_id, error in summarize_outcomes(component_ids, results).items():
+            prices = [r for r in results if r.get("component_id") == component_id and "price" in r]
+            best = min(prices, key=lambda r: r["price"]) if prices else None
+            if error is None:
+                self.completed += 1
+            else:
+                self.failed += 1
+            self._publish("component", {
+                "component_id": component_id,
+                "status": "failed" if error else "completed",
+                "price": best["price"] if best else None,
+                "site": best["site"] if best else None,
+                "error": error,
+                "completed": self.completed,
+                "failed": self.failed,
+                "remaining": self.remaining
+            })
+
+    def finish(self, status: str, error: str = None):
+        self.status = status
+        self.error = error
+        self.finished_at = datetime.utcnow()
+        self._publish("done", self.as_dict())
+
+    async def events(self, heartbeat: float = 15.0, max_pending: int = 1000) -> AsyncIterator[str]:
+        """
+        Server-Sent Events for this crawl: a "progress" snapshot, one
+        "component" event per finished component, then "done".
+        """
+        queue: asyncio.Queue = asyncio.Queue(maxsize=max_pending)
+        self._subscribers.append(queue)
+        try:
+            yield format_sse("progress", self.as_dict())
+            if self.finished and queue.empty():
+                yield format_sse("done", self.as_dict())
+                return
+            while True:
+                try:
+                    event, data = await asyncio.wait_for(queue.get(), timeout=heartbeat)
+                except asyncio.TimeoutError:
+                    if self.finished:
+                        yield format_sse("done", self.as_dict())
+                        return
+                    yield ": keep-alive\n\n"
+                    continue
+                yield format_sse(event, data)
+                if event == "done":
+                    return
+        finally:
+            self._subscribers.remove(queue)
+
+
+def _json_default(value):
+    return value.isoformat() if isinstance(value, datetime) else str(value)
+
+
+def format_sse(event: str, data: dict) -> str:
+    return f"event: {event}\ndata: {json.dumps(data, default=_json_default)}\n\n"
+
+
+class CrawlProgressTracker:
+    def __init__(self, max_finished: int = 100):
+        """
+        In-process registry of on-demand crawl jobs. Finished jobs are kept
+        for late subscribers until `max_finished` newer ones replace them.
+        """
+        self.max_finished = max_finished
+        self.jobs: "OrderedDict[str, CrawlProgress]" = OrderedDict()
+
+    def get(self, job_id: str) -> Optional[CrawlProgress]:
+        return self.jobs.get(job_id)
+
+    async def start(self, crawler_service, component_id: int = None) -> CrawlProgress:
+        """
+        Start a crawl in the background with its own database session and
+        return its progress handle.
+        """
+        total = 1 if component_id else await asyncio.to_thread(self._count_components)
+
+        progress = CrawlProgress(uuid.uuid4().hex, component_id, total)
+        self.jobs[progress.job_id] = progress
+        self._evict()
+        progress.task = asyncio.create_task(self._run(crawler_service, progress))
+        return progress
+
+    @staticmethod
+    def _count_components() -> int:
+        db = SessionLocal()
+        try:
+            return db.query(Component).count()
+        finally:
+            db.close()
+
+    async def _run(self, crawler_service, progress: CrawlProgress):
+        progress.status = "running"
+        db = SessionLocal()
+        try:
+            await crawler_service.crawl_prices(
+                db,
+                component_id=progress.component_id,
+                on_results=progress.record
+            )
+            progress.finish("completed")
+        except Exception as e:
+            logger.error(f"Crawl job {progress.job_id} failed: {str(e)}")
+            progress.finish("failed", str(e))
+        finally:
+            db.close()
+
+    def _evict(self):
+        finished = [job_id for job_id, job in self.jobs.items() if job.finished]
+        for job_id in finished[:max(len(finished) - self.max_finished, 0)]:
+            del self.jobs[job_id]
@@ -0,0 +1,84 @@
+from typing import Dict, Optional
+from urllib.parse import urlparse
+import asyncio
+import time
+
+
+class TokenBucket:
+    def __init__(self, rate: float, capacity: float = 1.0):
+        """
+        Token bucket refilled at `rate` tokens per second, holding at most
+        `capacity` tokens (the allowed burst).
+        """
+        if rate <= 0:
+            raise ValueError("rate must be positive")
+        self.rate = rate
+        self.capacity = max(capacity, 1.0)
+        self.tokens = self.capacity
+        self.last_refill = time.monotonic()
+        self._lock = asyncio.Lock()
+
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.capacity, self.tokens + (now - self.last_refill) * self.rate)
+        self.last_refill = now
+
+    async def acquire(self):
+        """Wait until a token is available and take it."""
+        async with self._lock:
+            while True:
+                self._refill()
+                if self.tokens >= 1:
+                    self.tokens -= 1
+                    return
+                await asyncio.sleep((1 - self.tokens) / self.rate)
+
+
+class HostRateLimiter:
+    def __init__(self, default_rate: float = 0.5, default_capacity: float = 1.0):
+        """
+        Keeps one token bucket per host so different sites are throttled
+        independently of each other.
+        """
+        self.default_rate = default_rate
+        self.default_capacity = default_capacity
+        self._limits: Dict[str, tuple] = {}
+        self._buckets: Dict[str, TokenBucket] = {}
+
+    @staticmethod
+    def _host(url_or_host: str) -> str:
+        if "://" in url_or_host:
+            return urlparse(url_or_host).netloc.lower()
+        return url_or_host.lower()
+
+    def configure(self, url_or_host: str, rate: float, capacity: Optional[float] = None):
+        """Set the rate (requests per second) and burst size for a host."""
+        host = self._host(url_or_host)
+        limits = (rate, capacity or self.default_capacity)
+        if self._limits.get(host) == limits:
+            return
+        self._limits[host] = limits
+        self._buckets.pop(host, None)
+
+    def bucket(self, url_or_host: str) -> TokenBucket:
+        host = self._host(url_or_host)
+        bucket = self._buckets.get(host)
+        if bucket is None:
+            rate, capacity = self._limits.get(host, (self.default_rate, self.default_capacity))
+            bucket = self._buckets[host] = TokenBucket(rate, capacity)
+        return bucket
+
+    async def wait(self, url_or_host: str):
+        """Wait for the host's bucket before issuing a request."""
+        await self.bucket(url_or_host).acquire()
+
+
+_shared_limiter: Optional[HostRateLimiter] = None
+
+
+def get_host_rate_limiter() -> HostRateLimiter:
+    """Process-wide limiter, so every CrawlerService shares each site's budget."""
+    global _shared_limiter
+    if _shared_limiter is None:
+        _shared_limiter = HostRateLimiter()
+    return _shared_limiter
@@ -0,0 +1,159 @@
+from typing import Dict, Optional, Set
+from datetime import datetime, timezone
+from email.utils import parsedate_to_datetime
+import itertools
+import logging
+import random
+import time
+
+logger = logging.getLogger(__name__)
+
+RETRYABLE_STATUSES = frozenset({429, 500, 502, 503, 504})
+
+
+class CircuitOpenError(Exception):
+    """Raised when a site's circuit breaker is refusing requests."""
+
+
+class FetchError(Exception):
+    """Raised when a page could not be fetched after all retries."""
+
+
+class PageNotFound(FetchError):
+    """Raised when a site answers 404, e.g. for a delisted product page."""
+
+
+def parse_retry_after(value: Optional[str]) -> Optional[float]:
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)."""
+    if not value:
+        return None
+    value = value.strip()
+    if value.isdigit():
+        return float(value)
+    try:
+        retry_at = parsedate_to_datetime(value)
+    except (TypeError, ValueError):
+        return None
+    if retry_at.tzinfo is None:
+        retry_at = retry_at.replace(tzinfo=timezone.utc)
+    return max((retry_at - datetime.now(timezone.utc)).total_seconds(), 0.0)
+
+
+class RetryPolicy:
+    def __init__(
+        self,
+        max_retries: int = 3,
+        base_delay: float = 1.0,
+        max_delay: float = 60.0,
+        retry_statuses: frozenset = RETRYABLE_STATUSES
+    ):
+        """Exponential backoff with full jitter, honoring Retry-After."""
+        self.max_retries = max_retries
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+        self.retry_statuses = retry_statuses
+
+    def should_retry(self, status: int) -> bool:
+        return status in self.retry_statuses
+
+    def delay(self, attempt: int, retry_after: Optional[str] = None) -> float:
+        """Delay before retry number `attempt` (0-based)."""
+        server_delay = parse_retry_after(retry_after)
+        if server_delay is not None:
+            return min(server_delay, self.max_delay)
+        return random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+
+
+class CircuitBreaker:
+    CLOSED = "closed"
+    OPEN = "open"
+    HALF_OPEN = "half_open"
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_timeout: float = 120.0, half_open_max_calls: int = 1):
+        """
+        Stops requests to a site after `failure_threshold` consecutive
+        failures. After `reset_timeout` seconds it lets up to
+        `half_open_max_calls` probe requests through: a success closes the
+        breaker again, a failure re-opens it for another timeout.
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_timeout = reset_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.opened_at: Optional[float] = None
+        self.probes: Set[int] = set()  # Tokens of the half-open probes in flight
+        self.total_failures = 0
+        self.times_opened = 0
+        self._tokens = itertools.count(1)
+
+    def allow(self) -> Optional[int]:
+        """
+        A token for a request that may be sent now, or None. Hand the token
+        to release() when the request ends.
+        """
+        if self.state == self.OPEN:
+            if time.monotonic() - self.opened_at < self.reset_timeout:
+                return None
+            self.state = self.HALF_OPEN
+            self.probes = set()
+            logger.info(f"Circuit for {self.name} half-open, probing")
+        token = next(self._tokens)
+        if self.state == self.HALF_OPEN:
+            if len(self.probes) >= self.half_open_max_calls:
+                return None
+            self.probes.add(token)
+        return token
+
+    def release(self, token: int):
+        """
+        End the request allowed with `token`. A half-open probe that ended
+        without recording an outcome (cancelled, or an unexpected error)
+        gives its slot back, so the breaker doesn't stay half-open and
+        refuse every request. Any other token does nothing: a request
+        allowed while closed, or a probe of an earlier half-open period,
+        which must not free a slot another probe holds now.
+        """
+        self.probes.discard(token)
+
+    def record_success(self):
+        if self.state != self.CLOSED:
+            logger.info(f"Circuit for {self.name} closed")
+        self.state = self.CLOSED
+        self.consecutive_failures = 0
+        self.probes = set()
+
+    def record_failure(self):
+        self.consecutive_failures += 1
+        self.total_failures += 1
+        if self.state == self.HALF_OPEN or self.consecutive_failures >= self.failure_threshold:
+            if self.state != self.OPEN:
+                self.times_opened += 1
+                logger.warning(f"Circuit for {self.name} opened after {self.consecutive_failures} failures")
+            self.state = self.OPEN
+            self.opened_at = time.monotonic()
+            self.probes = set()
+
+    def as_dict(self) -> dict:
+        retry_in = None
+        if self.state == self.OPEN:
+            retry_in = round(max(self.reset_timeout - (time.monotonic() - self.opened_at), 0.0), 1)
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "total_failures": self.total_failures,
+            "times_opened": self.times_opened,
+            "retry_in_seconds": retry_in
+        }
+
+
+_breakers: Dict[str, CircuitBreaker] = {}
+
+
+def get_circuit_breaker(site_name: str) -> CircuitBreaker:
+    """Process-wide breaker per site, shared by every CrawlerService."""
+    breaker = _breakers.get(site_name)
+    if breaker is None:
+        breaker = _breakers[site_name] = CircuitBreaker(site_name)
+    return breaker
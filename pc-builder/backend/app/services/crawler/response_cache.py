@@ -0,0 +1,150 @@
+from typing import Dict, List, Optional
+from dataclasses import dataclass
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+import time
+
+logger = logging.getLogger(__name__)
+
+CACHE_PATH = os.getenv("CRAWLER_CACHE_PATH", "./crawler_cache.db")
+CACHE_TTL_SECONDS = int(os.getenv("CRAWLER_CACHE_TTL_SECONDS", str(6 * 60 * 60)))
+CACHE_MAX_BYTES = int(os.getenv("CRAWLER_CACHE_MAX_BYTES", str(64 * 1024 * 1024)))
+
+
+@dataclass
+class CacheEntry:
+    url: str
+    etag: Optional[str]
+    last_modified: Optional[str]
+    body_hash: str
+    results: List[dict]
+    stored_at: float
+
+
+def body_hash(body: bytes) -> str:
+    return hashlib.sha256(body).hexdigest()
+
+
+class ResponseCache:
+    def __init__(
+        self,
+        path: str = CACHE_PATH,
+        ttl_seconds: int = CACHE_TTL_SECONDS,
+        max_bytes: int = CACHE_MAX_BYTES
+    ):
+        """
+        On-disk cache of crawled pages keyed by URL. Only the validators
+        (ETag / Last-Modified), a hash of the body and the parsed results
+        are kept, so a 304 or an unchanged body can skip parsing entirely.
+        Entries expire after `ttl_seconds`; once the stored results exceed
+        `max_bytes` the least recently used entries are evicted.
+        """
+        self.ttl_seconds = ttl_seconds
+        self.max_bytes = max_bytes
+        self.hits = 0
+        self.misses = 0
+        self._lock = threading.Lock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.execute(
+            """
+            CREATE TABLE IF NOT EXISTS responses (
+                url TEXT PRIMARY KEY,
+                etag TEXT,
+                last_modified TEXT,
+                body_hash TEXT NOT NULL,
+                results TEXT NOT NULL,
+                size INTEGER NOT NULL,
+                stored_at REAL NOT NULL,
+                accessed_at REAL NOT NULL
+            )
+            """
+        )
+        self._conn.execute("CREATE INDEX IF NOT EXISTS ix_responses_accessed_at ON responses (accessed_at)")
+        self._conn.commit()
+
+    def get(self, url: str) -> Optional[CacheEntry]:
+        """Return the live entry for `url`, dropping it if it has expired."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT etag, last_modified, body_hash, results, stored_at FROM responses WHERE url = ?",
+                (url,)
+            ).fetchone()
+            if row is None:
+                self.misses += 1
+                return None
+            if time.time() - row[4] > self.ttl_seconds:
+                self._conn.execute("DELETE FROM responses WHERE url = ?", (url,))
+                self._conn.commit()
+                self.misses += 1
+                return None
+            return CacheEntry(url, row[0], row[1], row[2], json.loads(row[3]), row[4])
+
+    @staticmethod
+    def conditional_headers(entry: Optional[CacheEntry]) -> Dict[str, str]:
+        """Build If-None-Match / If-Modified-Since headers for a cached entry."""
+        headers = {}
+        if entry is None:
+            return headers
+        if entry.etag:
+            headers["If-None-Match"] = entry.etag
+        if entry.last_modified:
+            headers["If-Modified-Since"] = entry.last_modified
+        return headers
+
+    def touch(self, url: str):
+        """Mark an entry as revalidated (304 or identical body)."""
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "UPDATE responses SET stored_at = ?, accessed_at = ? WHERE url = ?",
+                (now, now, url)
+            )
+            self._conn.commit()
+            self.hits += 1
+
+    def store(
+        self,
+        url: str,
+        digest: str,
+        results: List[dict],
+        etag: Optional[str] = None,
+        last_modified: Optional[str] = None
+    ):
+        """Save the parsed results of a freshly downloaded page."""
+        payload = json.dumps(results)
+        now = time.time()
+        with self._lock:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO responses "
+                "(url, etag, last_modified, body_hash, results, size, stored_at, accessed_at) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?)",
+                (url, etag, last_modified, digest, payload, len(payload), now, now)
+            )
+            self._evict()
+            self._conn.commit()
+
+    def _evict(self):
+        total = self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM responses").fetchone()[0]
+        if total <= self.max_bytes:
+            return
+        rows = self._conn.execute("SELECT url, size FROM responses ORDER BY accessed_at").fetchall()
+        evicted = []
+        for url, size in rows:
+            if total <= self.max_bytes:
+                break
+            evicted.append((url,))
+            total -= size
+        self._conn.executemany("DELETE FROM responses WHERE url = ?", evicted)
+        logger.info(f"Evicted {len(evicted)} cached responses")
+
+    def clear(self):
+        with self._lock:
+            self._conn.execute("DELETE FROM responses")
+            self._conn.commit()
+
+    def close(self):
+        self._conn.close()
@@ -0,0 +1,41 @@
+from typing import Dict, List, Type
+from .base import SiteAdapter
+from .amazon_in import AmazonIn
+import os
+
+# Comma-separated adapter names to crawl; all registered sites when unset
+ENABLED_SITES = os.getenv("CRAWLER_SITES", "")
+
+_registry: Dict[str, Type[SiteAdapter]] = {}
+
+
+def register(adapter_cls: Type[SiteAdapter]) -> Type[SiteAdapter]:
+    """Register a SiteAdapter subclass under its `name`; usable as a decorator."""
+    if not adapter_cls.name:
+        raise ValueError(f"{adapter_cls.__name__} has no name")
+    _registry[adapter_cls.name] = adapter_cls
+    return adapter_cls
+
+
+def registered_sites() -> List[str]:
+    return list(_registry)
+
+
+def get_adapter(name: str, **overrides) -> SiteAdapter:
+    try:
+        return _registry[name](**overrides)
+    except KeyError:
+        raise ValueError(f"Unknown site '{name}', expected one of {', '.join(_registry)}")
+
+
+def enabled_adapters(overrides: Dict[str, dict] = None, names: List[str] = None) -> Dict[str, SiteAdapter]:
+    """Adapters for the enabled sites, with per-site attribute overrides applied."""
+    overrides = overrides or {}
+    if names is None:
+        names = [name.strip() for name in ENABLED_SITES.split(",") if name.strip()] or registered_sites()
+    return {name: get_adapter(name, **overrides.get(name, {})) for name in names}
+
+
+register(AmazonIn)
+
+__all__ = ['SiteAdapter', 'register', 'registered_sites', 'get_adapter', 'enabled_adapters']
@@ -0,0 +1,41 @@
+from typing import Optional
+from ..extraction import has_class
+from .base import SiteAdapter
+import re
+
+ASIN = re.compile(r'/(?:dp|gp/product)/([A-Z0-9]{10})(?:[/?]|$)')
+
+
+class AmazonIn(SiteAdapter):
+    name = "amazon_in"
+    display_name = "Amazon.in"
+    base_url = "https://www.amazon.in/s?k="
+    currency = "₹"
+    rate_limit = {"calls_per_second": 0.5, "burst": 1}
+    selectors = {
+        "price_selector": ".a-price .a-offscreen",
+        "product_selector": "div.s-result-item[data-component-type='s-search-result']",
+        "title_selector": "span.a-text-normal",
+        "link_selector": "a.a-link-normal.s-no-outline",
+        # Same selectors as XPath for the streaming lxml extractor
+        "product_xpath": f"self::div[@data-component-type='s-search-result' and {has_class('s-result-item')}]",
+        "title_xpath": f".//span[{has_class('a-text-normal')}]",
+        "price_xpath": f".//*[{has_class('a-price')}]//*[{has_class('a-offscreen')}]",
+        "link_xpath": f".//a[{has_class('a-link-normal')} and {has_class('s-no-outline')}]/@href",
+        # Product detail pages
+        "detail_title_selector": "#productTitle",
+        "detail_price_selector": "#corePrice_feature_div .a-offscreen, #corePriceDisplay_desktop_feature_div .a-offscreen",
+        "detail_title_xpath": "self::span[@id='productTitle']",
+        "detail_price_xpath": (
+            f"self::span[{has_class('a-offscreen')}]"
+            "[ancestor::div[@id='corePrice_feature_div' or @id='corePriceDisplay_desktop_feature_div']]"
+        ),
+    }
+
+    def product_id(self, url: str) -> Optional[str]:
+        match = ASIN.search(url)
+        return match.group(1) if match else None
+
+    def pinned_url(self, url: str) -> str:
+        asin = self.product_id(url)
+        return f"{self.origin}/dp/{asin}" if asin else url
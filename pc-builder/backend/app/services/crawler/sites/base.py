@@ -0,0 +1,84 @@
+from typing import Dict, Optional
+from copy import deepcopy
+from urllib.parse import quote_plus, urljoin, urlparse
+import re
+
+PRICE_CHARS = re.compile(r'[^\d.]')
+
+
+class SiteAdapter:
+    """
+    One e-commerce site the crawler can search. Subclasses set the class
+    attributes below; everything the parse workers need is exposed as the
+    plain `site_info` dict so it pickles cheaply into the process pool.
+    """
+    name: str = ""
+    display_name: str = ""
+    base_url: str = ""  # Search URL prefix, the search term is appended
+    currency: str = "₹"
+    min_price: float = 1000
+    max_price: float = 500000
+    rate_limit: Dict[str, float] = {"calls_per_second": 0.5, "burst": 1}
+    # CSS selectors for the BeautifulSoup fallback, XPath for the lxml extractor
+    selectors: Dict[str, str] = {}
+
+    def __init__(self, **overrides):
+        """Keyword arguments override class attributes, e.g. base_url for the replay server."""
+        for key, value in overrides.items():
+            if key == "selectors":
+                value = {**self.selectors, **value}
+            setattr(self, key, deepcopy(value))
+
+    @property
+    def origin(self) -> str:
+        parsed = urlparse(self.base_url)
+        return f"{parsed.scheme}://{parsed.netloc}"
+
+    @property
+    def site_info(self) -> dict:
+        """Picklable extraction config consumed by extraction.extract_products."""
+        return dict(self.selectors)
+
+    def search_url(self, search_term: str) -> str:
+        return f"{self.base_url}{quote_plus(search_term)}"
+
+    def product_url(self, href: str) -> str:
+        """Absolute URL for a product link found on a search page."""
+        return href if href.startswith("http") else urljoin(self.origin, href)
+
+    @property
+    def supports_product_pages(self) -> bool:
+        """Whether matched products can be re-read from their detail page."""
+        return "detail_title_xpath" in self.selectors or "detail_title_selector" in self.selectors
+
+    def product_id(self, url: str) -> Optional[str]:
+        """The site's stable product id (e.g. an ASIN) in a product URL, if it has one."""
+        return None
+
+    def pinned_url(self, url: str) -> str:
+        """Shortest stable URL of a product's detail page."""
+        return url
+
+    def owns_url(self, url: Optional[str]) -> bool:
+        return bool(url) and urlparse(url).netloc.lower() == urlparse(self.base_url).netloc.lower()
+
+    def parse_price(self, price_text: str) -> Optional[float]:
+        """Price from its displayed text, or None if it is missing or implausible."""
+        price_text = PRICE_CHARS.sub('', price_text or '')
+        if not price_text:
+            return None
+        try:
+            price = float(price_text)
+        except ValueError:
+            return None
+        return price if self.min_price <= price <= self.max_price else None
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "display_name": self.display_name or self.name,
+            "base_url": self.base_url,
+            "currency": self.currency,
+            "rate_limit": dict(self.rate_limit),
+            "selectors": dict(self.selectors)
+        }
@@ -0,0 +1,312 @@
+from typing import Dict, Iterator, List, Optional
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta
+from sqlalchemy import func, select
+from sqlalchemy.orm import Session
+from ..models.models import Price
+import json
+import logging
+import numpy as np
+import os
+import shutil
+import threading
+
+logger = logging.getLogger(__name__)
+
+ARCHIVE_PATH = os.getenv("PRICE_ARCHIVE_PATH", "./price_archive")
+ARCHIVE_AFTER_DAYS = int(os.getenv("PRICE_ARCHIVE_AFTER_DAYS", "30"))
+SEGMENT_ROWS = int(os.getenv("PRICE_ARCHIVE_SEGMENT_ROWS", "2000000"))
+
+# One .npy file per column; sites are stored as indexes into the manifest's site list, -1 for none
+COLUMNS = {
+    "id": np.int64,
+    "component_id": np.int32,
+    "site": np.int16,
+    "timestamp": "datetime64[us]",
+    "price": np.float64
+}
+
+
+def month_start(timestamp: datetime) -> datetime:
+    return timestamp.replace(day=1, hour=0, minute=0, second=0, microsecond=0, tzinfo=None)
+
+
+def next_month(month: datetime) -> datetime:
+    return month.replace(year=month.year + 1, month=1) if month.month == 12 else month.replace(month=month.month + 1)
+
+
+@dataclass
+class Segment:
+    name: str
+    rows: int
+    min_component_id: int
+    max_component_id: int
+    min_timestamp: datetime
+    max_timestamp: datetime
+
+    def as_dict(self) -> dict:
+        return {
+            "name": self.name,
+            "rows": self.rows,
+            "min_component_id": self.min_component_id,
+            "max_component_id": self.max_component_id,
+            "min_timestamp": self.min_timestamp.isoformat(),
+            "max_timestamp": self.max_timestamp.isoformat()
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "Segment":
+        return cls(
+            data["name"], data["rows"], data["min_component_id"], data["max_component_id"],
+            datetime.fromisoformat(data["min_timestamp"]), datetime.fromisoformat(data["max_timestamp"])
+        )
+
+
+@dataclass
+class Manifest:
+    archived_through: Optional[datetime] = None  # Every row before this is in the segments
+    sites: List[str] = field(default_factory=list)
+    segments: List[Segment] = field(default_factory=list)
+
+
+class PriceArchive:
+    def __init__(
+        self,
+        path: str = ARCHIVE_PATH,
+        after: timedelta = timedelta(days=ARCHIVE_AFTER_DAYS),
+        segment_rows: int = SEGMENT_ROWS
+    ):
+        """
+        Append-only cold storage for raw price rows. Rows are archived a
+        calendar month at a time once the whole month is older than
+        `after`, into segments of at most `segment_rows` rows sorted by
+        component and time, one .npy file per column. The manifest
+        records each segment's component and time range, so a read opens
+        only the segments that can hold the component and range, and
+        finds the rows by binary search in memory-mapped arrays.
+
+        Archiving doesn't delete anything: PriceHistoryService prunes the
+        raw rows before `archived_through` once the manifest is written.
+        """
+        self.path = path
+        self.after = after
+        self.segment_rows = segment_rows
+        self.manifest_path = os.path.join(path, "manifest.json")
+        self._lock = threading.Lock()
+        self._manifest = Manifest()
+        self._manifest_mtime: Optional[int] = None
+        self._columns: Dict[str, Dict[str, np.ndarray]] = {}
+
+    @property
+    def archived_through(self) -> Optional[datetime]:
+        return self.manifest().archived_through
+
+    def manifest(self) -> Manifest:
+        """The current manifest, reloaded when another process archived more rows."""
+        try:
+            mtime = os.stat(self.manifest_path).st_mtime_ns
+        except FileNotFoundError:
+            return Manifest()
+        with self._lock:
+            if mtime != self._manifest_mtime:
+                with open(self.manifest_path) as f:
+                    data = json.load(f)
+                self._manifest = Manifest(
+                    datetime.fromisoformat(data["archived_through"]) if data["archived_through"] else None,
+                    data["sites"],
+                    [Segment.from_dict(segment) for segment in data["segments"]]
+                )
+                self._manifest_mtime = mtime
+            return self._manifest
+
+    def archive(self, db: Session, now: datetime = None) -> int:
+        """
+        Copy every complete month older than `after` that isn't archived
+        yet into new segments, committing the manifest after each month.
+        Returns the number of rows archived.
+        """
+        now = now or datetime.utcnow()
+        cutoff = month_start(now - self.after)
+        manifest = self.manifest()
+        month = manifest.archived_through
+        if month is None:
+            oldest = db.scalar(select(func.min(Price.timestamp)))
+            if oldest is None:
+                return 0
+            month = month_start(oldest)
+
+        archived = 0
+        while month < cutoff:
+            end = next_month(month)
+            sites = list(manifest.sites)
+            columns = self._read_month(db, month, end, sites)
+            segments = self._write_segments(month, columns)
+            manifest = Manifest(end, sites, manifest.segments + segments)
+            self._save(manifest)
+            archived += len(columns["id"])
+            logger.info(f"Archived {len(columns['id'])} price rows from {month:%Y-%m} in {len(segments)} segments")
+            month = end
+        return archived
+
+    def _read_month(self, db: Session, start: datetime, end: datetime, sites: List[str]) -> Dict[str, np.ndarray]:
+        """The month's price rows as columns; sites not seen before are appended to `sites`."""
+        codes = {site: code for code, site in enumerate(sites)}
+        parts = {name: [] for name in COLUMNS}
+        result = db.execute(
+            select(Price.id, Price.component_id, Price.site, Price.timestamp, Price.price)
+            .filter(
+                Price.timestamp >= start,
+                Price.timestamp < end,
+                Price.component_id.isnot(None),
+                Price.price.isnot(None)
+            )
+            .execution_options(yield_per=50000)
+        )
+        for rows in result.partitions():
+            for site in {row.site for row in rows} - codes.keys() - {None}:
+                codes[site] = len(sites)
+                sites.append(site)
+            parts["id"].append(np.array([row.id for row in rows], dtype=COLUMNS["id"]))
+            parts["component_id"].append(np.array([row.component_id for row in rows], dtype=COLUMNS["component_id"]))
+            parts["site"].append(np.array([codes.get(row.site, -1) for row in rows], dtype=COLUMNS["site"]))
+            parts["timestamp"].append(np.array([row.timestamp for row in rows], dtype=COLUMNS["timestamp"]))
+            parts["price"].append(np.array([row.price for row in rows], dtype=COLUMNS["price"]))
+        return {
+            name: np.concatenate(arrays) if arrays else np.empty(0, dtype=COLUMNS[name])
+            for name, arrays in parts.items()
+        }
+
+    def _write_segments(self, month: datetime, columns: Dict[str, np.ndarray]) -> List[Segment]:
+        order = np.lexsort((columns["id"], columns["timestamp"], columns["component_id"]))
+        columns = {name: column[order] for name, column in columns.items()}
+        segments = []
+        for number, offset in enumerate(range(0, len(order), self.segment_rows)):
+            chunk = {name: column[offset:offset + self.segment_rows] for name, column in columns.items()}
+            segment = Segment(
+                f"{month:%Y-%m}-{number:03d}",
+                len(chunk["id"]),
+                int(chunk["component_id"][0]),
+                int(chunk["component_id"][-1]),
+                chunk["timestamp"].min().item(),
+                chunk["timestamp"].max().item()
+            )
+            directory = os.path.join(self.path, "segments", segment.name)
+            staging = directory + ".tmp"
+            # Left over by an interrupted run: never listed in the manifest
+            shutil.rmtree(staging, ignore_errors=True)
+            shutil.rmtree(directory, ignore_errors=True)
+            os.makedirs(staging)
+            for name, column in chunk.items():
+                with open(os.path.join(staging, f"{name}.npy"), "wb") as f:
+                    np.save(f, column)
+                    f.flush()
+                    os.fsync(f.fileno())
+            os.replace(staging, directory)
+            segments.append(segment)
+        return segments
+
+    def _save(self, manifest: Manifest):
+        data = {
+            "archived_through": manifest.archived_through.isoformat() if manifest.archived_through else None,
+            "sites": manifest.sites,
+            "segments": [segment.as_dict() for segment in manifest.segments]
+        }
+        os.makedirs(self.path, exist_ok=True)
+        staging = self.manifest_path + ".tmp"
+        with open(staging, "w") as f:
+            json.dump(data, f, indent=1)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(staging, self.manifest_path)
+
+    def _open(self, segment: Segment) -> Dict[str, np.ndarray]:
+        """The segment's columns, memory-mapped; segments never change once written."""
+        with self._lock:
+            columns = self._columns.get(segment.name)
+            if columns is None:
+                directory = os.path.join(self.path, "segments", segment.name)
+                columns = {name: np.load(os.path.join(directory, f"{name}.npy"), mmap_mode="r") for name in COLUMNS}
+                self._columns[segment.name] = columns
+            return columns
+
+    def segments_for(self, component_id: int, start: datetime = None, end: datetime = None) -> List[Segment]:
+        """Segments that can hold rows of the component between `start` and `end`."""
+        return [
+            segment for segment in self.manifest().segments
+            if segment.min_component_id <= component_id <= segment.max_component_id
+            and (start is None or segment.max_timestamp >= start)
+            and (end is None or segment.min_timestamp < end)
+        ]
+
+    def read(
+        self,
+        component_id: int,
+        start: datetime = None,
+        end: datetime = None,
+        site: Optional[str] = None
+    ) -> Dict[str, np.ndarray]:
+        """A component's archived rows from `start` up to `end` as columns in time order."""
+        sites = self.manifest().sites
+        if site is not None and site not in sites:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        parts = []
+        for segment in self.segments_for(component_id, start, end):
+            columns = self._open(segment)
+            first, last = np.searchsorted(columns["component_id"], [component_id, component_id + 1])
+            timestamps = columns["timestamp"][first:last]
+            if end is not None:
+                last = first + np.searchsorted(timestamps, np.datetime64(end, "us"))
+            if start is not None:
+                first += np.searchsorted(timestamps, np.datetime64(start, "us"))
+            # Copy the slice out of the mapping
+            part = {name: np.array(column[first:last]) for name, column in columns.items()}
+            if site is not None:
+                keep = part["site"] == sites.index(site)
+                part = {name: column[keep] for name, column in part.items()}
+            parts.append(part)
+        if not parts:
+            return {name: np.empty(0, dtype=dtype) for name, dtype in COLUMNS.items()}
+        columns = {name: np.concatenate([part[name] for part in parts]) for name in COLUMNS}
+        order = np.argsort(columns["timestamp"], kind="stable")
+        return {name: column[order] for name, column in columns.items()}
+
+    def rows(
+        self,
+        component_id: int,
+        start: datetime = None,
+        end: datetime = None,
+        site: Optional[str] = None
+    ) -> List[dict]:
+        """Like `read`, as price row dicts (id, component_id, price, site, timestamp)."""
+        return self._rows(self.read(component_id, start, end, site))
+
+    def scan(self, batch_size: int = 100000) -> Iterator[List[dict]]:
+        """Every archived row, in batches of price row dicts."""
+        for segment in self.manifest().segments:
+            columns = self._open(segment)
+            for offset in range(0, segment.rows, batch_size):
+                yield self._rows({name: column[offset:offset + batch_size] for name, column in columns.items()})
+
+    def _rows(self, columns: Dict[str, np.ndarray]) -> List[dict]:
+        sites = [None] + self.manifest().sites  # Code -1 is no site
+        return [
+            {"id": id, "component_id": component_id, "price": price, "site": sites[code + 1], "timestamp": timestamp}
+            for id, component_id, price, code, timestamp in zip(
+                columns["id"].tolist(),
+                columns["component_id"].tolist(),
+                columns["price"].tolist(),
+                columns["site"].tolist(),
+                columns["timestamp"].tolist()
+            )
+        ]
+
+
+_default_archive: Optional[PriceArchive] = None
+
+
+def get_price_archive() -> Optional[PriceArchive]:
+    """Process-wide archive, or None when PRICE_ARCHIVE_PATH is empty."""
+    global _default_archive
+    if _default_archive is None and ARCHIVE_PATH:
+        _default_archive = PriceArchive()
+    return _default_archive
@@ -0,0 +1,394 @@
+from typing import Dict, List, Optional, Tuple
+from dataclasses import dataclass
+from datetime import datetime, timedelta, timezone
+from sqlalchemy import delete, exists, func, insert, literal, select, update
+from sqlalchemy.orm import Session, aliased
+from sqlalchemy.sql import Select
+from ..models.models import Price, PriceRollup, PriceRollupBackfill
+from .price_archive import PriceArchive, get_price_archive
+import logging
+import os
+
+logger = logging.getLogger(__name__)
+
+RAW_RETENTION_DAYS = int(os.getenv("PRICE_RAW_RETENTION_DAYS", "90"))
+HOURLY_RETENTION_DAYS = int(os.getenv("PRICE_HOURLY_RETENTION_DAYS", "730"))
+
+# Rollup bucket widths; daily rollups are kept forever
+RESOLUTIONS = {"hour": timedelta(hours=1), "day": timedelta(days=1)}
+
+
+def utc_naive(timestamp: datetime) -> datetime:
+    """Timestamps are stored as naive UTC; convert aware ones so comparisons line up."""
+    if timestamp.tzinfo is None:
+        return timestamp
+    return timestamp.astimezone(timezone.utc).replace(tzinfo=None)
+
+
+def bucket_start(timestamp: datetime, resolution: str) -> datetime:
+    timestamp = utc_naive(timestamp).replace(minute=0, second=0, microsecond=0)
+    return timestamp.replace(hour=0) if resolution == "day" else timestamp
+
+
+@dataclass
+class Bucket:
+    open: float
+    open_at: datetime
+    high: float
+    low: float
+    close: float
+    close_at: datetime
+    count: int
+
+    @classmethod
+    def of(cls, price: float, timestamp: datetime) -> "Bucket":
+        return cls(price, timestamp, price, price, price, timestamp, 1)
+
+    def merge(self, other: "Bucket"):
+        """Combine with another part of the same bucket; the parts may come in any order."""
+        if other.open_at < self.open_at:
+            self.open, self.open_at = other.open, other.open_at
+        if other.close_at >= self.close_at:
+            self.close, self.close_at = other.close, other.close_at
+        self.high = max(self.high, other.high)
+        self.low = min(self.low, other.low)
+        self.count += other.count
+
+    def as_dict(self) -> dict:
+        return {
+            "open": self.open,
+            "open_at": self.open_at,
+            "high": self.high,
+            "low": self.low,
+            "close": self.close,
+            "close_at": self.close_at,
+            "count": self.count
+        }
+
+
+# (resolution, component id, site, bucket start)
+BucketKey = Tuple[str, int, Optional[str], datetime]
+
+
+class PriceHistoryService:
+    def __init__(
+        self,
+        raw_retention: timedelta = timedelta(days=RAW_RETENTION_DAYS),
+        hourly_retention: timedelta = timedelta(days=HOURLY_RETENTION_DAYS),
+        archive: Optional[PriceArchive] = None
+    ):
+        """
+        Keeps hourly and daily OHLC rollups of the prices table per component
+        and site, and prunes what long-range reads no longer need: raw rows
+        older than `raw_retention` (except each component and site's latest
+        price, which later rows are compared against) and hourly buckets
+        older than `hourly_retention`. Rollups are updated with every batch
+        of price rows written, so they are never behind the raw rows.
+
+        With an archive (by default the one at PRICE_ARCHIVE_PATH) raw rows
+        are moved there instead of being dropped after `raw_retention`, and
+        raw reads before its `archived_through` are served from it.
+        """
+        self.raw_retention = raw_retention
+        self.hourly_retention = hourly_retention
+        self.archive = archive or get_price_archive()
+
+    def rollup(self, db: Session, rows: List[Dict]) -> int:
+        """
+        Merge price rows (component_id, price, timestamp and site) into
+        their hourly and daily buckets. Returns the number of buckets
+        touched. The caller owns the transaction, so the rollups commit
+        together with the rows.
+        """
+        buckets: Dict[BucketKey, Bucket] = {}
+        for row in rows:
+            timestamp = utc_naive(row["timestamp"])
+            for resolution in RESOLUTIONS:
+                key = (resolution, row["component_id"], row.get("site"), bucket_start(timestamp, resolution))
+                bucket = Bucket.of(row["price"], timestamp)
+                if key in buckets:
+                    buckets[key].merge(bucket)
+                else:
+                    buckets[key] = bucket
+        if not buckets:
+            return 0
+
+        updates = []
+        for key, stored_id, stored in self._load_buckets(db, buckets):
+            stored.merge(buckets.pop(key))
+            updates.append({"id": stored_id, **stored.as_dict()})
+        inserts = [
+            {"resolution": resolution, "component_id": component_id, "site": site, "bucket_start": start, **bucket.as_dict()}
+            for (resolution, component_id, site, start), bucket in buckets.items()
+        ]
+        if inserts:
+            # The ORM leaves None values out of the INSERT; group those rows so each group is one executemany
+            inserts.sort(key=lambda row: row["site"] is None)
+            db.execute(insert(PriceRollup), inserts)
+        if updates:
+            db.execute(update(PriceRollup), updates)
+        return len(inserts) + len(updates)
+
+    def _load_buckets(self, db: Session, buckets: Dict[BucketKey, Bucket]):
+        """Stored rollups among `buckets`' keys, locked for the update on databases that lock rows."""
+        for resolution in RESOLUTIONS:
+            keys = [key for key in buckets if key[0] == resolution]
+            result = db.execute(
+                select(
+                    PriceRollup.id, PriceRollup.component_id, PriceRollup.site, PriceRollup.bucket_start,
+                    PriceRollup.open, PriceRollup.open_at, PriceRollup.high, PriceRollup.low,
+                    PriceRollup.close, PriceRollup.close_at, PriceRollup.count
+                ).filter(
+                    PriceRollup.component_id.in_({key[1] for key in keys}),
+                    PriceRollup.resolution == resolution,
+                    PriceRollup.bucket_start.in_({key[3] for key in keys})
+                ).with_for_update()
+            )
+            for row in result:
+                key = (resolution, row.component_id, row.site, utc_naive(row.bucket_start))
+                if key in buckets:
+                    stored = Bucket(row.open, utc_naive(row.open_at), row.high, row.low, row.close,
+                                    utc_naive(row.close_at), row.count)
+                    yield key, row.id, stored
+
+    def rebuild(self, db: Session, batch_size: int = 10000) -> int:
+        """
+        Recompute all rollups from the raw rows, archived ones included,
+        committing every `batch_size` rows. Rows written while this runs are
+        rolled up by their writers: only rows up to the highest id at the
+        start are read.
+        """
+        db.execute(delete(PriceRollup))
+        rolled_up = 0
+        archived_through = self.archive.archived_through if self.archive else None
+        if archived_through:
+            for rows in self.archive.scan(batch_size):
+                self.rollup(db, rows)
+                db.commit()
+                rolled_up += len(rows)
+
+        last_id = db.scalar(select(func.max(Price.id))) or 0
+        cursor = 0
+        while cursor < last_id:
+            query = (
+                select(Price.id, Price.component_id, Price.site, Price.price, Price.timestamp)
+                .filter(Price.id > cursor, Price.id <= last_id, Price.price.isnot(None), Price.timestamp.isnot(None))
+                .order_by(Price.id).limit(batch_size)
+            )
+            if archived_through:
+                # Older rows still in the table are copies of archived ones
+                query = query.filter(Price.timestamp >= archived_through)
+            rows = db.execute(query).mappings().all()
+            if not rows:
+                break
+            self.rollup(db, rows)
+            db.commit()
+            cursor = rows[-1]["id"]
+            rolled_up += len(rows)
+        # Every row is rolled up now, including the ones a backfill was waiting for
+        backfill = db.get(PriceRollupBackfill, 1)
+        if backfill and backfill.completed_at is None:
+            backfill.backfilled_price_id = backfill.through_price_id
+            backfill.completed_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"Rebuilt price rollups from {rolled_up} price rows")
+        return rolled_up
+
+    def needs_backfill(self, db: Session) -> bool:
+        """Whether price rows written before rollups were kept are still to be rolled up."""
+        backfill = db.get(PriceRollupBackfill, 1)
+        return backfill is not None and backfill.completed_at is None
+
+    def backfill(self, db: Session, batch_size: int = 10000) -> int:
+        """
+        Roll up the price rows written before rollups were kept: the ones up
+        to the backfill record's through_price_id, which was taken when the
+        rollups table was created. Rows after it are rolled up by their
+        writers, however soon they landed. Progress commits with each batch,
+        so an interrupted backfill resumes without counting a row twice.
+        Returns the number of rows rolled up.
+        """
+        backfill = db.get(PriceRollupBackfill, 1)
+        if backfill is None or backfill.completed_at is not None:
+            return 0
+        rolled_up = 0
+        while backfill.backfilled_price_id < backfill.through_price_id:
+            rows = db.execute(
+                select(Price.id, Price.component_id, Price.site, Price.price, Price.timestamp)
+                .filter(
+                    Price.id > backfill.backfilled_price_id,
+                    Price.id <= backfill.through_price_id,
+                    Price.price.isnot(None),
+                    Price.timestamp.isnot(None)
+                )
+                .order_by(Price.id).limit(batch_size)
+            ).mappings().all()
+            if not rows:
+                break
+            self.rollup(db, rows)
+            backfill.backfilled_price_id = rows[-1]["id"]
+            db.commit()
+            rolled_up += len(rows)
+        backfill.backfilled_price_id = backfill.through_price_id
+        backfill.completed_at = datetime.utcnow()
+        db.commit()
+        logger.info(f"Backfilled price rollups from {rolled_up} price rows")
+        return rolled_up
+
+    def prune(self, db: Session, now: datetime = None, batch_size: int = 5000) -> Tuple[int, int]:
+        """
+        Delete raw rows past the raw retention, or with an archive the ones
+        it already holds, keeping each component and site's latest row, and
+        hourly rollups past the hourly retention. Raw rows go in batches,
+        each its own transaction, so crawl writes aren't locked out for the
+        whole prune. Returns (raw rows, hourly buckets) deleted.
+        """
+        now = now or datetime.utcnow()
+        raw_before = self.archive.archived_through if self.archive else now - self.raw_retention
+        newer = aliased(Price)
+        has_newer = exists().where(
+            newer.component_id == Price.component_id,
+            newer.site.is_not_distinct_from(Price.site),
+            newer.timestamp > Price.timestamp
+        )
+        raw_deleted = 0
+        while raw_before:
+            ids = db.scalars(
+                select(Price.id).filter(Price.timestamp < raw_before, has_newer).limit(batch_size)
+            ).all()
+            if not ids:
+                break
+            db.execute(delete(Price).filter(Price.id.in_(ids)))
+            db.commit()
+            raw_deleted += len(ids)
+
+        hourly_deleted = db.execute(
+            delete(PriceRollup).filter(
+                PriceRollup.resolution == "hour",
+                PriceRollup.bucket_start < now - self.hourly_retention
+            )
+        ).rowcount
+        db.commit()
+        return raw_deleted, hourly_deleted
+
+    def maintain(self, db: Session, now: datetime = None) -> dict:
+        """
+        Finish the rollup backfill, archive, then prune; raw rows only go
+        once they are rolled up (and archived).
+        """
+        backfilled = self.backfill(db)
+        archived = self.archive.archive(db, now) if self.archive else 0
+        raw_deleted, hourly_deleted = self.prune(db, now)
+        return {
+            "rows_rolled_up": backfilled,
+            "raw_rows_archived": archived,
+            "raw_rows_pruned": raw_deleted,
+            "hourly_buckets_pruned": hourly_deleted
+        }
+
+    def resolution_for(self, start: datetime, end: datetime, points: int, now: datetime = None) -> str:
+        """
+        The coarsest resolution ("day", "hour" or "raw") with at least
+        `points` buckets between `start` and `end` whose data still reaches
+        back to `start`. If none has that many, the finest one that reaches
+        back to `start`.
+        """
+        now = now or datetime.utcnow()
+        start, end = utc_naive(start), utc_naive(end)
+        retained_since = {
+            "raw": datetime.min if self.archive else now - self.raw_retention,
+            "hour": now - self.hourly_retention,
+            "day": datetime.min
+        }
+        covering = [resolution for resolution in ("raw", "hour", "day") if start >= retained_since[resolution]]
+        for resolution in reversed(covering):
+            if resolution == "raw" or (end - start) / RESOLUTIONS[resolution] >= points:
+                return resolution
+        return covering[0]
+
+    def series_query(
+        self,
+        component_id: int,
+        resolution: str,
+        start: datetime,
+        end: datetime,
+        site: Optional[str] = None
+    ) -> Select:
+        """
+        A component's history between `start` and `end` as (timestamp, site,
+        open, high, low, close, count) rows in time order. Raw rows are
+        points with open = high = low = close; archived ones are left to
+        `archived_points`.
+        """
+        start, end = utc_naive(start), utc_naive(end)
+        if resolution == "raw":
+            archived_through = self.archive.archived_through if self.archive else None
+            if archived_through:
+                start = max(start, archived_through)
+            query = select(
+                Price.timestamp.label("timestamp"), Price.site,
+                Price.price.label("open"), Price.price.label("high"),
+                Price.price.label("low"), Price.price.label("close"),
+                literal(1).label("count")
+            ).filter(
+                Price.component_id == component_id,
+                Price.timestamp >= start,
+                Price.timestamp < end
+            ).order_by(Price.timestamp)
+            return query.filter(Price.site == site) if site else query
+
+        query = select(
+            PriceRollup.bucket_start.label("timestamp"), PriceRollup.site,
+            PriceRollup.open, PriceRollup.high, PriceRollup.low, PriceRollup.close, PriceRollup.count
+        ).filter(
+            PriceRollup.component_id == component_id,
+            PriceRollup.resolution == resolution,
+            PriceRollup.bucket_start >= bucket_start(start, resolution),
+            PriceRollup.bucket_start < end
+        ).order_by(PriceRollup.bucket_start)
+        return query.filter(PriceRollup.site == site) if site else query
+
+    def archived_points(
+        self,
+        component_id: int,
+        start: datetime,
+        end: datetime,
+        site: Optional[str] = None
+    ) -> List[dict]:
+        """The raw points `series_query` leaves to the archive, in time order."""
+        archived_through = self.archive.archived_through if self.archive else None
+        start, end = utc_naive(start), utc_naive(end)
+        if not archived_through or start >= archived_through:
+            return []
+        return [
+            {
+                "timestamp": row["timestamp"], "site": row["site"],
+                "open": row["price"], "high": row["price"], "low": row["price"], "close": row["price"],
+                "count": 1
+            }
+            for row in self.archive.rows(component_id, start, min(end, archived_through), site)
+        ]
+
+    def get_series(
+        self,
+        db: Session,
+        component_id: int,
+        start: datetime,
+        end: datetime,
+        points: int = 200,
+        site: Optional[str] = None
+    ) -> dict:
+        resolution = self.resolution_for(start, end, points)
+        archived = self.archived_points(component_id, start, end, site) if resolution == "raw" else []
+        rows = db.execute(self.series_query(component_id, resolution, start, end, site)).mappings().all()
+        return series(component_id, resolution, start, end, archived + list(rows))
+
+
+def series(component_id: int, resolution: str, start: datetime, end: datetime, rows) -> dict:
+    return {
+        "component_id": component_id,
+        "resolution": resolution,
+        "start": start,
+        "end": end,
+        "points": [dict(row) for row in rows]
+    }
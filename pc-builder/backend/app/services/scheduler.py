@@ -2,66 +2,208 @@ from apscheduler.schedulers.asyncio import AsyncIOScheduler
 from apscheduler.triggers.interval import IntervalTrigger
 from sqlalchemy.orm import Session
 from .crawler import CrawlerService
+from .crawler.job_queue import CrawlJobQueue
+from .crawler.priority import RecrawlPlanner
+from .price_history import PriceHistoryService
 from ..database.config import SessionLocal
+from datetime import datetime, timedelta
 import asyncio
 import logging
+import os
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
+# "inline" crawls in this process, "queue" hands due components to worker.py processes
+EXECUTION_MODE = os.getenv("CRAWLER_EXECUTION", "inline")
+# Hours between full-catalog crawl runs in inline mode; 0 leaves crawling to the due-component dispatch
+FULL_RUN_INTERVAL_HOURS = float(os.getenv("CRAWLER_FULL_RUN_INTERVAL_HOURS", "24"))
+
 class CrawlerScheduler:
     def __init__(self):
         self.scheduler = AsyncIOScheduler()
         self.crawler_service = CrawlerService()
+        self.execution_mode = EXECUTION_MODE
+        self.full_run_interval = timedelta(hours=FULL_RUN_INTERVAL_HOURS)
+        # Full runs take their share of the request budget from the planner
+        self.planner = RecrawlPlanner(
+            sites_per_component=len(self.crawler_service.supported_sites),
+            sweep_interval=self.full_run_interval if self.execution_mode == "inline" and self.full_run_interval else None
+        )
+        self._update_run_window()
+        self.dispatch_tick = timedelta(minutes=1)
+        self.job_queue = CrawlJobQueue()
+        self.price_history = PriceHistoryService()
+        # One full run at a time: the scheduled run and a resumed one would walk the same run
+        self._full_run_lock = asyncio.Lock()
 
     def start(self):
         """
         Start the scheduler with predefined jobs.
         """
-        # Schedule price updates every 15 minutes
+        # Recompute per-component recrawl intervals every 15 minutes
         self.scheduler.add_job(
-            self._update_all_prices,
+            self._refresh_plan,
             IntervalTrigger(minutes=15),
-            id="price_update_15min",
-            name="Update all component prices every 15 minutes",
+            id="recrawl_plan_refresh",
+            name="Refresh per-component recrawl priorities",
+            next_run_time=datetime.now(),
+            replace_existing=True
+        )
+
+        # Crawl whatever is due, within the request budget
+        self.scheduler.add_job(
+            self._crawl_due_components,
+            IntervalTrigger(seconds=self.dispatch_tick.total_seconds()),
+            id="price_update_due",
+            name="Update prices of components that are due for a recrawl",
+            max_instances=1,
+            coalesce=True,
+            replace_existing=True
+        )
+
+        # Sweep the whole catalog as a resumable run, so components the plan rarely picks still get crawled
+        if self.execution_mode == "inline" and self.full_run_interval:
+            self.scheduler.add_job(
+                self._update_all_prices,
+                IntervalTrigger(seconds=self.full_run_interval.total_seconds()),
+                id="full_crawl_run",
+                name="Crawl every component as a resumable run",
+                max_instances=1,
+                coalesce=True,
+                replace_existing=True
+            )
+
+        # Pick up a full crawl run interrupted by a restart
+        self.scheduler.add_job(
+            self._resume_interrupted_run,
+            id="resume_crawl_run",
+            name="Resume an interrupted full crawl run",
+            next_run_time=datetime.now(),
+            replace_existing=True
+        )
+
+        # Backfill price rollups once, then prune raw rows and hourly rollups past their retention
+        self.scheduler.add_job(
+            self._maintain_price_history,
+            IntervalTrigger(hours=6),
+            id="price_history_maintenance",
+            name="Backfill price rollups and prune old price history",
+            next_run_time=datetime.now(),
+            max_instances=1,
+            coalesce=True,
             replace_existing=True
         )
 
-        logger.info("Starting price update scheduler (15-minute intervals)")
+        logger.info(f"Starting adaptive price update scheduler "
+                    f"({self.planner.requests_per_hour} requests/hour budget)")
         self.scheduler.start()
 
+    async def _refresh_plan(self):
+        """
+        Recompute recrawl intervals from price volatility and popularity.
+        The aggregations run in a thread; the queue is rebuilt on the event
+        loop, where the dispatch job pops from it.
+        """
+        def load():
+            db = SessionLocal()
+            try:
+                return self.planner.load_inputs(db)
+            finally:
+                db.close()
+
+        try:
+            inputs = await asyncio.to_thread(load)
+            count = self.planner.apply(inputs)
+            self._update_run_window()
+            logger.info(f"Recrawl plan refreshed for {count} components")
+        except Exception as e:
+            logger.error(f"Error refreshing recrawl plan: {str(e)}")
+
+    def _update_run_window(self):
+        """
+        Keep a full run resumable for twice as long as a paced sweep of the
+        catalog takes, so a slow run is resumed rather than abandoned and
+        restarted from its first component.
+        """
+        if self.planner.sweep_duration:
+            self.crawler_service.run_service.run_window = 2 * self.planner.sweep_duration
+
+    async def _crawl_due_components(self):
+        """
+        Crawl the components whose next crawl time has passed.
+        """
+        due = self.planner.pop_due(limit=self.planner.dispatch_limit(self.dispatch_tick))
+        if not due:
+            return
+
+        db = SessionLocal()
+        if self.execution_mode == "queue":
+            try:
+                queued = self.job_queue.enqueue(db, due)
+                logger.info(f"Queued {queued} of {len(due)} due components for crawl workers")
+            except Exception as e:
+                logger.error(f"Error queueing due components: {str(e)}")
+            finally:
+                for component_id in due:
+                    self.planner.mark_crawled(component_id)
+                db.close()
+            return
+
+        try:
+            logger.info(f"Crawling {len(due)} due components")
+            results = await self.crawler_service.crawl_prices(db, component_ids=due)
+            successful_updates = len([r for r in results if "price" in r])
+            logger.info(f"Due crawl completed: ✅ {successful_updates} / {len(results)} site results")
+        except Exception as e:
+            logger.error(f"Error during due price update: {str(e)}")
+        finally:
+            for component_id in due:
+                self.planner.mark_crawled(component_id)
+            db.close()
+
     async def _update_all_prices(self):
         """
-        Update prices for all components.
+        Update prices for all components as a resumable crawl run.
         """
+        if self._full_run_lock.locked():
+            logger.info("A full crawl run is already in progress")
+            return
+        async with self._full_run_lock:
+            await self._run_full_crawl()
+
+    async def _run_full_crawl(self):
         try:
             logger.info("Starting scheduled price update...")
             db = SessionLocal()
             
             try:
                 # Get current time for logging
-                from datetime import datetime
                 current_time = datetime.now().strftime("%Y-%m-%d %H:%M:%S")
                 logger.info(f"Price update started at: {current_time}")
+                started = datetime.now()
 
-                # Crawl prices for all components
-                results = await self.crawler_service.crawl_prices(db, debug=True)
-                
-                # Log results
-                successful_updates = len([r for r in results if "price" in r])
-                failed_updates = len([r for r in results if "error" in r])
-                
-                logger.info(f"Price update completed:")
-                logger.info(f"✅ Successful updates: {successful_updates}")
-                logger.info(f"❌ Failed updates: {failed_updates}")
+                # Crawl prices for all components, resuming an interrupted run, within the sweep's budget share
+                if not self.planner.priorities:
+                    await self._refresh_plan()
+                run = await self.crawler_service.crawl_run(
+                    db,
+                    debug=True,
+                    requests_per_hour=self.planner.sweep_requests_per_hour or None
+                )
                 
-                # Log individual results
-                for result in results:
-                    if "error" in result:
-                        logger.warning(f"Failed to update {result['component_name']}: {result['error']}")
-                    else:
-                        logger.info(f"Updated {result['component_name']}: ₹{result['price']} from {result['site']}")
+                logger.info(f"Price update completed (run {run.id}):")
+                logger.info(f"✅ Successful updates: {run.completed}")
+                logger.info(f"❌ Failed updates: {run.failed}")
+                elapsed = (datetime.now() - started).total_seconds()
+                if elapsed > 0:
+                    logger.info(f"⏱️ Throughput: {(run.completed + run.failed) * 60 / elapsed:.1f} components/min "
+                                f"({elapsed:.0f}s in this process)")
+                write_stats = self.crawler_service.last_write_stats
+                if write_stats:
+                    logger.info(f"💾 Last chunk writes: {write_stats.rows_written} rows in {write_stats.batches} batches "
+                                f"({write_stats.rows_per_second:.0f} rows/sec)")
 
             except Exception as e:
                 logger.error(f"Error during price update: {str(e)}")
@@ -72,6 +214,37 @@ class CrawlerScheduler:
         except Exception as e:
             logger.error(f"Critical error in price update job: {str(e)}")
 
+    async def _maintain_price_history(self):
+        """
+        Keep price history bounded; runs in a thread since a backfill or a
+        large prune takes a while.
+        """
+        def maintain():
+            db = SessionLocal()
+            try:
+                return self.price_history.maintain(db)
+            finally:
+                db.close()
+
+        try:
+            stats = await asyncio.to_thread(maintain)
+            logger.info(f"Price history maintenance: {stats}")
+        except Exception as e:
+            logger.error(f"Error maintaining price history: {str(e)}")
+
+    async def _resume_interrupted_run(self):
+        """
+        Resume a full crawl run left open by a crash or deploy.
+        """
+        db = SessionLocal()
+        try:
+            run = self.crawler_service.run_service.latest_open_run(db)
+        finally:
+            db.close()
+        if run:
+            logger.info(f"Found interrupted crawl run {run.id}, resuming")
+            await self._update_all_prices()
+
     def add_custom_job(self, func, trigger):
         """
         Add a custom scheduled job.
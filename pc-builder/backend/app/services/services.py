@@ -1,7 +1,12 @@
-from typing import List, Optional
-from sqlalchemy.orm import Session
+from typing import Dict, List, Optional
+import asyncio
+from sqlalchemy import insert, select, update
+from sqlalchemy.ext.asyncio import AsyncSession
+from sqlalchemy.orm import Session, joinedload
 from datetime import datetime
-from .base import BaseService
+from .base import AsyncBaseService, BaseService
+from .price_archive import get_price_archive
+from .price_history import PriceHistoryService, series
 from ..models.models import Category, Component, Price, Analytics
 from ..schemas.schemas import (
     CategoryCreate, Category as CategorySchema,
@@ -21,34 +26,76 @@ class ComponentService(BaseService[Component, ComponentCreate, ComponentCreate])
     def __init__(self):
         super().__init__(Component)
 
-    def get_by_category(self, db: Session, category_id: int, skip: int = 0, limit: int = 100) -> List[Component]:
-        return db.query(self.model).filter(
-            self.model.category_id == category_id
-        ).offset(skip).limit(limit).all()
+    def get_by_category(
+        self,
+        db: Session,
+        category_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[Component]:
+        query = db.query(self.model).filter(self.model.category_id == category_id)
+        if min_price is not None:
+            query = query.filter(self.model.current_price >= min_price)
+        if max_price is not None:
+            query = query.filter(self.model.current_price <= max_price)
+        return query.offset(skip).limit(limit).all()
 
     def get_by_price_range(self, db: Session, min_price: float, max_price: float) -> List[Component]:
         return db.query(self.model).filter(
-            self.model.price >= min_price,
-            self.model.price <= max_price
+            self.model.current_price >= min_price,
+            self.model.current_price <= max_price
         ).all()
 
 class PriceService(BaseService[Price, PriceCreate, PriceCreate]):
     def __init__(self):
         super().__init__(Price)
+        self.archive = get_price_archive()
 
     def get_component_price_history(self, db: Session, component_id: int) -> List[Price]:
-        return db.query(self.model).filter(
-            self.model.component_id == component_id
-        ).order_by(self.model.date_retrieved.desc()).all()
+        """Newest first; rows before the archive's horizon come from the archive, as dicts."""
+        archived_through = self.archive.archived_through if self.archive else None
+        query = db.query(self.model).filter(self.model.component_id == component_id)
+        if not archived_through:
+            return query.order_by(self.model.timestamp.desc()).all()
+        recent = query.filter(self.model.timestamp >= archived_through).order_by(self.model.timestamp.desc()).all()
+        return recent + self.archive.rows(component_id, end=archived_through)[::-1]
 
     def record_price(self, db: Session, component_id: int, price: float) -> Price:
         price_record = PriceCreate(
             component_id=component_id,
             price=price,
-            date_retrieved=datetime.utcnow()
+            timestamp=datetime.utcnow()
         )
         return self.create(db, price_record)
 
+    def record_prices_bulk(self, db: Session, rows: List[Dict], component_updates: List[Dict] = None) -> int:
+        """
+        Insert many price rows with a single executemany and update the
+        affected components in one bulk UPDATE. Rows are dicts with
+        component_id, price and timestamp, and optionally the site and
+        product url. `component_updates` are dicts with the component id
+        and the columns to set; without them each component's
+        current_price is set to its lowest price in the batch. The caller
+        owns the transaction.
+        """
+        if rows:
+            db.execute(insert(self.model), rows)
+
+        if component_updates is None:
+            current_prices = {}
+            for row in rows:
+                best = current_prices.get(row["component_id"])
+                if best is None or row["price"] < best:
+                    current_prices[row["component_id"]] = row["price"]
+            component_updates = [
+                {"id": component_id, "current_price": price} for component_id, price in current_prices.items()
+            ]
+        if component_updates:
+            db.execute(update(Component), component_updates)
+        return len(rows)
+
 class AnalyticsService(BaseService[Analytics, AnalyticsCreate, AnalyticsCreate]):
     def __init__(self):
         super().__init__(Analytics)
@@ -68,6 +115,85 @@ class AnalyticsService(BaseService[Analytics, AnalyticsCreate, AnalyticsCreate])
         ).order_by(self.model.timestamp.desc()).all()
 
     def get_user_events(self, db: Session, user_id: str) -> List[Analytics]:
+        # Analytics rows have no timestamp column; last_viewed is their only time, and ix_analytics_user_id_last_viewed serves this order
         return db.query(self.model).filter(
             self.model.user_id == user_id
-        ).order_by(self.model.timestamp.desc()).all() 
\ No newline at end of file
+        ).order_by(self.model.last_viewed.desc()).all()
+
+# AsyncSession variants, used by the async routers
+
+class AsyncCategoryService(AsyncBaseService[Category, CategoryCreate, CategoryCreate]):
+    def __init__(self):
+        super().__init__(Category)
+
+    async def get_by_name(self, db: AsyncSession, name: str) -> Optional[Category]:
+        return await db.scalar(select(self.model).filter(self.model.name == name).limit(1))
+
+class AsyncComponentService(AsyncBaseService[Component, ComponentCreate, ComponentCreate]):
+    def __init__(self):
+        super().__init__(Component)
+
+    async def get_with_category(self, db: AsyncSession, id: int) -> Optional[Component]:
+        return await db.scalar(
+            select(self.model).options(joinedload(self.model.category)).filter(self.model.id == id)
+        )
+
+    async def get_by_category(
+        self,
+        db: AsyncSession,
+        category_id: int,
+        skip: int = 0,
+        limit: int = 100,
+        min_price: Optional[float] = None,
+        max_price: Optional[float] = None
+    ) -> List[Component]:
+        query = select(self.model).filter(self.model.category_id == category_id)
+        if min_price is not None:
+            query = query.filter(self.model.current_price >= min_price)
+        if max_price is not None:
+            query = query.filter(self.model.current_price <= max_price)
+        result = await db.scalars(query.offset(skip).limit(limit))
+        return result.all()
+
+    async def get_by_price_range(self, db: AsyncSession, min_price: float, max_price: float) -> List[Component]:
+        result = await db.scalars(select(self.model).filter(
+            self.model.current_price >= min_price,
+            self.model.current_price <= max_price
+        ))
+        return result.all()
+
+class AsyncPriceService(AsyncBaseService[Price, PriceCreate, PriceCreate]):
+    def __init__(self):
+        super().__init__(Price)
+        self.history = PriceHistoryService()
+        self.archive = self.history.archive
+
+    async def get_component_price_history(self, db: AsyncSession, component_id: int) -> List[Price]:
+        """Newest first; rows before the archive's horizon come from the archive, as dicts."""
+        archived_through = self.archive.archived_through if self.archive else None
+        query = select(self.model).filter(self.model.component_id == component_id)
+        if archived_through:
+            query = query.filter(self.model.timestamp >= archived_through)
+        result = await db.scalars(query.order_by(self.model.timestamp.desc()))
+        if not archived_through:
+            return result.all()
+        # Page faults on the mapped segments would stall the event loop
+        archived = await asyncio.to_thread(self.archive.rows, component_id, None, archived_through)
+        return result.all() + archived[::-1]
+
+    async def get_price_series(
+        self,
+        db: AsyncSession,
+        component_id: int,
+        start: datetime,
+        end: datetime,
+        points: int = 200,
+        site: Optional[str] = None
+    ) -> dict:
+        """A component's prices over a range from the coarsest stored resolution that has `points` points."""
+        resolution = self.history.resolution_for(start, end, points)
+        archived = []
+        if resolution == "raw":
+            archived = await asyncio.to_thread(self.history.archived_points, component_id, start, end, site)
+        result = await db.execute(self.history.series_query(component_id, resolution, start, end, site))
+        return series(component_id, resolution, start, end, archived + list(result.mappings().all()))
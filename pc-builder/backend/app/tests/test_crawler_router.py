@@ -0,0 +1,143 @@
+"""
+Crawler router tests against a small SQLite database, with the crawl
+itself replaced by a fake that reports a price per component without
+touching the network.
+"""
+import asyncio
+import time
+from datetime import datetime, timedelta
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from sqlalchemy import insert, update
+from sqlalchemy.orm import sessionmaker
+
+from app.database.config import Base, create_db_engine, get_db
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component, Price
+from app.routers import crawler as crawler_router
+from app.services.crawler import best_price, progress
+from app.services.crawler.progress import CrawlProgressTracker
+
+COMPONENTS = 2
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'crawler.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Category).values(name="CPU"))
+        conn.execute(insert(Component), [
+            {"name": f"Test Part {i}", "category_id": 1} for i in range(COMPONENTS)
+        ])
+    yield sessionmaker(bind=engine, autocommit=False, autoflush=False)
+    engine.dispose()
+
+
+@pytest.fixture
+def crawls(monkeypatch):
+    """Calls to the fake crawl; each takes a moment so a client can subscribe first."""
+    calls = []
+
+    async def crawl_prices(db, component_id=None, component_ids=None, on_results=None, **kwargs):
+        calls.append(component_id)
+        await asyncio.sleep(0.2)
+        ids = [component_id] if component_id else [component.id for component in db.query(Component)]
+        results = [{"component_id": id, "site": "amazon_in", "price": 1000.0 + id} for id in ids]
+        if on_results:
+            on_results(ids, results)
+        return results
+
+    monkeypatch.setattr(crawler_router.crawler_service, "crawl_prices", crawl_prices)
+    return calls
+
+
+@pytest.fixture
+def client(monkeypatch, session_factory, crawls):
+    monkeypatch.setattr(progress, "SessionLocal", session_factory)
+    monkeypatch.setattr(best_price, "SessionLocal", session_factory)
+    monkeypatch.setattr(crawler_router, "crawl_tracker", CrawlProgressTracker())
+
+    def override():
+        db = session_factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app = FastAPI()
+    app.include_router(crawler_router.router)
+    app.dependency_overrides[get_db] = override
+    with TestClient(app) as client:
+        yield client
+
+
+def test_crawl_job_reports_progress_and_streams_events(client, crawls):
+    response = client.post("/crawler/crawl")
+    assert response.status_code == 202
+    job = response.json()
+    assert job["total"] == COMPONENTS
+    assert job["status"] in ("pending", "running")
+
+    # The stream ends with the job, so this returns once the crawl is done
+    events = client.get(f"/crawler/crawl/{job['job_id']}/events")
+    assert events.status_code == 200
+    assert events.headers["content-type"].startswith("text/event-stream")
+    names = [line.split(": ", 1)[1] for line in events.text.splitlines() if line.startswith("event: ")]
+    assert names == ["progress"] + ["component"] * COMPONENTS + ["done"]
+
+    status = client.get(f"/crawler/crawl/{job['job_id']}").json()
+    assert status["status"] == "completed"
+    assert (status["completed"], status["failed"], status["remaining"]) == (COMPONENTS, 0, 0)
+    assert crawls == [None]
+
+
+def test_crawl_job_for_unknown_component_or_job_is_404(client, crawls):
+    assert client.post("/crawler/crawl", params={"component_id": 99}).status_code == 404
+    assert client.get("/crawler/crawl/missing").status_code == 404
+    assert client.get("/crawler/crawl/missing/events").status_code == 404
+    assert crawls == []
+
+
+def checked(session_factory, component_id: int, ago: timedelta):
+    """Store one price for the component, last checked `ago`."""
+    now = datetime.utcnow()
+    with session_factory() as db:
+        db.execute(insert(Price).values(component_id=component_id, site="amazon_in", price=900.0, timestamp=now - ago))
+        db.execute(update(Component).where(Component.id == component_id).values(last_checked_at=now - ago))
+        db.commit()
+
+
+def test_best_price_is_served_from_fresh_prices_without_a_crawl(client, session_factory, crawls):
+    checked(session_factory, 1, timedelta(minutes=5))
+
+    response = client.get("/crawler/best-price/1")
+    assert response.status_code == 200
+    body = response.json()
+    assert (body["price"], body["site"]) == (900.0, "amazon_in")
+    assert (body["stale"], body["refreshing"]) == (False, False)
+    assert crawls == []
+
+
+def test_best_price_serves_stale_prices_while_a_crawl_refreshes_them(client, session_factory, crawls):
+    checked(session_factory, 1, best_price.BEST_PRICE_MAX_AGE * timedelta(seconds=2))
+
+    response = client.get("/crawler/best-price/1")
+    assert response.status_code == 200
+    body = response.json()
+    assert body["price"] == 900.0
+    assert (body["stale"], body["refreshing"]) == (True, True)
+
+    # A second request while the crawl runs shares it
+    assert client.get("/crawler/best-price/1").json()["refreshing"] is True
+    deadline = time.monotonic() + 5
+    while crawler_router.best_price_service.refreshes.in_flight(1) and time.monotonic() < deadline:
+        time.sleep(0.05)
+    assert crawls == [1]
+
+
+def test_best_price_for_unknown_component_is_404(client, crawls):
+    assert client.get("/crawler/best-price/99").status_code == 404
+    assert crawls == []
@@ -0,0 +1,57 @@
+"""
+PriceWriter tests: which stored prices a crawled batch's current_price is
+taken from.
+"""
+import asyncio
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database.config import Base, create_db_engine
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component, Price
+from app.services.crawler.last_prices import LastPriceCache
+from app.services.crawler.price_writer import PriceWriter
+
+NOW = datetime(2026, 10, 1, 12)
+
+
+@pytest.fixture
+def session_factory(tmp_path):
+    """One component with an old price from a legacy row without a site and one from a disabled site."""
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'prices.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Category).values(name="CPU"))
+        conn.execute(insert(Component).values(name="Test Part", category_id=1, current_price=500.0))
+        conn.execute(insert(Price), [
+            {"component_id": 1, "site": None, "price": 500.0, "timestamp": NOW - timedelta(days=400)},
+            {"component_id": 1, "site": "flipkart", "price": 800.0, "timestamp": NOW - timedelta(days=30)},
+        ])
+    yield sessionmaker(bind=engine)
+    engine.dispose()
+
+
+def crawl(session_factory, sites, prices):
+    async def write():
+        async with PriceWriter(session_factory, last_prices=LastPriceCache(), sites=sites) as writer:
+            for site, price in prices.items():
+                await writer.add(1, price, NOW, site)
+
+    asyncio.run(write())
+    with session_factory() as db:
+        return db.get(Component, 1).current_price
+
+
+def test_current_price_ignores_stale_prices_without_a_site_or_from_disabled_sites(session_factory):
+    assert crawl(session_factory, ["amazon_in"], {"amazon_in": 1000.0}) == 1000.0
+
+
+def test_current_price_keeps_enabled_sites_missing_from_the_batch(session_factory):
+    assert crawl(session_factory, ["amazon_in", "flipkart"], {"amazon_in": 1000.0}) == 800.0
+
+
+def test_current_price_without_enabled_sites_counts_every_named_site(session_factory):
+    assert crawl(session_factory, None, {"amazon_in": 1000.0}) == 800.0
@@ -0,0 +1,117 @@
+"""
+Rollup backfill tests: price rows written before rollups were kept are
+rolled up once, and rows written after them never twice, however early
+they land.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import func, insert, select
+from sqlalchemy.orm import sessionmaker
+
+from app.database.config import Base, create_db_engine
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component, Price, PriceRollup, PriceRollupBackfill
+from app.services.price_archive import PriceArchive
+from app.services.price_history import PriceHistoryService
+
+NOW = datetime(2026, 10, 1, 12)
+OLD_ROWS = 50
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'history.db'}")
+    yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def history(tmp_path):
+    return PriceHistoryService(archive=PriceArchive(str(tmp_path / "archive")))
+
+
+def daily_count(db) -> int:
+    return db.scalar(select(func.sum(PriceRollup.count)).filter(PriceRollup.resolution == "day")) or 0
+
+
+def write(db, history, component_id, price, timestamp):
+    """What PriceWriter does with a batch: the row and its rollup in one commit."""
+    row = {"component_id": component_id, "site": "amazon_in", "price": price, "timestamp": timestamp}
+    db.execute(insert(Price), [row])
+    history.rollup(db, [row])
+    db.commit()
+
+
+def test_rows_from_before_rollups_are_backfilled_once(engine, history):
+    # A database from before rollups were kept
+    pre_rollup = [table for name, table in Base.metadata.tables.items()
+                  if name not in ("price_rollups", "price_rollup_backfill")]
+    Base.metadata.create_all(bind=engine, tables=pre_rollup)
+    with engine.begin() as conn:
+        conn.execute(insert(Category).values(name="CPU"))
+        conn.execute(insert(Component).values(name="Test Part", category_id=1))
+        conn.execute(insert(Price), [
+            {"component_id": 1, "site": "amazon_in", "price": 1000.0 + i, "timestamp": NOW - timedelta(hours=i)}
+            for i in range(OLD_ROWS)
+        ])
+
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    assert db.get(PriceRollupBackfill, 1).through_price_id == OLD_ROWS
+
+    # A crawl writes before the first maintenance; its rollup must not stand in for the backfill
+    write(db, history, 1, 900.0, NOW)
+    assert history.needs_backfill(db)
+
+    assert history.maintain(db, NOW)["rows_rolled_up"] == OLD_ROWS
+    assert daily_count(db) == OLD_ROWS + 1
+    assert not history.needs_backfill(db)
+
+    # Later runs roll up nothing again
+    write(db, history, 1, 950.0, NOW)
+    assert history.maintain(db, NOW)["rows_rolled_up"] == 0
+    assert daily_count(db) == OLD_ROWS + 2
+    db.close()
+
+
+def test_interrupted_backfill_resumes_where_it_stopped(engine, history):
+    Base.metadata.create_all(bind=engine, tables=[Base.metadata.tables[name] for name in ("categories", "components", "prices")])
+    with engine.begin() as conn:
+        conn.execute(insert(Category).values(name="CPU"))
+        conn.execute(insert(Component).values(name="Test Part", category_id=1))
+        conn.execute(insert(Price), [
+            {"component_id": 1, "site": "amazon_in", "price": 1000.0 + i, "timestamp": NOW - timedelta(hours=i)}
+            for i in range(OLD_ROWS)
+        ])
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+
+    rollup = history.rollup
+    calls = []
+
+    def failing_rollup(db, rows):
+        calls.append(len(rows))
+        if len(calls) == 3:
+            raise RuntimeError("interrupted")
+        return rollup(db, rows)
+
+    history.rollup = failing_rollup
+    with pytest.raises(RuntimeError):
+        history.backfill(db, batch_size=10)
+    db.rollback()
+    assert db.get(PriceRollupBackfill, 1).backfilled_price_id == 20
+
+    history.rollup = rollup
+    assert history.backfill(db, batch_size=10) == OLD_ROWS - 20
+    assert daily_count(db) == OLD_ROWS
+    db.close()
+
+
+def test_new_database_has_nothing_to_backfill(engine, history):
+    Base.metadata.create_all(bind=engine)
+    db = sessionmaker(bind=engine)()
+    assert db.get(PriceRollupBackfill, 1).through_price_id == 0
+    assert history.backfill(db) == 0
+    assert not history.needs_backfill(db)
+    db.close()
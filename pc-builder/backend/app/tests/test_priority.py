@@ -0,0 +1,47 @@
+"""
+Recrawl planner tests: a freshly started planner schedules components from
+when they were last crawled, not all at once.
+"""
+from datetime import datetime, timedelta
+
+import pytest
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database.config import Base, create_db_engine
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component
+from app.services.crawler.priority import RecrawlPlanner
+
+NOW = datetime(2026, 10, 1, 12)
+
+
+@pytest.fixture
+def db(tmp_path):
+    engine = create_db_engine(f"sqlite:///{tmp_path / 'plan.db'}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        conn.execute(insert(Category).values(name="CPU"))
+        conn.execute(insert(Component), [
+            {"name": "Checked an hour ago", "category_id": 1, "last_checked_at": NOW - timedelta(hours=1)},
+            {"name": "Never checked", "category_id": 1, "last_checked_at": None},
+            {"name": "Checked two days ago", "category_id": 1, "last_checked_at": NOW - timedelta(days=2)},
+        ])
+    session = sessionmaker(bind=engine)()
+    yield session
+    session.close()
+    engine.dispose()
+
+
+def test_new_planner_schedules_components_from_their_last_crawl(db):
+    planner = RecrawlPlanner()
+    assert planner.refresh(db, NOW) == 3
+
+    # No volatility or views: every component gets the longest interval
+    assert planner.priorities[1].next_crawl_at == NOW - timedelta(hours=1) + planner.max_interval
+    assert planner.priorities[2].next_crawl_at == NOW
+    assert planner.priorities[3].next_crawl_at == NOW - timedelta(days=2) + planner.max_interval
+
+    # Only the overdue and never-crawled components are due, most overdue first
+    assert planner.pop_due(NOW) == [3, 2]
+    assert planner.pop_due(NOW + timedelta(hours=23)) == [1]
@@ -0,0 +1,132 @@
+"""
+Query-plan regression tests: the catalog, price history and analytics
+queries must be answered from their composite indexes on a large
+database, without full table scans or temporary sort trees.
+
+The synthetic database (1M price rows) is built once per session; set
+QUERY_PLAN_PRICE_ROWS to test against a smaller one.
+"""
+from datetime import datetime, timedelta
+import os
+import random
+
+import pytest
+from sqlalchemy import event, insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database.config import Base, create_db_engine
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.auth import User
+from app.models.models import Analytics, Category, Component, Price
+from app.services.crawler.priority import RecrawlPlanner
+from app.services.services import AnalyticsService, ComponentService, PriceService
+
+PRICE_ROWS = int(os.getenv("QUERY_PLAN_PRICE_ROWS", "1000000"))
+COMPONENTS = max(PRICE_ROWS // 20, 10)
+CATEGORIES = 12
+USERS = 1000
+ANALYTICS_ROWS = PRICE_ROWS // 10
+
+
+@pytest.fixture(scope="session")
+def engine(tmp_path_factory):
+    engine = create_db_engine(f"sqlite:///{tmp_path_factory.mktemp('plans') / 'plans.db'}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"name": f"Category {i}"} for i in range(CATEGORIES)])
+        conn.execute(insert(User), [
+            {"email": f"user{i}@example.com", "username": f"user{i}", "hashed_password": "x"} for i in range(USERS)
+        ])
+        conn.execute(insert(Component), [
+            {"name": f"Part {i}", "category_id": i % CATEGORIES + 1, "current_price": rng.uniform(500, 250000)}
+            for i in range(COMPONENTS)
+        ])
+        for offset in range(0, PRICE_ROWS, 100000):
+            conn.execute(insert(Price), [
+                {
+                    "component_id": rng.randint(1, COMPONENTS),
+                    "price": rng.uniform(500, 250000),
+                    "site": "amazon_in",
+                    "timestamp": start + timedelta(minutes=i)
+                }
+                for i in range(offset, min(offset + 100000, PRICE_ROWS))
+            ])
+        conn.execute(insert(Analytics), [
+            {
+                "component_id": rng.randint(1, COMPONENTS),
+                "user_id": rng.randint(1, USERS),
+                "view_count": rng.randint(1, 50),
+                "last_viewed": start + timedelta(minutes=i)
+            }
+            for i in range(ANALYTICS_ROWS)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+    yield engine
+    engine.dispose()
+
+
+def query_plans(engine, run) -> list:
+    """EXPLAIN QUERY PLAN of every SELECT issued by run(db), as lists of plan details."""
+    statements = []
+
+    def capture(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("SELECT"):
+            statements.append((statement, parameters))
+
+    event.listen(engine, "before_cursor_execute", capture)
+    db = sessionmaker(bind=engine)()
+    try:
+        run(db)
+    finally:
+        db.close()
+        event.remove(engine, "before_cursor_execute", capture)
+
+    plans = []
+    with engine.connect() as conn:
+        for statement, parameters in statements:
+            rows = conn.exec_driver_sql(f"EXPLAIN QUERY PLAN {statement}", parameters).all()
+            plans.append([row[3] for row in rows])
+    return plans
+
+
+def assert_uses_index(plan: list, index: str):
+    assert any(index in detail for detail in plan), plan
+    assert not any(detail.startswith("SCAN") and "INDEX" not in detail for detail in plan), plan
+    assert not any("TEMP B-TREE" in detail for detail in plan), plan
+
+
+def test_price_history_uses_component_timestamp_index(engine):
+    (plan,) = query_plans(engine, lambda db: PriceService().get_component_price_history(db, 42))
+    assert_uses_index(plan, "ix_prices_component_id_timestamp")
+
+
+def test_price_volatility_scan_is_covered(engine):
+    planner = RecrawlPlanner()
+    (plan,) = query_plans(engine, lambda db: planner._load_volatility(db, datetime(2026, 6, 1)))
+    assert_uses_index(plan, "COVERING INDEX ix_prices_component_id_timestamp")
+
+
+def test_category_listing_uses_category_price_index(engine):
+    service = ComponentService()
+    (plan,) = query_plans(engine, lambda db: service.get_by_category(db, 3))
+    assert_uses_index(plan, "ix_components_category_id_current_price")
+    (plan,) = query_plans(engine, lambda db: service.get_by_category(db, 3, min_price=1000, max_price=5000))
+    assert_uses_index(plan, "ix_components_category_id_current_price (category_id=? AND current_price>? AND current_price<?)")
+
+
+def test_price_range_listing_uses_price_index(engine):
+    (plan,) = query_plans(engine, lambda db: ComponentService().get_by_price_range(db, 1000, 5000))
+    assert_uses_index(plan, "ix_components_current_price")
+
+
+def test_popularity_scan_is_covered(engine):
+    planner = RecrawlPlanner()
+    (plan,) = query_plans(engine, planner._load_popularity)
+    assert_uses_index(plan, "COVERING INDEX ix_analytics_component_id_view_count")
+
+
+def test_user_history_uses_user_last_viewed_index(engine):
+    (plan,) = query_plans(engine, lambda db: AnalyticsService().get_user_events(db, 7))
+    assert_uses_index(plan, "ix_analytics_user_id_last_viewed")
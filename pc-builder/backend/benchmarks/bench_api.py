@@ -0,0 +1,237 @@
+"""
+API throughput under mixed load: the components router as it was
+(`async def` endpoints on the synchronous Session, so every query blocks
+the event loop), the same endpoints as plain `def` run in FastAPI's
+threadpool, and the async router on an AsyncSession.
+
+Each variant is served by uvicorn in its own process over the same
+SQLite database and driven by concurrent aiohttp clients with a mix of
+component detail lookups, price history reads and deep category pages
+(large OFFSET, slow in the database rather than in Python). Reports
+requests/sec and latency per request kind.
+
+Usage (from the backend directory):
+    python benchmarks/bench_api.py [--seconds 10] [--concurrency 32] [--components 50000]
+        [--modes blocking threadpool async]
+"""
+from typing import List
+import argparse
+import asyncio
+import inspect
+import multiprocessing
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import aiohttp
+from fastapi import APIRouter, Depends, FastAPI, HTTPException
+from sqlalchemy import insert
+from sqlalchemy.orm import Session, sessionmaker
+from sqlalchemy.ext.asyncio import async_sessionmaker
+
+from app.database.config import Base, create_async_db_engine, create_db_engine, get_async_db, get_db
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component, Price
+from app.routers import components
+from app.schemas.schemas import Component as ComponentSchema, ComponentWithCategory, Price as PriceSchema
+from app.services.services import ComponentService, PriceService
+
+CATEGORIES = 4
+HISTORY_PER_COMPONENT = 20
+MODES = ("blocking", "threadpool", "async")
+
+# (kind, weight): detail lookups dominate, deep listing pages are the slow tail
+MIX = (("detail", 70), ("history", 20), ("deep page", 10))
+
+
+def make_database(path: str, size: int):
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    start = datetime(2026, 1, 1)
+    with engine.begin() as conn:
+        conn.execute(insert(Category), [{"name": f"Benchmark Category {i}"} for i in range(CATEGORIES)])
+        conn.execute(insert(Component), [
+            {"name": f"Benchmark Part {i:06d}", "category_id": i % CATEGORIES + 1, "current_price": rng.uniform(1000, 90000)}
+            for i in range(size)
+        ])
+        conn.execute(insert(Price), [
+            {"component_id": component_id, "price": rng.uniform(1000, 90000), "site": "amazon_in",
+             "timestamp": start + timedelta(hours=n)}
+            for component_id in range(1, size + 1)
+            for n in range(HISTORY_PER_COMPONENT)
+        ])
+        conn.exec_driver_sql("ANALYZE")
+    engine.dispose()
+
+
+def sync_router(threadpool: bool) -> APIRouter:
+    """The component routes on the synchronous Session, as `def` (threadpool) or `async def` (blocking)."""
+    router = APIRouter(prefix="/components")
+    component_service = ComponentService()
+    price_service = PriceService()
+
+    def list_components(category_id: int, skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
+        return component_service.get_by_category(db, category_id, skip, limit)
+
+    def get_component(component_id: int, db: Session = Depends(get_db)):
+        component = component_service.get(db, component_id)
+        if not component:
+            raise HTTPException(status_code=404, detail="Component not found")
+        return component
+
+    def get_component_price_history(component_id: int, db: Session = Depends(get_db)):
+        if not component_service.get(db, component_id):
+            raise HTTPException(status_code=404, detail="Component not found")
+        return price_service.get_component_price_history(db, component_id)
+
+    for path, endpoint, response_model in (
+        ("/", list_components, List[ComponentSchema]),
+        ("/{component_id}", get_component, ComponentWithCategory),
+        ("/{component_id}/price-history", get_component_price_history, List[PriceSchema]),
+    ):
+        if not threadpool:
+            endpoint = _as_coroutine(endpoint)
+        router.add_api_route(path, endpoint, methods=["GET"], response_model=response_model)
+    return router
+
+
+def _as_coroutine(endpoint):
+    """`endpoint` as an `async def` with the same signature: FastAPI runs it on the event loop."""
+    async def run(**kwargs):
+        return endpoint(**kwargs)
+    run.__signature__ = inspect.signature(endpoint)
+    return run
+
+
+def serve(mode: str, path: str, port: int, pool_size: int):
+    import uvicorn
+
+    app = FastAPI()
+    if mode == "async":
+        engine = create_async_db_engine(f"sqlite+aiosqlite:///{path}", pool_size=pool_size)
+        session_factory = async_sessionmaker(bind=engine, autoflush=False, expire_on_commit=False)
+
+        async def override():
+            async with session_factory() as db:
+                yield db
+        app.dependency_overrides[get_async_db] = override
+        app.include_router(components.router)
+    else:
+        engine = create_db_engine(f"sqlite:///{path}", pool_size=pool_size)
+        session_factory = sessionmaker(bind=engine, autocommit=False, autoflush=False)
+
+        def override():
+            db = session_factory()
+            try:
+                yield db
+            finally:
+                db.close()
+        app.dependency_overrides[get_db] = override
+        app.include_router(sync_router(threadpool=mode == "threadpool"))
+
+    async def run():
+        await uvicorn.Server(uvicorn.Config(app, host="127.0.0.1", port=port, log_level="warning")).serve()
+        if mode == "async":
+            # Pooled aiosqlite connections each hold a thread that would keep the process alive
+            await engine.dispose()
+    asyncio.run(run())
+
+
+async def client(session, base: str, size: int, deadline: float, seed: int, results: dict):
+    rng = random.Random(seed)
+    kinds = [kind for kind, _ in MIX]
+    weights = [weight for _, weight in MIX]
+    per_category = size // CATEGORIES
+    while time.perf_counter() < deadline:
+        kind = rng.choices(kinds, weights)[0]
+        component_id = rng.randint(1, size)
+        if kind == "detail":
+            url = f"{base}/components/{component_id}"
+        elif kind == "history":
+            url = f"{base}/components/{component_id}/price-history"
+        else:
+            skip = rng.randint(per_category // 2, per_category - 20)
+            url = f"{base}/components/?category_id={rng.randint(1, CATEGORIES)}&skip={skip}&limit=20"
+        started = time.perf_counter()
+        try:
+            async with session.get(url) as response:
+                await response.read()
+                ok = response.status == 200
+        except (aiohttp.ClientError, asyncio.TimeoutError):
+            ok = False
+        if ok:
+            results[kind].append(time.perf_counter() - started)
+        else:
+            results["errors"].append(url)
+
+
+async def drive(port: int, size: int, args) -> dict:
+    base = f"http://127.0.0.1:{port}"
+    timeout = aiohttp.ClientTimeout(total=args.request_timeout)
+    async with aiohttp.ClientSession(connector=aiohttp.TCPConnector(limit=args.concurrency), timeout=timeout) as session:
+        for _ in range(200):
+            try:
+                async with session.get(f"{base}/components/1") as response:
+                    if response.status == 200:
+                        break
+            except aiohttp.ClientError:
+                pass
+            await asyncio.sleep(0.1)
+        results = {kind: [] for kind, _ in MIX}
+        results["errors"] = []
+        started = time.perf_counter()
+        deadline = started + args.seconds
+        await asyncio.gather(*(client(session, base, size, deadline, i, results) for i in range(args.concurrency)))
+        # Requests stuck when the deadline passed still count towards the run
+        results["elapsed"] = time.perf_counter() - started
+    return results
+
+
+def percentile(values: list, q: float) -> float:
+    values = sorted(values) or [0.0]
+    return values[min(int(len(values) * q), len(values) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--concurrency", type=int, default=32)
+    parser.add_argument("--components", type=int, default=50000)
+    parser.add_argument("--pool-size", type=int, default=8, help="Database connections per server")
+    parser.add_argument("--request-timeout", type=float, default=60.0)
+    parser.add_argument("--port", type=int, default=8093)
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES))
+    args = parser.parse_args()
+
+    context = multiprocessing.get_context("spawn")
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "api.db")
+        make_database(path, args.components)
+        print(f"{args.components:,} components, {args.concurrency} concurrent clients, {args.seconds:.0f}s per run; "
+              f"mix: {', '.join(f'{weight}% {kind}' for kind, weight in MIX)}\n")
+        print(f"{'Router':<11} {'Req/sec':>8} " + " ".join(f"{kind + ' p50/p99':>22}" for kind, _ in MIX) + f" {'Errors':>7}")
+        print("-" * (28 + 23 * len(MIX)))
+        for mode in args.modes:
+            server = context.Process(target=serve, args=(mode, path, args.port, args.pool_size), daemon=True)
+            server.start()
+            try:
+                results = asyncio.run(drive(args.port, args.components, args))
+            finally:
+                server.terminate()
+                server.join()
+            total = sum(len(results[kind]) for kind, _ in MIX)
+            latencies = " ".join(
+                f"{percentile(results[kind], 0.5):>9.1f}/{percentile(results[kind], 0.99):>7.1f}ms" for kind, _ in MIX
+            )
+            print(f"{mode:<11} {total / results['elapsed']:>8.0f} {latencies} {len(results['errors']):>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,155 @@
+"""
+Cold storage for price history: database size and one-component history
+reads with every raw row in the prices table, then after moving the rows
+older than PRICE_ARCHIVE_AFTER_DAYS into the columnar archive (pruning and
+vacuuming the table).
+
+The synthetic history has one price every 15 minutes per component and
+site over `--days` days. Reports the database and archive sizes, how long
+archiving and pruning took, and the p50/p99 latency of a year of history
+for one component from the table alone, through PriceService (recent rows
+from the table, the rest from the archive) and from the archive alone, with
+the share of segments a read opens.
+
+Usage (from the backend directory):
+    python benchmarks/bench_archive.py [--components 20] [--sites 2] [--days 400] [--reads 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+from datetime import datetime, timedelta
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database.config import Base, create_db_engine
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component, Price
+from app.services.price_archive import PriceArchive
+from app.services.price_history import PriceHistoryService
+from app.services.services import PriceService
+
+NOW = datetime(2026, 10, 1)
+INTERVAL = timedelta(minutes=15)
+
+
+def make_database(engine, components: int, sites: int, days: int):
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    steps = int(timedelta(days=days) / INTERVAL)
+    with engine.begin() as conn:
+        category_id = conn.execute(insert(Category).values(name="Benchmark Parts")).inserted_primary_key[0]
+        conn.execute(insert(Component), [
+            {"name": f"Benchmark Part {i:06d}", "category_id": category_id} for i in range(components)
+        ])
+        # Crawl order: every component and site at each step
+        for offset in range(0, steps, 500):
+            conn.execute(insert(Price), [
+                {"component_id": component_id, "site": f"site_{site}", "price": rng.uniform(1000, 90000),
+                 "timestamp": NOW - timedelta(days=days) + step * INTERVAL}
+                for step in range(offset, min(offset + 500, steps))
+                for component_id in range(1, components + 1)
+                for site in range(sites)
+            ])
+
+
+def file_size(path: str) -> int:
+    return sum(os.path.getsize(path + suffix) for suffix in ("", "-wal") if os.path.exists(path + suffix))
+
+
+def directory_size(path: str) -> int:
+    return sum(os.path.getsize(os.path.join(root, name)) for root, _, names in os.walk(path) for name in names)
+
+
+def latencies(run, reads: int, components: int) -> tuple:
+    rng = random.Random(1)
+    timings = []
+    for _ in range(reads):
+        component_id = rng.randint(1, components)
+        started = time.perf_counter()
+        run(component_id)
+        timings.append(time.perf_counter() - started)
+    timings.sort()
+    return timings[len(timings) // 2] * 1000, timings[min(int(len(timings) * 0.99), len(timings) - 1)] * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--components", type=int, default=20)
+    parser.add_argument("--sites", type=int, default=2)
+    parser.add_argument("--days", type=int, default=400)
+    parser.add_argument("--after-days", type=int, default=30, help="Age after which rows are archived")
+    parser.add_argument("--reads", type=int, default=200, help="History reads per variant")
+    args = parser.parse_args()
+
+    year_ago = NOW - timedelta(days=365)
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "archive.db")
+        engine = create_db_engine(f"sqlite:///{path}")
+        make_database(engine, args.components, args.sites, args.days)
+        session = sessionmaker(bind=engine)
+        db = session()
+        rows = db.query(Price).count()
+        print(f"{rows:,} price rows: {args.components} components x {args.sites} sites, "
+              f"every 15 minutes over {args.days} days\n")
+
+        table_service = PriceService()
+        table_service.archive = None
+
+        def from_table(component_id):
+            with session() as db:
+                table_service.get_component_price_history(db, component_id)
+
+        table_latency = latencies(from_table, args.reads, args.components)
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+        table_size = file_size(path)
+
+        archive = PriceArchive(os.path.join(tmp, "archive"), after=timedelta(days=args.after_days))
+        history = PriceHistoryService(archive=archive)
+        started = time.perf_counter()
+        archived = archive.archive(db, NOW)
+        archive_seconds = time.perf_counter() - started
+        started = time.perf_counter()
+        pruned, _ = history.prune(db, NOW)
+        prune_seconds = time.perf_counter() - started
+        db.close()
+        with engine.connect() as conn:
+            conn.exec_driver_sql("PRAGMA wal_checkpoint(TRUNCATE)")
+            conn.exec_driver_sql("VACUUM")
+
+        service = PriceService()
+        service.archive = archive
+
+        def through_service(component_id):
+            with session() as db:
+                service.get_component_price_history(db, component_id)
+
+        service_latency = latencies(through_service, args.reads, args.components)
+        archive_latency = latencies(lambda component_id: archive.read(component_id, year_ago, NOW), args.reads, args.components)
+        segments = len(archive.manifest().segments)
+        touched = len(archive.segments_for(1, year_ago, NOW))
+        engine.dispose()
+
+        print(f"Archived {archived:,} rows in {archive_seconds:.1f}s into {segments} segments "
+              f"(through {archive.archived_through:%Y-%m-%d}); pruned {pruned:,} rows in {prune_seconds:.1f}s")
+        print(f"Database {table_size / 2**20:.1f} MiB -> {file_size(path) / 2**20:.1f} MiB after vacuum; "
+              f"archive {directory_size(archive.path) / 2**20:.1f} MiB\n")
+        print(f"{'Year of history for one component':<38} {'p50':>8} {'p99':>8}")
+        print("-" * 56)
+        for label, (p50, p99) in (
+            ("prices table only", table_latency),
+            ("PriceService, table + archive", service_latency),
+            (f"archive only ({touched}/{segments} segments)", archive_latency),
+        ):
+            print(f"{label:<38} {p50:>6.1f}ms {p99:>6.1f}ms")
+
+
+if __name__ == "__main__":
+    main()
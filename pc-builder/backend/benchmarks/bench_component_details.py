@@ -0,0 +1,69 @@
+"""
+Throughput of the compiled component detail extractor over the seed
+catalog in pc-builder/data.
+
+Usage (from the backend directory):
+    python benchmarks/bench_component_details.py [--copies 1000]
+"""
+import argparse
+import glob
+import os
+import re
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.crawler.component_details import _extract, extract_component_details_batch
+
+DATA_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__)))), "data")
+
+CATEGORIES = {
+    "PC.GRAPHICCARDS.ts": "Graphics Cards",
+    "PC.PROCESSORS.ts": "Processors",
+    "PC.RAM.ts": "Memory",
+    "PC.MOTHERBOARDS.ts": "Motherboards",
+}
+
+
+def load_seed_catalog() -> list:
+    """(name, category) pairs from the frontend seed data files."""
+    items = []
+    for path in sorted(glob.glob(os.path.join(DATA_DIR, "PC.*.ts"))):
+        category = CATEGORIES.get(os.path.basename(path))
+        if not category:
+            continue
+        with open(path, encoding="utf-8") as f:
+            items.extend((name, category) for name in re.findall(r'"name":\s*"([^"]+)"', f.read()))
+    return items
+
+
+def run(label: str, items: list, clear_cache: bool):
+    if clear_cache:
+        _extract.cache_clear()
+    start = time.perf_counter()
+    extract_component_details_batch(items)
+    elapsed = time.perf_counter() - start
+    print(f"{label:<28} {len(items):>9,} names {elapsed * 1000:>9.1f}ms {len(items) / elapsed:>12,.0f} names/sec")
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=1000)
+    args = parser.parse_args()
+
+    seed = load_seed_catalog()
+    print(f"Seed catalog: {len(seed)} components from {DATA_DIR}\n")
+
+    # Unique names (a SKU suffix per copy) defeat the memo cache
+    unique = [(f"{name} SKU{i}", category) for i in range(args.copies) for name, category in seed]
+    repeated = seed * args.copies
+
+    run("seed catalog (cold)", seed, clear_cache=True)
+    run("unique variants (cold)", unique, clear_cache=True)
+    run("repeated catalog (warm)", repeated, clear_cache=False)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,175 @@
+"""
+End-to-end crawler throughput against the offline replay server.
+
+For each catalog size a fresh SQLite database is filled with synthetic
+components, the crawler is pointed at a local replay server through
+`supported_sites`, and a full crawl_prices pass is timed. Reports
+components/sec, parse time per page and database write time.
+
+With --passes 2 or more the same catalog is crawled again: the first pass
+searches and pins every component to its product page, later passes read
+the pinned pages. Pages, bytes and latency per component are reported by
+page kind (search vs product) for every pass.
+
+Usage (from the backend directory):
+    python benchmarks/bench_crawler.py [--sizes 1000 10000 100000] [--workers 32]
+        [--latency-ms 20] [--error-rate 0] [--throttle-rate 0] [--missing-rate 0]
+        [--match-threshold 0.05] [--parse-mode process] [--passes 1]
+"""
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import insert
+from sqlalchemy.orm import sessionmaker
+
+from app.database.config import Base, create_db_engine
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component
+from app.services.crawler.crawler_service import CrawlerService
+from app.services.crawler.http_pool import close_http_pool, get_http_pool
+from app.services.crawler.parse_executor import ParseExecutor
+from replay_server import ReplayConfig, start_replay_server
+
+
+# Cards on the GPU fixture page, named without manufacturer keywords so that
+# each numbered component gets its own search term
+BENCH_NAMES = (
+    "Strix RTX 4090 OC 24GB GDDR6X",
+    "X Trio RTX 4090 24GB GDDR6X",
+    "Founders Edition RTX 4090",
+    "XLR8 VERTO RTX 4090 24GB",
+)
+
+
+def make_database(path: str, size: int):
+    engine = create_db_engine(f"sqlite:///{path}")
+    Base.metadata.create_all(bind=engine)
+    with engine.begin() as conn:
+        category_id = conn.execute(insert(Category).values(name="Benchmark Parts")).inserted_primary_key[0]
+        conn.execute(insert(Component), [
+            {"name": f"{BENCH_NAMES[i % len(BENCH_NAMES)]} {i:06d}", "category_id": category_id}
+            for i in range(size)
+        ])
+    return engine
+
+
+def fetch_delta(before: dict, after: dict) -> dict:
+    return {
+        kind: {key: after[kind][key] - before[kind][key] for key in after[kind]}
+        for kind in after
+    }
+
+
+async def run_size(size: int, args) -> list:
+    runner, base_url = await start_replay_server(ReplayConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.latency_ms / 2,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        missing_rate=args.missing_rate
+    ))
+    executor = ParseExecutor(mode=args.parse_mode)
+    with tempfile.TemporaryDirectory() as tmp:
+        engine = make_database(os.path.join(tmp, "bench.db"), size)
+        db = sessionmaker(bind=engine)()
+        try:
+            crawler = CrawlerService(
+                parse_executor=executor,
+                use_response_cache=False,
+                supported_sites={"amazon_in": {
+                    "base_url": base_url,
+                    "rate_limit": {"calls_per_second": args.rate, "burst": args.workers}
+                }}
+            )
+            crawler.worker_count = args.workers
+            # The serial number in every name scales all of its scores down
+            # alike, so the threshold is the benchmark's own
+            crawler.matcher.threshold = args.match_threshold
+
+            passes = []
+            for number in range(1, args.passes + 1):
+                fetch_before = {kind: dict(stats) for kind, stats in crawler.fetch_stats.items()}
+                pages_before = executor.pages
+                parse_before = executor.parse_seconds
+                wait_before = executor.wait_seconds
+
+                started = time.perf_counter()
+                results = await crawler.crawl_prices(db)
+                elapsed = time.perf_counter() - started
+
+                pages = max(executor.pages - pages_before, 1)
+                write_stats = crawler.last_write_stats
+                passes.append({
+                    "size": size,
+                    "pass": number,
+                    "elapsed": elapsed,
+                    "ok": sum(1 for r in results if "price" in r),
+                    "components_per_sec": size / elapsed,
+                    "parse_ms": (executor.parse_seconds - parse_before) / pages * 1000,
+                    "parse_wait_ms": (executor.wait_seconds - wait_before) / pages * 1000,
+                    "write_seconds": write_stats.write_seconds,
+                    "rows_per_sec": write_stats.rows_per_second,
+                    "fetch": fetch_delta(fetch_before, crawler.fetch_stats),
+                })
+        finally:
+            db.close()
+            engine.dispose()
+            executor.shutdown()
+            await runner.cleanup()
+
+    return passes
+
+
+async def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    parser.add_argument("--workers", type=int, default=32)
+    parser.add_argument("--rate", type=float, default=10000.0, help="Requests/sec allowed to the replay host")
+    parser.add_argument("--latency-ms", type=float, default=20.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--missing-rate", type=float, default=0.0, help="Share of product pages answered with 404")
+    parser.add_argument("--match-threshold", type=float, default=0.05)
+    parser.add_argument("--parse-mode", default="process", choices=["inline", "thread", "process"])
+    parser.add_argument("--passes", type=int, default=1, help="Crawls of the same catalog; pins apply from pass 2")
+    args = parser.parse_args()
+
+    logging.basicConfig(level=logging.CRITICAL)
+
+    print(f"{'Components':>10} {'Pass':>4} {'Elapsed':>9} {'OK':>8} {'Comp/sec':>9} {'Parse/page':>11} "
+          f"{'Parse wait':>11} {'DB write':>9} {'Rows/sec':>9}")
+    print("-" * 89)
+    runs = []
+    for size in args.sizes:
+        for r in await run_size(size, args):
+            runs.append(r)
+            print(f"{r['size']:>10,} {r['pass']:>4} {r['elapsed']:>8.1f}s {r['ok']:>8,} {r['components_per_sec']:>9.1f} "
+                  f"{r['parse_ms']:>9.2f}ms {r['parse_wait_ms']:>9.2f}ms "
+                  f"{r['write_seconds']:>8.2f}s {r['rows_per_sec']:>9,.0f}")
+
+    print(f"\n{'Components':>10} {'Pass':>4} {'Kind':>8} {'Pages':>8} {'KiB/comp':>9} {'ms/page':>8} {'ms/comp':>8}")
+    print("-" * 61)
+    for r in runs:
+        for kind, fetch in r["fetch"].items():
+            if not fetch["pages"]:
+                continue
+            print(f"{r['size']:>10,} {r['pass']:>4} {kind:>8} {fetch['pages']:>8,} "
+                  f"{fetch['bytes'] / 1024 / r['size']:>9.1f} "
+                  f"{fetch['seconds'] / fetch['pages'] * 1000:>8.2f} "
+                  f"{fetch['seconds'] / r['size'] * 1000:>8.2f}")
+
+    pool = get_http_pool().stats()
+    print(f"\nHTTP pool: {pool['created']} connections created, {pool['reused']} reused")
+    await close_http_pool()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
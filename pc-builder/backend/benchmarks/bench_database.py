@@ -0,0 +1,168 @@
+"""
+SQLite read/write contention: API-style readers against crawler-style
+batch writers on one database file, with the engine settings the app used
+to have (rollback journal, synchronous=FULL, driver defaults) and with the
+tuned settings from app.database.config (WAL, synchronous=NORMAL, cache,
+mmap, busy timeout).
+
+Each writer thread inserts batches of price rows and updates the
+components' current prices in one transaction, like PriceWriter. Each
+reader thread runs the component detail query the API serves: a component
+with its latest prices. Reports reads/sec, batches/sec, read latency and
+"database is locked" errors.
+
+Usage (from the backend directory):
+    python benchmarks/bench_database.py [--seconds 10] [--readers 8] [--writers 2] [--batch 200]
+"""
+import argparse
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from datetime import datetime
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from sqlalchemy import bindparam, insert, select, update
+from sqlalchemy.exc import OperationalError
+
+from app.database.config import Base, create_db_engine, sqlite_pragmas
+from app.models import models, auth  # noqa: F401 - register all tables
+from app.models.models import Category, Component, Price
+
+COMPONENTS = 10000
+HISTORY_PER_COMPONENT = 20
+
+# What the engine looked like before it was configured: driver defaults
+BASELINE_PRAGMAS = {"journal_mode": "delete", "synchronous": "full"}
+
+
+def make_database(path: str):
+    engine = create_db_engine(f"sqlite:///{path}", pragmas={})
+    Base.metadata.create_all(bind=engine)
+    rng = random.Random(0)
+    with engine.begin() as conn:
+        category_id = conn.execute(insert(Category).values(name="Benchmark Parts")).inserted_primary_key[0]
+        conn.execute(insert(Component), [
+            {"name": f"Benchmark Part {i:06d}", "category_id": category_id, "current_price": 1000.0}
+            for i in range(COMPONENTS)
+        ])
+        conn.execute(insert(Price), [
+            {"component_id": component_id, "price": rng.uniform(1000, 90000), "site": "amazon_in", "timestamp": datetime.utcnow()}
+            for component_id in range(1, COMPONENTS + 1)
+            for _ in range(HISTORY_PER_COMPONENT)
+        ])
+    engine.dispose()
+
+
+class Counters:
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.reads = 0
+        self.read_latencies = []
+        self.writes = 0
+        self.locked = 0
+
+
+def reader(engine, counters: Counters, stop: threading.Event, seed: int):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        component_id = rng.randint(1, COMPONENTS)
+        started = time.perf_counter()
+        try:
+            with engine.connect() as conn:
+                conn.execute(select(Component).where(Component.id == component_id)).first()
+                conn.execute(
+                    select(Price).where(Price.component_id == component_id).order_by(Price.timestamp.desc()).limit(10)
+                ).all()
+        except OperationalError:
+            with counters.lock:
+                counters.locked += 1
+            continue
+        elapsed = time.perf_counter() - started
+        with counters.lock:
+            counters.reads += 1
+            counters.read_latencies.append(elapsed)
+
+
+def writer(engine, counters: Counters, stop: threading.Event, seed: int, batch: int):
+    rng = random.Random(seed)
+    while not stop.is_set():
+        component_ids = rng.sample(range(1, COMPONENTS + 1), batch)
+        now = datetime.utcnow()
+        rows = [{"component_id": component_id, "price": rng.uniform(1000, 90000), "site": "amazon_in", "timestamp": now}
+                for component_id in component_ids]
+        try:
+            with engine.begin() as conn:
+                conn.execute(insert(Price), rows)
+                conn.execute(
+                    update(Component)
+                    .where(Component.id == bindparam("b_id"))
+                    .values(current_price=bindparam("b_price"), last_checked_at=bindparam("b_checked")),
+                    [{"b_id": row["component_id"], "b_price": row["price"], "b_checked": now} for row in rows]
+                )
+        except OperationalError:
+            with counters.lock:
+                counters.locked += 1
+            continue
+        with counters.lock:
+            counters.writes += 1
+
+
+def run(label: str, path: str, pragmas: dict, args) -> dict:
+    engine = create_db_engine(f"sqlite:///{path}", pragmas=pragmas, pool_size=args.readers + args.writers)
+    with engine.connect() as conn:
+        journal_mode = conn.exec_driver_sql("PRAGMA journal_mode").scalar()
+    counters = Counters()
+    stop = threading.Event()
+    threads = [threading.Thread(target=reader, args=(engine, counters, stop, i)) for i in range(args.readers)]
+    threads += [threading.Thread(target=writer, args=(engine, counters, stop, 1000 + i, args.batch)) for i in range(args.writers)]
+    for thread in threads:
+        thread.start()
+    time.sleep(args.seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+    engine.dispose()
+
+    latencies = sorted(counters.read_latencies) or [0.0]
+    return {
+        "label": label,
+        "journal_mode": journal_mode,
+        "reads_per_sec": counters.reads / args.seconds,
+        "writes_per_sec": counters.writes / args.seconds,
+        "rows_per_sec": counters.writes * args.batch / args.seconds,
+        "read_p50_ms": latencies[len(latencies) // 2] * 1000,
+        "read_p99_ms": latencies[min(int(len(latencies) * 0.99), len(latencies) - 1)] * 1000,
+        "locked": counters.locked,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--seconds", type=float, default=10.0)
+    parser.add_argument("--readers", type=int, default=8)
+    parser.add_argument("--writers", type=int, default=2)
+    parser.add_argument("--batch", type=int, default=200, help="Price rows per write transaction")
+    parser.add_argument("--busy-timeout-ms", type=int, default=5000, help="Driver timeout for the baseline run")
+    args = parser.parse_args()
+
+    baseline = {**BASELINE_PRAGMAS, "busy_timeout": args.busy_timeout_ms}
+    print(f"{args.readers} readers, {args.writers} writers ({args.batch} rows per batch), {args.seconds:.0f}s per run\n")
+    print(f"{'Settings':<10} {'Journal':>8} {'Reads/sec':>10} {'p50 read':>9} {'p99 read':>9} "
+          f"{'Batches/sec':>12} {'Rows/sec':>9} {'Locked':>7}")
+    print("-" * 81)
+    with tempfile.TemporaryDirectory() as tmp:
+        for label, pragmas in (("baseline", baseline), ("tuned", sqlite_pragmas())):
+            path = os.path.join(tmp, f"{label}.db")
+            make_database(path)
+            r = run(label, path, pragmas, args)
+            print(f"{r['label']:<10} {r['journal_mode']:>8} {r['reads_per_sec']:>10,.0f} {r['read_p50_ms']:>7.2f}ms "
+                  f"{r['read_p99_ms']:>7.1f}ms {r['writes_per_sec']:>12.1f} {r['rows_per_sec']:>9,.0f} {r['locked']:>7}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,64 @@
+"""
+Compare the streaming lxml extractor against the BeautifulSoup fallback
+on the saved search result pages in benchmarks/fixtures.
+
+Usage (from the backend directory):
+    python benchmarks/bench_extraction.py [--rounds 50] [--limit 3]
+"""
+import argparse
+import glob
+import os
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.crawler.sites import get_adapter
+from app.services.crawler.extraction import extract_products_lxml, extract_products_soup
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+
+def timed(func, rounds: int) -> float:
+    start = time.perf_counter()
+    for _ in range(rounds):
+        func()
+    return (time.perf_counter() - start) / rounds * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--rounds", type=int, default=50)
+    parser.add_argument("--limit", type=int, default=3)
+    args = parser.parse_args()
+
+    site_info = get_adapter("amazon_in").site_info
+
+    pages = sorted(glob.glob(os.path.join(FIXTURE_DIR, "*_search_*.html")))
+    if not pages:
+        print("No fixture pages found, run benchmarks/fixtures/generate_fixtures.py first")
+        return
+
+    print(f"{'Page':<32} {'Size':>8} {'BeautifulSoup':>15} {'lxml stream':>13} {'Speedup':>8}")
+    print("-" * 80)
+    for path in pages:
+        with open(path, "rb") as f:
+            body = f.read()
+        html = body.decode("utf-8")
+
+        soup_products = extract_products_soup(html, site_info, args.limit)
+        lxml_products = extract_products_lxml(body, site_info, args.limit, "utf-8")
+        if soup_products != lxml_products:
+            print(f"⚠️ Extractors disagree on {os.path.basename(path)}:")
+            print(f"   soup: {soup_products}")
+            print(f"   lxml: {lxml_products}")
+
+        soup_ms = timed(lambda: extract_products_soup(html, site_info, args.limit), args.rounds)
+        lxml_ms = timed(lambda: extract_products_lxml(body, site_info, args.limit, "utf-8"), args.rounds)
+        print(f"{os.path.basename(path):<32} {len(body) / 1024:>6.0f}KiB {soup_ms:>13.2f}ms "
+              f"{lxml_ms:>11.2f}ms {soup_ms / lxml_ms:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,66 @@
+"""
+Cost of scoring search results against component names: the TF-IDF
+matcher fitted on the seed catalog in pc-builder/data versus a per-title
+Python loop of difflib token-set ratios.
+
+Usage (from the backend directory):
+    python benchmarks/bench_matching.py [--copies 100] [--candidates 20]
+"""
+import argparse
+import difflib
+import os
+import sys
+import time
+
+# Add the backend directory to Python path
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from app.services.crawler.matching import TitleMatcher, tokenize
+from bench_component_details import load_seed_catalog
+from fixtures.generate_fixtures import QUERIES
+
+
+def token_set_ratio(a: str, b: str) -> float:
+    return difflib.SequenceMatcher(None, " ".join(sorted(set(tokenize(a)))), " ".join(sorted(set(tokenize(b))))).ratio()
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--copies", type=int, default=100, help="Catalog size as copies of the seed catalog")
+    parser.add_argument("--candidates", type=int, default=20)
+    args = parser.parse_args()
+
+    seed = [name for name, _ in load_seed_catalog()]
+    catalog = [(i, f"{name} SKU{i // len(seed)}") for i, name in enumerate(seed * args.copies)]
+    titles = [title for _, (_, page_titles) in QUERIES.items() for title in page_titles]
+    titles = (titles * args.candidates)[:args.candidates]
+    components = catalog[:len(seed)]
+
+    matcher = TitleMatcher()
+    started = time.perf_counter()
+    matcher.fit(catalog)
+    print(f"Fit on {len(catalog):,} names: {(time.perf_counter() - started) * 1000:.1f}ms, "
+          f"{len(matcher.vocabulary):,} tokens\n")
+
+    started = time.perf_counter()
+    candidates = matcher.candidates(titles)
+    build_us = (time.perf_counter() - started) * 1e6
+
+    started = time.perf_counter()
+    for component_id, name in components:
+        matcher.score(component_id, name, candidates)
+    tfidf_us = (time.perf_counter() - started) / len(components) * 1e6
+
+    started = time.perf_counter()
+    for _, name in components:
+        [token_set_ratio(name, title) for title in titles]
+    loop_us = (time.perf_counter() - started) / len(components) * 1e6
+
+    print(f"{len(titles)} candidate titles, {len(components)} components")
+    print(f"{'Candidate vectors (per page)':<36} {build_us:>9.1f}us")
+    print(f"{'TF-IDF score (per component)':<36} {tfidf_us:>9.1f}us")
+    print(f"{'difflib token-set loop (per component)':<36} {loop_us:>9.1f}us  {loop_us / tfidf_us:.0f}x slower")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,176 @@
+"""
+Generate the saved Amazon.in search result pages used by the crawler
+benchmarks and the replay server.
+
+The pages mirror the structure of a real search page: a large head with
+inline scripts and styles, navigation, 48 result cards (some without a
+price) and a long footer. The product page template mirrors a detail page
+the same way, with the title and buy box near the top and a long tail of
+feature bullets, recommendations and reviews; the replay server fills in
+its {{TITLE}} and {{PRICE}} placeholders per product. Output is
+deterministic so benchmark numbers stay comparable between runs.
+"""
+import os
+import random
+
+FIXTURE_DIR = os.path.dirname(os.path.abspath(__file__))
+
+QUERIES = {
+    "amazon_in_search_gpu.html": ("rtx 4090", [
+        "ASUS ROG Strix GeForce RTX 4090 OC Edition 24GB GDDR6X",
+        "MSI GeForce RTX 4090 Gaming X Trio 24GB GDDR6X",
+        "GIGABYTE AORUS GeForce RTX 4090 Master 24G",
+        "ZOTAC Gaming GeForce RTX 4090 AMP Extreme AIRO",
+        "NVIDIA GeForce RTX 4090 Founders Edition",
+        "PNY GeForce RTX 4090 24GB XLR8 Gaming VERTO",
+        "GPU Support Bracket Anti-Sag Holder for RTX 4090",
+        "12VHPWR 16-pin Power Cable for RTX 4090",
+    ]),
+    "amazon_in_search_cpu.html": ("ryzen 7 7800x3d", [
+        "AMD Ryzen 7 7800X3D 8-Core 16-Thread Desktop Processor",
+        "AMD Ryzen 9 7950X3D 16-Core Desktop Processor",
+        "AMD Ryzen 7 7700X 8-Core Desktop Processor",
+        "Intel Core i7-13700K Desktop Processor 16 cores",
+        "Intel Core i9-13900K Desktop Processor 24 cores",
+        "Arctic MX-4 Thermal Compound Paste 4g",
+    ]),
+}
+
+
+def _script_block(rng: random.Random, size: int) -> str:
+    words = ["function", "var", "return", "window", "document", "ue", "P", "when", "execute", "register"]
+    body = " ".join(rng.choice(words) + str(rng.randint(0, 9999)) + ";" for _ in range(size // 12))
+    return f"<script type=\"text/javascript\">{body}</script>\n"
+
+
+def _style_block(rng: random.Random, size: int) -> str:
+    rules = "".join(
+        f".a-c{rng.randint(0, 99999)}{{margin:{rng.randint(0, 20)}px;color:#{rng.randint(0, 0xffffff):06x}}}"
+        for _ in range(size // 40)
+    )
+    return f"<style>{rules}</style>\n"
+
+
+def _card(rng: random.Random, index: int, title: str, with_price: bool) -> str:
+    asin = "B0" + "".join(rng.choice("ABCDEFGHJKLMNPQRSTUVWXYZ0123456789") for _ in range(8))
+    price = rng.randint(1500, 250000)
+    price_html = (
+        f'<span class="a-price" data-a-size="xl" data-a-color="base">'
+        f'<span class="a-offscreen">₹{price:,}</span>'
+        f'<span aria-hidden="true"><span class="a-price-symbol">₹</span>'
+        f'<span class="a-price-whole">{price:,}</span></span></span>'
+        if with_price else '<span class="a-color-secondary">Currently unavailable.</span>'
+    )
+    badges = "".join(
+        f'<span class="a-badge-label"><span class="a-badge-text">Badge {rng.randint(0, 99)}</span></span>'
+        for _ in range(rng.randint(1, 4))
+    )
+    return f"""
+<div data-asin="{asin}" data-index="{index}" data-uuid="{rng.getrandbits(64):016x}" data-component-type="s-search-result" class="sg-col-4-of-24 sg-col-4-of-12 s-result-item s-asin sg-col-4-of-16 sg-col s-widget-spacing-small sg-col-4-of-20">
+ <div class="sg-col-inner"><div cel_widget_id="MAIN-SEARCH_RESULTS-{index}" class="s-widget-container s-spacing-small s-widget-container-height-small celwidget slot=MAIN template=SEARCH_RESULTS widgetId=search-results_{index}">
+  <div data-component-type="s-impression-logger" class="rush-component"><div class="s-card-container s-overflow-hidden aok-relative puis-wide-grid-style">
+   <div class="a-section a-spacing-base"><div class="s-product-image-container aok-relative s-text-center s-image-overlay-grey puis-image-overlay-grey">
+    <span data-component-type="s-product-image" class="rush-component"><a class="a-link-normal s-no-outline" href="/{title.replace(' ', '-')}/dp/{asin}/ref=sr_1_{index}">
+     <div class="a-section aok-relative s-image-square-aspect"><img class="s-image" src="https://m.media-amazon.com/images/I/{asin}._AC_UY218_.jpg" alt="{title}"/></div>
+    </a></span></div>
+    <div class="a-section a-spacing-small puis-padding-left-small puis-padding-right-small">{badges}
+     <div data-cy="title-recipe" class="a-section a-spacing-none a-spacing-top-small s-title-instructions-style">
+      <h2 class="a-size-mini a-spacing-none a-color-base s-line-clamp-4"><a class="a-link-normal s-underline-text s-underline-link-text s-link-style a-text-normal" href="/dp/{asin}">
+       <span class="a-size-base-plus a-color-base a-text-normal">{title}</span></a></h2></div>
+     <div data-cy="reviews-block" class="a-section a-spacing-none a-spacing-top-micro"><div class="a-row a-size-small">
+      <span aria-label="{rng.randint(30, 50) / 10} out of 5 stars"><i class="a-icon a-icon-star-small a-star-small-4-5 aok-align-bottom"><span class="a-icon-alt">4.5 out of 5 stars</span></i></span>
+      <span aria-label="{rng.randint(10, 9000)}"><span class="a-size-base s-underline-text">{rng.randint(10, 9000)}</span></span></div></div>
+     <div data-cy="price-recipe" class="a-section a-spacing-none a-spacing-top-small s-price-instructions-style"><div class="a-row a-size-base a-color-base">
+      <a class="a-size-base a-link-normal s-no-hover s-underline-text s-underline-link-text s-link-style a-text-normal" href="/dp/{asin}">{price_html}</a></div></div>
+     <div data-cy="delivery-recipe" class="a-section a-spacing-none a-spacing-top-micro"><div class="a-row a-size-base a-color-secondary s-align-children-center">
+      <span aria-label="FREE delivery {rng.randint(1, 28)} Nov">FREE delivery <span class="a-color-base a-text-bold">{rng.randint(1, 28)} Nov</span></span></div></div>
+    </div></div></div></div></div></div></div>
+"""
+
+
+def generate(filename: str, query: str, titles: list, seed: int) -> str:
+    rng = random.Random(seed)
+    parts = [
+        "<!doctype html><html lang=\"en-in\" class=\"a-no-js\"><head>",
+        "<meta charset=\"utf-8\"/>",
+        f"<title>Amazon.in : {query}</title>",
+    ]
+    for _ in range(12):
+        parts.append(_style_block(rng, 8000))
+        parts.append(_script_block(rng, 12000))
+    parts.append("</head><body class=\"a-m-in a-aui_72554-c\">")
+    parts.append("<header id=\"navbar-main\">" + "".join(
+        f'<a href="/nav/{i}" class="nav-a">Nav link {i}</a>' for i in range(400)
+    ) + "</header>")
+    parts.append('<div class="s-main-slot s-result-list s-search-results sg-row">')
+    for index in range(1, 49):
+        title = titles[(index - 1) % len(titles)]
+        parts.append(_card(rng, index, title, with_price=rng.random() > 0.15))
+    parts.append("</div>")
+    for _ in range(6):
+        parts.append(_script_block(rng, 10000))
+    parts.append("<footer>" + "".join(f'<a href="/footer/{i}">Footer {i}</a>' for i in range(300)) + "</footer>")
+    parts.append("</body></html>")
+
+    html = "\n".join(parts)
+    with open(os.path.join(FIXTURE_DIR, filename), "w", encoding="utf-8") as f:
+        f.write(html)
+    return html
+
+
+PRODUCT_TEMPLATE = "amazon_in_product.html"
+
+
+def generate_product_template(filename: str, seed: int) -> str:
+    rng = random.Random(seed)
+    parts = [
+        "<!doctype html><html lang=\"en-in\" class=\"a-no-js\"><head>",
+        "<meta charset=\"utf-8\"/>",
+        "<title>Amazon.in : {{TITLE}}</title>",
+    ]
+    for _ in range(10):
+        parts.append(_style_block(rng, 8000))
+        parts.append(_script_block(rng, 12000))
+    parts.append("</head><body class=\"a-m-in a-aui_72554-c\">")
+    parts.append("<header id=\"navbar-main\">" + "".join(
+        f'<a href="/nav/{i}" class="nav-a">Nav link {i}</a>' for i in range(400)
+    ) + "</header>")
+    parts.append('<div id="dp" class="a-container"><div id="centerCol" class="centerColAlign">')
+    parts.append('<div id="titleSection" class="a-section a-spacing-none"><h1 id="title" class="a-size-large a-spacing-none">'
+                 '<span id="productTitle" class="a-size-large product-title-word-break">{{TITLE}}</span></h1></div>')
+    parts.append('<div id="corePriceDisplay_desktop_feature_div" class="celwidget"><div class="a-section a-spacing-none aok-align-center">'
+                 '<span class="a-price aok-align-center" data-a-size="xl" data-a-color="base">'
+                 '<span class="a-offscreen">{{PRICE}}</span>'
+                 '<span aria-hidden="true"><span class="a-price-whole">{{PRICE}}</span></span></span></div></div>')
+    parts.append('<div id="feature-bullets" class="a-section a-spacing-medium a-spacing-top-small"><ul class="a-unordered-list a-vertical">' + "".join(
+        f'<li><span class="a-list-item">Feature {i}: {rng.getrandbits(96):024x}</span></li>' for i in range(12)
+    ) + "</ul></div></div>")
+    for widget in range(8):
+        parts.append(f'<div class="a-carousel-container" id="sims-{widget}"><ol class="a-carousel">' + "".join(
+            f'<li class="a-carousel-card"><a class="a-link-normal" href="/dp/B0{rng.getrandbits(32):08X}">'
+            f'<span class="a-size-small">Recommended {i}</span>'
+            f'<span class="a-price"><span class="a-offscreen">₹{rng.randint(500, 90000):,}</span></span></a></li>'
+            for i in range(20)
+        ) + "</ol></div>")
+    parts.append('<div id="reviewsMedley">' + "".join(
+        f'<div class="a-section review"><span class="a-profile-name">Reviewer {i}</span>'
+        f'<span class="review-text">{" ".join(f"w{rng.randint(0, 9999)}" for _ in range(60))}</span></div>'
+        for i in range(40)
+    ) + "</div></div>")
+    for _ in range(4):
+        parts.append(_script_block(rng, 10000))
+    parts.append("<footer>" + "".join(f'<a href="/footer/{i}">Footer {i}</a>' for i in range(300)) + "</footer>")
+    parts.append("</body></html>")
+
+    html = "\n".join(parts)
+    with open(os.path.join(FIXTURE_DIR, filename), "w", encoding="utf-8") as f:
+        f.write(html)
+    return html
+
+
+if __name__ == "__main__":
+    for seed, (filename, (query, titles)) in enumerate(QUERIES.items()):
+        html = generate(filename, query, titles, seed)
+        print(f"Wrote {filename} ({len(html.encode('utf-8')) / 1024:.0f} KiB)")
+    html = generate_product_template(PRODUCT_TEMPLATE, len(QUERIES))
+    print(f"Wrote {PRODUCT_TEMPLATE} ({len(html.encode('utf-8')) / 1024:.0f} KiB)")
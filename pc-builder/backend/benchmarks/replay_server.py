@@ -0,0 +1,199 @@
+"""
+Local aiohttp server that replays the saved search result pages in
+benchmarks/fixtures, so the crawler can be exercised without touching
+amazon.in.
+
+Every request to /s?k=<term> gets a fixture page chosen from the search
+term. Product pages (/dp/<asin> and /<slug>/dp/<asin>) are rendered from
+the product page template for every product card on the search fixtures,
+with the card's title and price. Latency, server errors, throttling (429
+with Retry-After) and delisted products (404) can be injected. Point the crawler at it with:
+
+    CrawlerService(supported_sites={"amazon_in": {"base_url": "http://127.0.0.1:8081/s?k="}})
+
+Usage (from the backend directory):
+    python benchmarks/replay_server.py --port 8081 --latency-ms 80 --error-rate 0.02 --throttle-rate 0.05
+"""
+import argparse
+import asyncio
+import glob
+import os
+import random
+import re
+from dataclasses import dataclass, field
+
+from aiohttp import web
+
+FIXTURE_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), "fixtures")
+
+CPU_TERMS = ("ryzen", "intel", "core", "processor", "cpu")
+PRODUCT_TEMPLATE = "amazon_in_product.html"
+
+CARD = re.compile(
+    r'data-asin="(?P<asin>[A-Z0-9]{10})".*?alt="(?P<title>[^"]*)"'
+    r'(?:(?!data-asin=).)*?(?:<span class="a-offscreen">(?P<price>[^<]*)</span>|(?=data-asin=)|$)',
+    re.S
+)
+
+
+@dataclass
+class ReplayConfig:
+    latency_ms: float = 0.0
+    jitter_ms: float = 0.0
+    error_rate: float = 0.0
+    throttle_rate: float = 0.0
+    missing_rate: float = 0.0  # Share of product pages answered with 404
+    retry_after: int = 1
+    seed: int = 0
+
+
+@dataclass
+class ReplayStats:
+    requests: int = 0
+    errors: int = 0
+    throttled: int = 0
+    missing: int = 0
+    bytes_sent: int = 0
+    by_status: dict = field(default_factory=dict)
+
+
+def load_fixtures() -> dict:
+    pages = {}
+    for path in glob.glob(os.path.join(FIXTURE_DIR, "amazon_in_search_*.html")):
+        with open(path, "rb") as f:
+            pages[os.path.basename(path)] = f.read()
+    if not pages:
+        raise RuntimeError("No fixture pages found, run benchmarks/fixtures/generate_fixtures.py first")
+    return pages
+
+
+def load_products(pages: dict) -> dict:
+    """Rendered product page per ASIN for every card on the search fixtures."""
+    path = os.path.join(FIXTURE_DIR, PRODUCT_TEMPLATE)
+    if not os.path.exists(path):
+        return {}
+    with open(path, "rb") as f:
+        template = f.read()
+    products = {}
+    for page in pages.values():
+        for card in CARD.finditer(page.decode("utf-8")):
+            price = card.group("price") or "Currently unavailable."
+            products[card.group("asin")] = (
+                template
+                .replace(b"{{TITLE}}", card.group("title").encode("utf-8"))
+                .replace(b"{{PRICE}}", price.encode("utf-8"))
+            )
+    return products
+
+
+def create_app(config: ReplayConfig) -> web.Application:
+    pages = load_fixtures()
+    products = load_products(pages)
+    rng = random.Random(config.seed)
+    stats = ReplayStats()
+
+    def pick_page(term: str) -> bytes:
+        term = term.lower()
+        if any(word in term for word in CPU_TERMS):
+            return pages.get("amazon_in_search_cpu.html") or next(iter(pages.values()))
+        return pages.get("amazon_in_search_gpu.html") or next(iter(pages.values()))
+
+    def record(status: int, size: int = 0):
+        stats.requests += 1
+        stats.bytes_sent += size
+        stats.by_status[status] = stats.by_status.get(status, 0) + 1
+
+    async def simulate_failures():
+        """Injected latency, then a 429/503 response or None."""
+        if config.latency_ms or config.jitter_ms:
+            delay = config.latency_ms + rng.uniform(-config.jitter_ms, config.jitter_ms)
+            await asyncio.sleep(max(delay, 0) / 1000)
+
+        roll = rng.random()
+        if roll < config.throttle_rate:
+            stats.throttled += 1
+            record(429)
+            return web.Response(status=429, headers={"Retry-After": str(config.retry_after)})
+        if roll < config.throttle_rate + config.error_rate:
+            stats.errors += 1
+            record(503)
+            return web.Response(status=503)
+        return None
+
+    async def search(request: web.Request) -> web.Response:
+        failure = await simulate_failures()
+        if failure is not None:
+            return failure
+
+        body = pick_page(request.query.get("k", ""))
+        record(200, len(body))
+        return web.Response(body=body, content_type="text/html", charset="utf-8")
+
+    async def product(request: web.Request) -> web.Response:
+        failure = await simulate_failures()
+        if failure is not None:
+            return failure
+
+        body = products.get(request.match_info["asin"])
+        if body is None or rng.random() < config.missing_rate:
+            stats.missing += 1
+            record(404)
+            return web.Response(status=404)
+        record(200, len(body))
+        return web.Response(body=body, content_type="text/html", charset="utf-8")
+
+    async def get_stats(request: web.Request) -> web.Response:
+        return web.json_response({
+            "requests": stats.requests,
+            "errors": stats.errors,
+            "throttled": stats.throttled,
+            "missing": stats.missing,
+            "bytes_sent": stats.bytes_sent,
+            "by_status": {str(k): v for k, v in stats.by_status.items()}
+        })
+
+    app = web.Application()
+    app["stats"] = stats
+    app.router.add_get("/s", search)
+    app.router.add_get("/dp/{asin}", product)
+    app.router.add_get("/{slug}/dp/{asin}", product)
+    app.router.add_get("/{slug}/dp/{asin}/{ref}", product)
+    app.router.add_get("/_stats", get_stats)
+    return app
+
+
+async def start_replay_server(config: ReplayConfig, host: str = "127.0.0.1", port: int = 0):
+    """Start the server in the running loop; returns (runner, base search URL)."""
+    runner = web.AppRunner(create_app(config), access_log=None)
+    await runner.setup()
+    site = web.TCPSite(runner, host, port)
+    await site.start()
+    bound_port = site._server.sockets[0].getsockname()[1]
+    return runner, f"http://{host}:{bound_port}/s?k="
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency-ms", type=float, default=0.0)
+    parser.add_argument("--jitter-ms", type=float, default=0.0)
+    parser.add_argument("--error-rate", type=float, default=0.0)
+    parser.add_argument("--throttle-rate", type=float, default=0.0)
+    parser.add_argument("--missing-rate", type=float, default=0.0)
+    parser.add_argument("--retry-after", type=int, default=1)
+    args = parser.parse_args()
+
+    config = ReplayConfig(
+        latency_ms=args.latency_ms,
+        jitter_ms=args.jitter_ms,
+        error_rate=args.error_rate,
+        throttle_rate=args.throttle_rate,
+        missing_rate=args.missing_rate,
+        retry_after=args.retry_after
+    )
+    web.run_app(create_app(config), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
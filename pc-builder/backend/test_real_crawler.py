@@ -20,13 +20,13 @@ async def test_real_crawler():
 
         # 1. Show supported sites and their configurations
         print("Supported E-commerce Sites:")
-        for site, config in crawler_service.supported_sites.items():
+        for site, adapter in crawler_service.supported_sites.items():
             print(f"\n{site.upper()}:")
-            print(f"  Base URL: {config['base_url']}")
+            print(f"  Base URL: {adapter.base_url}")
             print(f"  Selectors:")
-            print(f"    - Price: {config['price_selector']}")
-            print(f"    - Product: {config['product_selector']}")
-            print(f"    - Title: {config['title_selector']}")
+            print(f"    - Price: {adapter.selectors['price_selector']}")
+            print(f"    - Product: {adapter.selectors['product_selector']}")
+            print(f"    - Title: {adapter.selectors['title_selector']}")
 
         # 2. Get all components
         components = component_service.get_all(db)
@@ -0,0 +1,105 @@
+"""
+Standalone crawl worker. Claims jobs from the crawl_jobs queue in the
+application database, crawls them and reports the outcome. Run as many
+as you like, on one box or several sharing the database:
+
+    python worker.py --workers-total 4 &
+    python worker.py --workers-total 4 &
+    ...
+
+`--workers-total` (or CRAWLER_WORKER_PROCESSES) should be the number of
+worker processes running against the same sites; each one crawls at that
+fraction of every site's rate limit so together they stay within it.
+"""
+import argparse
+import asyncio
+import logging
+import os
+import socket
+from datetime import timedelta
+
+from app.database.config import SessionLocal
+from app.services.crawler import CrawlerService
+from app.services.crawler.engine import summarize_outcomes
+from app.services.crawler.http_pool import close_http_pool
+from app.services.crawler.job_queue import CrawlJobQueue
+from app.services.crawler.parse_executor import shutdown_parse_executor
+
+logging.basicConfig(level=logging.INFO)
+logger = logging.getLogger("crawl_worker")
+
+WORKER_PROCESSES = int(os.getenv("CRAWLER_WORKER_PROCESSES", "1"))
+
+
+async def keep_lease(queue: CrawlJobQueue, jobs, interval: float):
+    """Renew the batch's lease until cancelled, so slow crawls are not reclaimed."""
+    while True:
+        await asyncio.sleep(interval)
+        db = SessionLocal()
+        try:
+            queue.renew(db, jobs)
+        finally:
+            db.close()
+
+
+async def run_worker(worker_id: str, batch_size: int, lease_seconds: float, idle_seconds: float,
+                     workers_total: int, once: bool = False):
+    queue = CrawlJobQueue(lease_duration=timedelta(seconds=lease_seconds))
+    crawler = CrawlerService(rate_share=1 / max(workers_total, 1))
+    logger.info(f"Worker {worker_id} started ({workers_total} worker processes sharing the rate limits)")
+    try:
+        await work_loop(queue, crawler, worker_id, batch_size, lease_seconds, idle_seconds, once)
+    finally:
+        await close_http_pool()
+
+
+async def work_loop(queue: CrawlJobQueue, crawler: CrawlerService, worker_id: str, batch_size: int,
+                    lease_seconds: float, idle_seconds: float, once: bool):
+    while True:
+        db = SessionLocal()
+        try:
+            jobs = queue.claim(db, worker_id, limit=batch_size)
+            if not jobs:
+                if once:
+                    return
+                await asyncio.sleep(idle_seconds)
+                continue
+
+            component_ids = [job.component_id for job in jobs]
+            renewer = asyncio.create_task(keep_lease(queue, jobs, lease_seconds / 3))
+            try:
+                results = await crawler.crawl_prices(db, component_ids=component_ids)
+                errors = summarize_outcomes(component_ids, results)
+            except Exception as e:
+                logger.error(f"Worker {worker_id} batch failed: {str(e)}")
+                errors = {component_id: str(e) for component_id in component_ids}
+            finally:
+                renewer.cancel()
+
+            queue.complete(db, jobs, errors)
+            failed = sum(1 for error in errors.values() if error)
+            logger.info(f"Worker {worker_id}: ✅ {len(jobs) - failed} ❌ {failed}")
+        finally:
+            db.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Crawl worker for the crawl_jobs queue")
+    parser.add_argument("--worker-id", default=f"{socket.gethostname()}-{os.getpid()}")
+    parser.add_argument("--batch", type=int, default=20, help="Jobs claimed per lease")
+    parser.add_argument("--lease", type=float, default=300.0, help="Lease duration in seconds")
+    parser.add_argument("--idle", type=float, default=5.0, help="Seconds to wait when the queue is empty")
+    parser.add_argument("--workers-total", type=int, default=WORKER_PROCESSES)
+    parser.add_argument("--once", action="store_true", help="Exit when the queue is empty")
+    args = parser.parse_args()
+
+    try:
+        asyncio.run(run_worker(args.worker_id, args.batch, args.lease, args.idle, args.workers_total, args.once))
+    except KeyboardInterrupt:
+        pass
+    finally:
+        shutdown_parse_executor()
+
+
+if __name__ == "__main__":
+    main()